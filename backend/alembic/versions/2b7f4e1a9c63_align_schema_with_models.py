@@ -0,0 +1,95 @@
+"""Align the initial schema with models.py
+
+Revision ID: 2b7f4e1a9c63
+Revises: 3db0943488f3
+Create Date: 2026-10-19 15:40:18.203771
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7f4e1a9c63'
+down_revision: Union[str, None] = '3db0943488f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The initial migration was generated from an earlier models.py: roles and task
+# statuses were upper-case enums, projects had no owner or timestamps and
+# comments used other column names. Later revisions index the columns the app
+# has used since, so bring them in first. Columns the models no longer map
+# (projects.start_date/end_date, project_members.role) are left alone.
+old_role = sa.Enum('ADMIN', 'MANAGER', 'DEVELOPER', name='userrole')
+new_role = sa.Enum('admin', 'manager', 'developer', 'user', name='userrole')
+old_status = sa.Enum('TODO', 'IN_PROGRESS', 'DONE', name='taskstatus')
+
+
+def upgrade() -> None:
+    # Stored as enum member names, which are lower-case in models.UserRole
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('role', type_=sa.String(length=16), existing_type=old_role, existing_nullable=False)
+    op.execute("UPDATE users SET role = LOWER(role)")
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('role', type_=new_role, existing_type=sa.String(length=16), existing_nullable=False)
+
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.alter_column('name', type_=sa.String(length=100), existing_type=sa.String(length=128),
+                              existing_nullable=False)
+        batch_op.add_column(sa.Column('owner_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Existing projects had no owner: give them to the first user
+    op.execute("UPDATE projects SET owner_id = (SELECT MIN(id) FROM users), created_at = CURRENT_TIMESTAMP")
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.alter_column('owner_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_projects_owner_id_users', 'users', ['owner_id'], ['id'])
+        batch_op.create_unique_constraint('uq_projects_name', ['name'])
+
+    # Free-form statuses ("todo", "in_progress", "done", "pending", ...) since TaskCreate.status is a str
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column('status', type_=sa.String(length=24), existing_type=old_status, existing_nullable=False,
+                              nullable=True)
+        batch_op.alter_column('project_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE tasks SET status = LOWER(status), created_at = CURRENT_TIMESTAMP")
+
+    with op.batch_alter_table('task_comments') as batch_op:
+        batch_op.alter_column('comment', new_column_name='content', existing_type=sa.Text(), existing_nullable=False)
+        batch_op.alter_column('timestamp', new_column_name='created_at', existing_type=sa.DateTime(),
+                              existing_nullable=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('task_comments') as batch_op:
+        batch_op.alter_column('created_at', new_column_name='timestamp', existing_type=sa.DateTime(),
+                              existing_nullable=True)
+        batch_op.alter_column('content', new_column_name='comment', existing_type=sa.Text(), existing_nullable=False)
+
+    # Statuses the old enum cannot hold fall back to the nearest one
+    op.execute(
+        "UPDATE tasks SET status = CASE WHEN status IN ('done', 'completed') THEN 'DONE' "
+        "WHEN status = 'in_progress' THEN 'IN_PROGRESS' ELSE 'TODO' END"
+    )
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('created_at')
+        batch_op.alter_column('project_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('status', type_=old_status, existing_type=sa.String(length=24), nullable=False)
+
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_constraint('uq_projects_name', type_='unique')
+        batch_op.drop_constraint('fk_projects_owner_id_users', type_='foreignkey')
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('created_at')
+        batch_op.drop_column('owner_id')
+        batch_op.alter_column('name', type_=sa.String(length=128), existing_type=sa.String(length=100),
+                              existing_nullable=False)
+
+    op.execute("UPDATE users SET role = 'DEVELOPER' WHERE role = 'user'")
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('role', type_=sa.String(length=16), existing_type=new_role, existing_nullable=False)
+    op.execute("UPDATE users SET role = UPPER(role)")
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('role', type_=old_role, existing_type=sa.String(length=16), existing_nullable=False)
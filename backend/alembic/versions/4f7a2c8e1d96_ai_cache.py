@@ -0,0 +1,42 @@
+"""AI response cache table
+
+Revision ID: 4f7a2c8e1d96
+Revises: b9d1f7e3a586
+Create Date: 2026-10-19 02:14:08.318552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f7a2c8e1d96'
+down_revision: Union[str, None] = 'b9d1f7e3a586'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+precise_datetime = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_cache',
+        sa.Column('key', sa.String(length=64), primary_key=True),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('response', sa.JSON(), nullable=False),
+        sa.Column('hits', sa.Integer(), nullable=False),
+        sa.Column('created_at', precise_datetime, nullable=False),
+        sa.Column('expires_at', precise_datetime, nullable=False),
+        sa.Column('last_used_at', precise_datetime, nullable=False),
+    )
+    op.create_index('ix_ai_cache_expires', 'ai_cache', ['expires_at'])
+    op.create_index('ix_ai_cache_last_used', 'ai_cache', ['last_used_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_cache_last_used', table_name='ai_cache')
+    op.drop_index('ix_ai_cache_expires', table_name='ai_cache')
+    op.drop_table('ai_cache')
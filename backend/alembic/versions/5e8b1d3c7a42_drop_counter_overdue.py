@@ -0,0 +1,35 @@
+"""Drop project_task_counters.overdue_count
+
+Revision ID: 5e8b1d3c7a42
+Revises: 9a4d6b2f8e15
+Create Date: 2026-10-19 14:12:03.416257
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b1d3c7a42'
+down_revision: Union[str, None] = '9a4d6b2f8e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Overdue changes with the clock, not with writes; /tasks/stats counts it from tasks
+    with op.batch_alter_table('project_task_counters') as batch_op:
+        batch_op.drop_column('overdue_count')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('project_task_counters') as batch_op:
+        batch_op.add_column(sa.Column('overdue_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        "UPDATE project_task_counters SET overdue_count = ("
+        "SELECT COUNT(id) FROM tasks WHERE tasks.project_id = project_task_counters.project_id "
+        "AND tasks.status = project_task_counters.status "
+        "AND due_date < CURRENT_TIMESTAMP AND status NOT IN ('done', 'completed'))"
+    )
@@ -0,0 +1,30 @@
+"""User updated_at for project detail ETags
+
+Revision ID: 6c3a8f2e9d51
+Revises: 5e8b1d3c7a42
+Create Date: 2026-10-19 16:22:47.930512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c3a8f2e9d51'
+down_revision: Union[str, None] = '5e8b1d3c7a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+precise_datetime = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
+
+def upgrade() -> None:
+    # NULL until a user is next written; ETags only need it to move from then on
+    op.add_column('users', sa.Column('updated_at', precise_datetime, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'updated_at')
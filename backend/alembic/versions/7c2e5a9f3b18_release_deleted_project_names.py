@@ -0,0 +1,37 @@
+"""Free the names of soft-deleted projects
+
+Revision ID: 7c2e5a9f3b18
+Revises: 4f7a2c8e1d96
+Create Date: 2026-10-19 09:41:52.207716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9f3b18'
+down_revision: Union[str, None] = '4f7a2c8e1d96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Projects deleted earlier still hold their unique name until purged; rename
+    # them the way project_service.released_name does now
+    bind = op.get_bind()
+    deleted = bind.execute(sa.text("SELECT id, name FROM projects WHERE deleted_at IS NOT NULL")).all()
+    for project_id, name in deleted:
+        suffix = f" (deleted #{project_id})"
+        if not name.endswith(suffix):
+            bind.execute(
+                sa.text("UPDATE projects SET name = :name WHERE id = :id"),
+                {"name": name[:100 - len(suffix)] + suffix, "id": project_id},
+            )
+
+
+def downgrade() -> None:
+    # The original names are not kept; deleted projects are purged anyway
+    pass
@@ -0,0 +1,32 @@
+"""Task filter and sort indexes
+
+Revision ID: 8c1f2a7d4e90
+Revises: 2b7f4e1a9c63
+Create Date: 2026-10-18 18:05:12.412093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f2a7d4e90'
+down_revision: Union[str, None] = '2b7f4e1a9c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_project_status', 'tasks', ['project_id', 'status'])
+    op.create_index('ix_tasks_project_created', 'tasks', ['project_id', 'created_at', 'id'])
+    op.create_index('ix_tasks_project_due', 'tasks', ['project_id', 'due_date', 'id'])
+    op.create_index('ix_tasks_assignee_due', 'tasks', ['assignee_id', 'due_date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_assignee_due', table_name='tasks')
+    op.drop_index('ix_tasks_project_due', table_name='tasks')
+    op.drop_index('ix_tasks_project_created', table_name='tasks')
+    op.drop_index('ix_tasks_project_status', table_name='tasks')
@@ -0,0 +1,26 @@
+"""Project listing keyset index
+
+Revision ID: 9a4d6b2f8e15
+Revises: 7c2e5a9f3b18
+Create Date: 2026-10-19 10:05:27.582914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d6b2f8e15'
+down_revision: Union[str, None] = '7c2e5a9f3b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_projects_created', 'projects', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_created', table_name='projects')
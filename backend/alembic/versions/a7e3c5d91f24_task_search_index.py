@@ -0,0 +1,72 @@
+"""Task full-text search index
+
+Revision ID: a7e3c5d91f24
+Revises: f2c6a9e4b813
+Create Date: 2026-10-18 22:11:37.504918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e3c5d91f24'
+down_revision: Union[str, None] = 'f2c6a9e4b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+comment_text = (
+    "(SELECT coalesce(group_concat(content, ' '), '') FROM task_comments WHERE task_id = task_search.rowid)"
+)
+
+sqlite_ddl = (
+    "CREATE VIRTUAL TABLE task_search USING fts5(title, description, comments, tokenize = 'porter unicode61')",
+    "CREATE TRIGGER task_search_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO task_search (rowid, title, description, comments) "
+    "VALUES (new.id, new.title, coalesce(new.description, ''), ''); END",
+    "CREATE TRIGGER task_search_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "UPDATE task_search SET title = new.title, description = coalesce(new.description, '') "
+    "WHERE rowid = new.id; END",
+    "CREATE TRIGGER task_search_ad AFTER DELETE ON tasks BEGIN "
+    "DELETE FROM task_search WHERE rowid = old.id; END",
+    "CREATE TRIGGER task_comment_search_ai AFTER INSERT ON task_comments BEGIN "
+    "UPDATE task_search SET comments = ltrim(comments || ' ' || new.content) WHERE rowid = new.task_id; END",
+    "CREATE TRIGGER task_comment_search_au AFTER UPDATE ON task_comments BEGIN "
+    f"UPDATE task_search SET comments = {comment_text} WHERE rowid IN (old.task_id, new.task_id); END",
+    "CREATE TRIGGER task_comment_search_ad AFTER DELETE ON task_comments BEGIN "
+    f"UPDATE task_search SET comments = {comment_text} WHERE rowid = old.task_id; END",
+)
+
+sqlite_triggers = (
+    'task_search_ai', 'task_search_au', 'task_search_ad',
+    'task_comment_search_ai', 'task_comment_search_au', 'task_comment_search_ad',
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.create_index('ft_tasks_title_description', 'tasks', ['title', 'description'], mysql_prefix='FULLTEXT')
+        op.create_index('ft_task_comments_content', 'task_comments', ['content'], mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        for statement in sqlite_ddl:
+            op.execute(statement)
+        op.execute(
+            "INSERT INTO task_search (rowid, title, description, comments) "
+            "SELECT id, title, coalesce(description, ''), "
+            "coalesce((SELECT group_concat(content, ' ') FROM task_comments WHERE task_id = tasks.id), '') "
+            "FROM tasks"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ft_task_comments_content', table_name='task_comments')
+        op.drop_index('ft_tasks_title_description', table_name='tasks')
+    elif dialect == 'sqlite':
+        for trigger in sqlite_triggers:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS task_search")
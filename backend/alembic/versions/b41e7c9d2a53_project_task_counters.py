@@ -0,0 +1,40 @@
+"""Project task counters
+
+Revision ID: b41e7c9d2a53
+Revises: 8c1f2a7d4e90
+Create Date: 2026-10-18 19:21:37.508114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e7c9d2a53'
+down_revision: Union[str, None] = '8c1f2a7d4e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'project_task_counters',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=24), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('overdue_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'status')
+    )
+    op.execute(
+        "INSERT INTO project_task_counters (project_id, status, count, overdue_count) "
+        "SELECT project_id, status, COUNT(id), "
+        "SUM(CASE WHEN due_date < CURRENT_TIMESTAMP AND status NOT IN ('done', 'completed') THEN 1 ELSE 0 END) "
+        "FROM tasks WHERE project_id IS NOT NULL GROUP BY project_id, status"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('project_task_counters')
@@ -0,0 +1,65 @@
+"""Background jobs table
+
+Revision ID: b9d1f7e3a586
+Revises: e6b4a9c2d057
+Create Date: 2026-10-19 00:27:40.661023
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d1f7e3a586'
+down_revision: Union[str, None] = 'e6b4a9c2d057'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+precise_datetime = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
+
+def upgrade() -> None:
+    jobs = op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('kind', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_at', precise_datetime, nullable=False),
+        sa.Column('locked_by', sa.String(length=64), nullable=True),
+        sa.Column('lease_until', precise_datetime, nullable=True),
+        sa.Column('progress', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('created_at', precise_datetime, nullable=False),
+        sa.Column('started_at', precise_datetime, nullable=True),
+        sa.Column('finished_at', precise_datetime, nullable=True),
+    )
+    op.create_index('ix_jobs_claim', 'jobs', ['status', sa.text('priority DESC'), 'run_at'])
+    op.create_index('ix_jobs_status_lease', 'jobs', ['status', 'lease_until'])
+    # Projects deleted before the queue existed still need their purge
+    now = datetime.now()
+    deleted = op.get_bind().execute(sa.text("SELECT id, owner_id FROM projects WHERE deleted_at IS NOT NULL")).all()
+    if deleted:
+        op.bulk_insert(jobs, [
+            {
+                'kind': 'project.purge', 'payload': {'project_id': project_id}, 'status': 'queued',
+                'priority': -10, 'attempts': 0, 'max_attempts': 5, 'run_at': now, 'user_id': owner_id,
+                'created_at': now,
+            }
+            for project_id, owner_id in deleted
+        ])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_status_lease', table_name='jobs')
+    op.drop_index('ix_jobs_claim', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,53 @@
+"""Change log for delta sync
+
+Revision ID: c3f8d2a6e914
+Revises: a7e3c5d91f24
+Create Date: 2026-10-18 23:02:14.318560
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8d2a6e914'
+down_revision: Union[str, None] = 'a7e3c5d91f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+precise_datetime = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'change_log',
+        sa.Column('seq', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), primary_key=True, autoincrement=True),
+        sa.Column('entity', sa.String(length=16), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.Column('changed_at', precise_datetime, nullable=False),
+        sqlite_autoincrement=True,
+    )
+    op.create_index('ix_change_log_project_seq', 'change_log', ['project_id', 'seq'])
+    # Existing rows enter the log once, so since=0 returns everything. Local time, as the
+    # app writes it (CURRENT_TIMESTAMP is UTC and would hold sync cursors back)
+    now = datetime.now()
+    for select in (
+        "SELECT 'project', id, id, 0, :now FROM projects",
+        "SELECT 'task', id, project_id, 0, :now FROM tasks WHERE project_id IS NOT NULL",
+        "SELECT 'comment', task_comments.id, tasks.project_id, 0, :now "
+        "FROM task_comments JOIN tasks ON tasks.id = task_comments.task_id WHERE tasks.project_id IS NOT NULL",
+    ):
+        op.execute(sa.text(
+            f"INSERT INTO change_log (entity, entity_id, project_id, deleted, changed_at) {select}"
+        ).bindparams(now=now))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_log_project_seq', table_name='change_log')
+    op.drop_table('change_log')
@@ -0,0 +1,36 @@
+"""Hot path indexes
+
+Revision ID: d5a8f31c6b07
+Revises: b41e7c9d2a53
+Create Date: 2026-10-18 19:58:03.117462
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8f31c6b07'
+down_revision: Union[str, None] = 'b41e7c9d2a53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # tasks(project_id, status) and tasks(assignee_id, due_date) come from 8c1f2a7d4e90
+    op.create_index('ix_projects_owner_id', 'projects', ['owner_id'])
+    op.create_index('ix_task_comments_task_created', 'task_comments', ['task_id', 'created_at', 'id'])
+    # Drop duplicate memberships before enforcing uniqueness (the derived table keeps MySQL happy)
+    op.execute(
+        "DELETE FROM project_members WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM project_members GROUP BY project_id, user_id) AS keep)"
+    )
+    op.create_index('ux_project_members_project_user', 'project_members', ['project_id', 'user_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_project_members_project_user', table_name='project_members')
+    op.drop_index('ix_task_comments_task_created', table_name='task_comments')
+    op.drop_index('ix_projects_owner_id', table_name='projects')
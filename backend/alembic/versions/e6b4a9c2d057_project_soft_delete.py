@@ -0,0 +1,26 @@
+"""Project soft delete
+
+Revision ID: e6b4a9c2d057
+Revises: c3f8d2a6e914
+Create Date: 2026-10-18 23:41:52.107384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b4a9c2d057'
+down_revision: Union[str, None] = 'c3f8d2a6e914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'deleted_at')
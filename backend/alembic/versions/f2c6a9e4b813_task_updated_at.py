@@ -0,0 +1,34 @@
+"""Task updated_at for ETags
+
+Revision ID: f2c6a9e4b813
+Revises: d5a8f31c6b07
+Create Date: 2026-10-18 20:34:51.640285
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a9e4b813'
+down_revision: Union[str, None] = 'd5a8f31c6b07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+precise_datetime = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('updated_at', precise_datetime, nullable=True))
+    op.execute("UPDATE tasks SET updated_at = created_at")
+    if op.get_bind().dialect.name == 'mysql':
+        op.alter_column('projects', 'updated_at', type_=mysql.DATETIME(fsp=6), existing_nullable=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'mysql':
+        op.alter_column('projects', 'updated_at', type_=sa.DateTime(), existing_nullable=True)
+    op.drop_column('tasks', 'updated_at')
@@ -1,25 +1,76 @@
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import event
 from models import User
-from app.database import get_db
-from sqlalchemy.orm import Session
+from app.database import get_session, run_db
+from app.config import PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL
+from app.services import user_service
+from app.utils.cache import TTLCache
 import os
 
 SECRET_KEY = os.getenv("SECRET_KEY", "EW7zNXSvDEYF8n6S8Clh3lZQhbgxhFjSP955AA13c_0")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+oauth2_optional = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+
+@dataclass(frozen=True)
+class Principal:
+    """Detached snapshot of the authenticated user, safe to share between requests."""
+    id: int
+    username: str
+    email: str
+    role: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        role = user.role.value if hasattr(user.role, "value") else user.role
+        return cls(id=user.id, username=user.username, email=user.email, role=role)
+
+
+# token -> Principal; saves the users lookup on every authenticated request
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+
+def invalidate_principal(user_id: int):
+    principal_cache.delete_where(lambda principal: principal.id == user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_change(mapper, connection, target):
+    invalidate_principal(target.id)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db=Depends(get_session)):
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("user_id")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication token")
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await run_db(db, user_service.get_user, user_id)
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
-        return user
+        principal = Principal.from_user(user)
+        principal_cache.set(token, principal)
+        return principal
     except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+
+
+async def get_stream_user(
+    token: Optional[str] = Depends(oauth2_optional),
+    access_token: Optional[str] = Query(None, description="Bearer token for clients that cannot set headers (EventSource)"),
+    db=Depends(get_session),
+):
+    token = token or access_token
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return await get_current_user(token, db)
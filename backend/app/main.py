@@ -1,10 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import user, project, task, comment
+from fastapi.responses import ORJSONResponse
+from app.routers import user, project, task, comment, ai_stories, events, export, jobs, search, sync, metrics
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from app.services.job_service import job_pool
+from app.utils.etag import ETAG_HEADER
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background job workers live as long as the app (JOB_WORKERS=0 leaves them to manage.py run-worker)
+    job_pool.start()
+    yield
+    # Running jobs get a grace period; any still going are recovered by lease expiry
+    await run_in_threadpool(job_pool.stop, 30)
+
+
 app = FastAPI(
     title="Project Management Tool",
     description="Backend for unique project management app with role-based access",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 app.add_middleware(
     CORSMiddleware,
@@ -12,6 +31,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
 
 # Attach routers with proper prefixes
@@ -19,6 +39,14 @@ app.include_router(user.router, prefix="/users", tags=["Users"])
 app.include_router(project.router, prefix="/projects", tags=["Projects"])
 app.include_router(task.router, prefix="/tasks", tags=["Tasks"])
 app.include_router(comment.router, prefix="/comments", tags=["Comments"])
+app.include_router(events.router, prefix="/events", tags=["Events"])
+app.include_router(sync.router, prefix="/sync", tags=["Sync"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(export.router, prefix="/export", tags=["Export"])
+app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+app.include_router(ai_stories.router, prefix="/ai", tags=["AI"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+
 
 # Optionally add a root route for health check
 @app.get("/")
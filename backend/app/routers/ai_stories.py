@@ -0,0 +1,103 @@
+from typing import AsyncIterator
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from app.config import AI_MODEL
+from app.database import get_session, run_db
+from app.dependencies import get_current_user, Principal
+from app.schemas import ai_schema
+from app.services import ai_service, project_service, task_service
+from app.utils.ai_providers import ProviderError
+from app.utils.limits import CircuitOpen, Overloaded
+from app.utils.response_cache import PROJECTS, response_cache
+
+router = APIRouter()
+
+
+def refused(exc: Exception) -> HTTPException:
+    """429 when the caller is over its concurrency cap, 503 while the circuit is open."""
+    if isinstance(exc, CircuitOpen):
+        return HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": str(int(exc.retry_after) + 1)})
+    return HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": "1"})
+
+
+async def accessible_project(db, project_id: int, user: Principal):
+    if not await run_db(db, project_service.accessible_projects, user.id, [project_id]):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return await run_db(db, project_service.get_project, project_id)
+
+
+async def sse(events: AsyncIterator[ai_service.Event]):
+    """Server-sent events with the event name on its own line, so clients can dispatch on it."""
+    async for event, data in events:
+        yield b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+# GENERATE user stories for a project (cached by prompt, model and params)
+@router.post("/stories", response_model=ai_schema.StoriesResponse)
+async def generate_stories(
+    request: ai_schema.StoryRequest,
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    project = await accessible_project(db, request.project_id, user)
+    try:
+        # The model call blocks for seconds: keep it off the event loop and out of the request session
+        return await run_in_threadpool(
+            ai_service.generate_stories, project, request.count, request.prompt, user.id
+        )
+    except ProviderError as exc:
+        raise HTTPException(status_code=502, detail=f"AI provider error: {exc}")
+    except (CircuitOpen, Overloaded) as exc:
+        raise refused(exc)
+
+
+# STREAM user stories as server-sent events: token, story, then done or error
+@router.post("/stories/stream")
+async def stream_stories(
+    request: ai_schema.StoryRequest,
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    project = await accessible_project(db, request.project_id, user)
+    messages = ai_service.build_messages(project, request.count, request.prompt)
+    key = ai_service.cache_key(messages, AI_MODEL, ai_service.params())
+    cached = await run_db(db, ai_service.cache_get, key)
+    background = None
+    if cached is not None:
+        events = ai_service.replay_stories(cached)
+    else:
+        try:
+            slot = ai_service.admit(user.id)
+        except (CircuitOpen, Overloaded) as exc:
+            raise refused(exc)
+        events = ai_service.stream_stories(messages, key, slot)
+        # The stream frees the slot itself; this covers a client gone before it started
+        background = BackgroundTask(slot.release)
+    return StreamingResponse(
+        sse(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=background,
+    )
+
+
+# CREATE tasks from generated stories, all in one transaction
+@router.post("/stories/tasks", response_model=ai_schema.StoryTasksResult, status_code=status.HTTP_201_CREATED)
+async def create_story_tasks(
+    request: ai_schema.StoryTasksCreate,
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    tasks = [
+        {"title": story.title, "description": story.description, "status": request.status,
+         "assignee_id": request.assignee_id}
+        for story in request.stories
+    ]
+    task_ids = await run_db(db, task_service.create_project_tasks, request.project_id, tasks, user.id)
+    if task_ids is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    response_cache.invalidate(PROJECTS)
+    return {"project_id": request.project_id, "task_ids": task_ids}
@@ -1,27 +1,24 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from models import TaskComment
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from app.database import get_session, run_db
 from app.schemas import comment_schema
+from app.services import comment_service
+from app.utils.pagination import PageParams, set_next_cursor
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=comment_schema.CommentResponse, status_code=status.HTTP_201_CREATED)
-def add_comment(comment: comment_schema.CommentCreate, db: Session = Depends(get_db)):
-    entry = TaskComment(**comment.dict())
-    db.add(entry)
-    db.commit()
-    db.refresh(entry)
+async def add_comment(comment: comment_schema.CommentCreate, db=Depends(get_session)):
+    entry = await run_db(db, comment_service.add_comment, comment)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Task not found")
     return entry
 
 @router.get("/task/{task_id}", response_model=List[comment_schema.CommentResponse])
-def list_comments_for_task(task_id: int, db: Session = Depends(get_db)):
-    return db.query(TaskComment).filter(TaskComment.task_id == task_id).all()
+async def list_comments_for_task(task_id: int, response: Response, page: PageParams = Depends(), db=Depends(get_session)):
+    result = await run_db(db, comment_service.list_comments_for_task, task_id, page)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    comments, next_cursor = result
+    set_next_cursor(response, next_cursor)
+    return comments
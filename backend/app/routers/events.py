@@ -0,0 +1,43 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.config import EVENTS_HEARTBEAT
+from app.database import get_session, run_db
+from app.dependencies import get_stream_user, Principal
+from app.services import project_service
+# Importing event_service registers the session hooks that publish committed changes
+from app.services import event_service  # noqa: F401
+from app.utils.broker import broker
+
+router = APIRouter()
+
+
+async def event_stream(topics, heartbeat: float = EVENTS_HEARTBEAT):
+    """Server-sent events for ``topics``: one ``data:`` line per change, comments as keep-alives."""
+    subscription = broker.subscribe(topics)
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            payload = await subscription.get(heartbeat)
+            yield b": ping\n\n" if payload is None else b"data: " + payload + b"\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+# SUBSCRIBE to change events of one or more projects
+@router.get("/")
+async def stream_events(
+    project_id: List[int] = Query(..., description="Repeat to subscribe to several projects"),
+    db=Depends(get_session),
+    user: Principal = Depends(get_stream_user)
+):
+    allowed = await run_db(db, project_service.accessible_projects, user.id, project_id)
+    missing = sorted(set(project_id) - allowed)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Project not found: {', '.join(map(str, missing))}")
+    return StreamingResponse(
+        event_stream(allowed),
+        media_type="text/event-stream",
+        # Keep proxies from buffering or caching the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
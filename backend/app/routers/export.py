@@ -0,0 +1,56 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.dependencies import get_current_user, Principal
+from app.routers.task import task_filters
+from app.services import export_service, task_service
+from app.services.export_service import ExportFormat
+
+router = APIRouter()
+
+
+def _export_response(name: str, export, fmt: ExportFormat, gzip: bool) -> StreamingResponse:
+    fields, query = export
+    extension = fmt.value + (".gz" if gzip else "")
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{extension}"'}
+    # A .gz download is a gzip file, not a gzip-encoded CSV/NDJSON body: with
+    # Content-Encoding, clients would decompress it and save plain text as .gz
+    media_type = "application/gzip" if gzip else export_service.MEDIA_TYPES[fmt]
+    # Sync generator: Starlette pulls each chunk in the threadpool, so the
+    # server-side cursor never blocks the event loop
+    return StreamingResponse(
+        export_service.stream_export(fields, query, fmt, compress=gzip),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+@router.get("/tasks")
+async def export_tasks(
+    format: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = Query(False, description="Compress the stream on the fly"),
+    filters: task_service.TaskFilters = Depends(task_filters),
+    user: Principal = Depends(get_current_user),
+):
+    return _export_response("tasks", export_service.task_export(user.id, filters), format, gzip)
+
+
+@router.get("/projects")
+async def export_projects(
+    format: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = Query(False, description="Compress the stream on the fly"),
+    user: Principal = Depends(get_current_user),
+):
+    return _export_response("projects", export_service.project_export(user.id), format, gzip)
+
+
+@router.get("/comments")
+async def export_comments(
+    format: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = Query(False, description="Compress the stream on the fly"),
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    user: Principal = Depends(get_current_user),
+):
+    export = export_service.comment_export(user.id, project_id=project_id, task_id=task_id)
+    return _export_response("comments", export, format, gzip)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.database import get_session, run_db
+from app.dependencies import get_current_user, Principal
+from app.schemas import job_schema
+from app.services import job_service
+
+router = APIRouter()
+
+
+# STATUS of a background job (progress, result or last error)
+@router.get("/{job_id}", response_model=job_schema.JobRead)
+async def get_job(
+    job_id: int,
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    job = await run_db(db, job_service.get_job, job_id)
+    if not job or (job.user_id != user.id and user.role != "admin"):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
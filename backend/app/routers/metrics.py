@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from app.database import pool_stats
+from app.dependencies import principal_cache
+from app.services import ai_service
+from app.services.job_service import job_pool
+from app.services.user_service import user_index
+from app.utils.broker import broker
+from app.utils.response_cache import response_cache
+
+router = APIRouter()
+
+
+@router.get("/")
+def read_metrics():
+    return {
+        "principal_cache": principal_cache.stats(),
+        "db_pool": pool_stats(),
+        "response_cache": response_cache.stats(),
+        "user_index": user_index.stats(),
+        "events": broker.stats(),
+        "jobs": job_pool.stats(),
+        "ai": ai_service.stats(),
+    }
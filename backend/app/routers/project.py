@@ -1,19 +1,24 @@
 # FILE: app/routers/project.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
-import models
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Response
+from app.database import get_session, run_db
 from app.schemas import project_schema
-from typing import List
+from app.services import project_service
+from app.utils.etag import is_not_modified, not_modified, resource_etag, set_etag
+from app.utils.fieldsets import FieldSet, list_response
+from app.utils.pagination import PageParams
+from app.utils.response_cache import PROJECTS, response_cache
+from typing import List, Optional, Set
 # from app.dependencies import get_current_user  # Temporarily commented out for demo
 
 router = APIRouter()
 
+project_fields = FieldSet(project_schema.ProjectRead)
+
 # CREATE Project (Demo mode - no auth required)
 @router.post("/", response_model=project_schema.ProjectRead)
-def create_project(
+async def create_project(
     project: project_schema.ProjectCreate,
-    db: Session = Depends(get_db)
+    db=Depends(get_session)
     # user: models.User = Depends(get_current_user)  # Disabled for demo
 ):
     # Temporarily disabled role check for demo
@@ -22,68 +27,97 @@ def create_project(
     #         status_code=status.HTTP_403_FORBIDDEN,
     #         detail="You don't have permission to create projects."
     #     )
-    
-    db_project = models.Project(
-        name=project.name,
-        description=project.description,
-        owner_id=1  # Default owner_id for demo (change as needed)
-    )
-    db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+
+    # Default owner_id for demo (change as needed)
+    db_project = await run_db(db, project_service.create_project, project, owner_id=1)
+    response_cache.invalidate(PROJECTS)
     return db_project
 
 # LIST Projects (Demo mode - show all projects)
 @router.get("/", response_model=List[project_schema.ProjectRead])
-def list_projects(db: Session = Depends(get_db)):
+async def list_projects(
+    request: Request,
+    page: PageParams = Depends(),
+    fields: Optional[tuple] = Depends(project_fields),
+    db=Depends(get_session)
+):
     # user: models.User = Depends(get_current_user)  # Disabled for demo
     # return db.query(models.Project).filter(models.Project.owner_id == user.id).all()  # Original
-    return db.query(models.Project).all()  # Demo: show all projects
+    cache_key = response_cache.key(PROJECTS, request)
+    cached = response_cache.get(cache_key, request)
+    if cached is not None:
+        return cached
+    etag = resource_etag(request, await run_db(db, project_service.projects_version))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    projects, next_cursor = await run_db(db, project_service.list_projects, page, fields)  # Demo: show all projects
+    response = list_response(project_schema.ProjectRead, fields, projects, next_cursor)
+    set_etag(response, etag)
+    return response_cache.set(cache_key, response)
+
+def project_includes(
+    include: Optional[str] = Query(None, description="Comma-separated relationships to embed: tasks,members")
+) -> Set[str]:
+    names = {name.strip() for name in (include or "").split(",") if name.strip()}
+    unknown = names - project_service.PROJECT_INCLUDES.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+    return names
 
 # GET single project (detail)
-@router.get("/{project_id}", response_model=project_schema.ProjectRead)
-def get_project(
-    project_id: int, 
-    db: Session = Depends(get_db)
+@router.get("/{project_id}", response_model=project_schema.ProjectDetail, response_model_exclude_unset=True)
+async def get_project(
+    project_id: int,
+    request: Request,
+    response: Response,
+    include: Set[str] = Depends(project_includes),
+    db=Depends(get_session)
     # user: models.User = Depends(get_current_user)  # Disabled for demo
 ):
-    # project = db.query(models.Project).filter(models.Project.id == project_id, models.Project.owner_id == user.id).first()  # Original
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()  # Demo: any project
+    version = await run_db(db, project_service.project_version, project_id, include)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    etag = resource_etag(request, version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    project = await run_db(db, project_service.get_project_detail, project_id, include)  # Demo: any project
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    set_etag(response, etag)
+    return project_schema.ProjectDetail.model_validate(project, from_attributes=True)
 
 # UPDATE project
 @router.put("/{project_id}", response_model=project_schema.ProjectRead)
-def update_project(
+async def update_project(
     project_id: int,
     new_data: project_schema.ProjectCreate,
-    db: Session = Depends(get_db)
+    db=Depends(get_session)
     # user: models.User = Depends(get_current_user)  # Disabled for demo
 ):
-    # project = db.query(models.Project).filter(models.Project.id == project_id, models.Project.owner_id == user.id).first()  # Original
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()  # Demo: any project
+    project = await run_db(db, project_service.update_project, project_id, new_data)  # Demo: any project
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-
-    project.name = new_data.name
-    project.description = new_data.description
-    db.commit()
-    db.refresh(project)
+    response_cache.invalidate(PROJECTS)
     return project
 
-# DELETE project
+# DELETE project: hidden at once; a background job purges its tasks, comments and memberships
 @router.delete("/{project_id}")
-def delete_project(
-    project_id: int, 
-    db: Session = Depends(get_db)
+async def delete_project(
+    project_id: int,
+    db=Depends(get_session)
     # user: models.User = Depends(get_current_user)  # Disabled for demo
 ):
-    # project = db.query(models.Project).filter(models.Project.id == project_id, models.Project.owner_id == user.id).first()  # Original
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()  # Demo: any project
-    if not project:
+    job_id = await run_db(db, project_service.delete_project, project_id)  # Demo: any project
+    if not job_id:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    db.delete(project)
-    db.commit()
-    return {"detail": "Project deleted successfully"}
+    response_cache.invalidate(PROJECTS)
+    # Follow the purge at GET /jobs/{job_id}
+    return {"detail": "Project deleted successfully", "job_id": job_id}
+
+# Progress of a deleted project's purge; 404 once it has finished
+@router.get("/{project_id}/purge", response_model=project_schema.ProjectPurgeStatus)
+async def purge_status(project_id: int, db=Depends(get_session)):
+    purge = await run_db(db, project_service.purge_status, project_id)
+    if purge is None:
+        raise HTTPException(status_code=404, detail="No purge pending for this project")
+    return purge
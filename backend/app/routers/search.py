@@ -0,0 +1,22 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from app.database import get_session, run_db
+from app.dependencies import get_current_user, Principal
+from app.schemas import task_schema
+from app.services import search_service
+from app.utils.pagination import PageParams
+from app.utils.serialization import row_response
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[task_schema.TaskSearchHit])
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in task titles, descriptions and comments"),
+    project_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    rows, next_cursor = await run_db(db, search_service.search_tasks, user.id, q, page, project_id)
+    return row_response(search_service.SEARCH_FIELDS, rows, next_cursor)
@@ -0,0 +1,24 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.config import SYNC_PAGE_SIZE, SYNC_PAGE_SIZE_MAX
+from app.database import get_session, run_db
+from app.dependencies import get_current_user, Principal
+from app.schemas import sync_schema
+from app.services import sync_service
+
+router = APIRouter()
+
+
+# FETCH tasks, projects and comments changed since a cursor
+@router.get("/", response_model=sync_schema.SyncResponse)
+async def sync(
+    since: int = Query(0, ge=0, description="Cursor from the previous response; 0 fetches everything"),
+    limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=SYNC_PAGE_SIZE_MAX, description="Change-log entries per call"),
+    project_id: Optional[int] = None,
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    changes = await run_db(db, sync_service.sync_changes, user.id, since, limit, project_id)
+    if changes is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return changes
@@ -1,129 +1,192 @@
 # FILE: app/routers/task.py
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
-from app.database import get_db
-import models
+from fastapi import APIRouter, Depends, HTTPException, status, Body, File, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from app.config import BULK_MAX_ITEMS, IMPORT_BATCH_SIZE
+from app.database import get_session, run_db
 from app.schemas import task_schema
-from typing import List
+from app.services import import_service, task_service
+from app.utils.etag import is_not_modified, not_modified, resource_etag, set_etag
+from app.utils.fieldsets import FieldSet
+from app.utils.pagination import PageParams
+from app.utils.response_cache import PROJECTS, response_cache
+from app.utils.serialization import row_response
+from datetime import date
+from typing import Any, List, Optional
 from pydantic import BaseModel
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, Principal
 
 router = APIRouter(tags=["Tasks"])
 
+task_fields = FieldSet(task_schema.TaskRead)
+
 
 class AssignModel(BaseModel):
     assignee_id: int
 
+
+def task_filters(
+    project_id: Optional[int] = None,
+    status: Optional[List[str]] = Query(None, description="Repeat to match several statuses"),
+    assignee_id: Optional[int] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    sort: task_schema.TaskSort = task_schema.TaskSort.created_at,
+) -> task_service.TaskFilters:
+    return task_service.TaskFilters(
+        project_id=project_id,
+        status=status,
+        assignee_id=assignee_id,
+        due_from=due_from,
+        due_to=due_to,
+        created_from=created_from,
+        created_to=created_to,
+        sort=sort,
+    )
+
 # CREATE Task
 @router.post("/", response_model=task_schema.TaskRead)
-def create_task(
+async def create_task(
     task: task_schema.TaskCreate,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
 ):
-    project = db.query(models.Project).filter(
-        models.Project.id == task.project_id,
-        models.Project.owner_id == user.id
-    ).first()
-    if not project:
+    db_task = await run_db(db, task_service.create_task, task, user.id)
+    if not db_task:
         raise HTTPException(status_code=404, detail="Project not found")
-
-    db_task = models.Task(
-        title=task.title,
-        description=task.description,
-        status=task.status,
-        project_id=task.project_id,
-        assignee_id=task.assignee_id,
-        due_date=task.due_date
-    )
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    # Project listings embed task_count/progress
+    response_cache.invalidate(PROJECTS)
     return db_task
 
+def bulk_items(items: List[Any] = Body(..., description=f"Up to {BULK_MAX_ITEMS} items")) -> List[Any]:
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per request")
+    return items
+
+# CREATE many tasks in one transaction; items are validated and reported individually
+@router.post("/bulk", response_model=task_schema.BulkResult)
+async def bulk_create_tasks(
+    items: List[Any] = Depends(bulk_items),
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    result = await run_db(db, task_service.bulk_create_tasks, items, user.id)
+    if result["succeeded"]:
+        response_cache.invalidate(PROJECTS)
+    return result
+
+# PATCH many tasks; each item carries an id and only the fields to change
+@router.patch("/bulk", response_model=task_schema.BulkResult)
+async def bulk_update_tasks(
+    items: List[Any] = Depends(bulk_items),
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    result = await run_db(db, task_service.bulk_update_tasks, items, user.id)
+    if result["succeeded"]:
+        response_cache.invalidate(PROJECTS)
+    return result
+
+# IMPORT tasks from an uploaded CSV/NDJSON file, streaming reject and progress events
+@router.post("/import")
+async def import_tasks(
+    file: UploadFile = File(...),
+    format: Optional[import_service.ImportFormat] = Query(None, description="Defaults to csv for *.csv files, else ndjson"),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=BULK_MAX_ITEMS),
+    user: Principal = Depends(get_current_user)
+):
+    fmt = format or import_service.guess_format(file.filename)
+
+    def events():
+        try:
+            yield from import_service.stream_import(file.file, fmt, user.id, batch_size)
+        finally:
+            response_cache.invalidate(PROJECTS)
+
+    # The upload is spooled to disk and stays open until the response is sent
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 # LIST tasks for a project (or all owned projects)
 @router.get("/", response_model=List[task_schema.TaskRead])
-def list_tasks(
-    project_id: int = None,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+async def list_tasks(
+    request: Request,
+    filters: task_service.TaskFilters = Depends(task_filters),
+    page: PageParams = Depends(),
+    fields: Optional[tuple] = Depends(task_fields),
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    etag = resource_etag(request, user.id, await run_db(db, task_service.tasks_version, user.id, filters))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    rows, next_cursor = await run_db(db, task_service.list_tasks, user.id, page, filters, fields)
+    response = row_response(fields or task_service.TASK_FIELDS, rows, next_cursor)
+    set_etag(response, etag)
+    return response
+
+# Dashboard counters, computed with GROUP BY (declared before /{task_id})
+@router.get("/stats", response_model=task_schema.TaskStats)
+async def task_stats(
+    project_id: Optional[int] = None,
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
 ):
-    query = db.query(models.Task).join(models.Project)
-    if project_id is not None:
-        query = query.filter(models.Task.project_id == project_id)
-    else:
-        query = query.filter(models.Project.owner_id == user.id)
-    return query.all()
+    return await run_db(db, task_service.task_stats, user.id, project_id=project_id)
 
 # GET single task (detail)
 @router.get("/{task_id}", response_model=task_schema.TaskRead)
-def get_task(
+async def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
 ):
-    task = db.query(models.Task).join(models.Project).filter(
-        models.Task.id == task_id,
-        models.Project.owner_id == user.id
-    ).first()
+    task = await run_db(db, task_service.get_task, task_id, user.id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    etag = resource_etag(request, task.id, task.updated_at)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return task
 
 # UPDATE task
 @router.put("/{task_id}", response_model=task_schema.TaskRead)
-def update_task(
+async def update_task(
     task_id: int,
     new_data: task_schema.TaskCreate,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
 ):
-    task = db.query(models.Task).join(models.Project).filter(
-        models.Task.id == task_id, models.Project.owner_id == user.id
-    ).first()
+    task = await run_db(db, task_service.update_task, task_id, new_data, user.id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    task.title = new_data.title
-    task.description = new_data.description
-    task.status = new_data.status
-    task.assignee_id = new_data.assignee_id
-    task.due_date = new_data.due_date
-    db.commit()
-    db.refresh(task)
+    response_cache.invalidate(PROJECTS)
     return task
 
 # DELETE task
 @router.delete("/{task_id}")
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
 ):
-    task = db.query(models.Task).join(models.Project).filter(
-        models.Task.id == task_id,
-        models.Project.owner_id == user.id
-    ).first()
-    if not task:
+    if not await run_db(db, task_service.delete_task, task_id, user.id):
         raise HTTPException(status_code=404, detail="Task not found")
-    db.delete(task)
-    db.commit()
+    response_cache.invalidate(PROJECTS)
     return {"detail": "Task deleted"}
 
 # ASSIGN task to user
 @router.post("/{task_id}/assign")
-def assign_task(
+async def assign_task(
     task_id: int,
     assignment: AssignModel = Body(...),
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
 ):
-    task = db.query(models.Task).join(models.Project).filter(
-        models.Task.id == task_id,
-        models.Project.owner_id == user.id
-    ).first()
+    task = await run_db(db, task_service.assign_task, task_id, assignment.assignee_id, user.id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    task.assignee_id = assignment.assignee_id
-    db.commit()
-    db.refresh(task)
     return {"detail": "Task assigned successfully", "assignee_id": task.assignee_id}
@@ -1,34 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, status, Form, Query, Request
+from app.database import get_session, run_db
 from models import User
 from app.schemas import user_schema
-from typing import List
-from app.utils.security import hash_password, verify_password
+from app.services import user_service
+from app.utils.fieldsets import list_response
+from app.utils.pagination import PageParams
+from app.utils.response_cache import USERS, response_cache
+from app.utils.serialization import row_response
+from typing import List, Optional
+from app.utils.security import hash_password_async, verify_and_update_async
 from jose import jwt
 import os
-from sqlalchemy.exc import IntegrityError
 router = APIRouter()
-from app.dependencies import get_current_user
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.dependencies import get_current_user, Principal
 
 SECRET_KEY = os.environ.get("SECRET_KEY", "EW7zNXSvDEYF8n6S8Clh3lZQhbgxhFjSP955AA13c_0")
 ALGORITHM = "HS256"
 
 # ---------- LOGIN ----------
+# Password work runs on the dedicated hashing pool and DB work through
+# run_db, so a login burst cannot starve other endpoints.
 @router.post("/login")
-def login(data: user_schema.UserLogin, db: Session = Depends(get_db)):
-    print("email:", data.email)
-    print("password:", data.password)
-    user = db.query(User).filter(User.email == data.email).first()
-    if not user or not verify_password(data.password, user.password):
+async def login(data: user_schema.UserLogin, db=Depends(get_session)):
+    user = await run_db(db, user_service.find_by_email, data.email, User.id, User.password, User.role)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    valid, new_hash = await verify_and_update_async(data.password, user.password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Stored hash used an outdated cost factor; upgrade it transparently
+        await run_db(db, user_service.update_password, user.id, new_hash)
     payload = {"user_id": user.id, "role": str(user.role)}
     token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
     return {"access_token": token, "token_type": "bearer"}
@@ -36,34 +38,45 @@ def login(data: user_schema.UserLogin, db: Session = Depends(get_db)):
 
 # ---------- REGISTER ----------
 @router.post("/", response_model=user_schema.UserResponse)
-def register_user(user_data: user_schema.UserCreate, db: Session = Depends(get_db)):
-    print("DEBUG incoming registration data:", user_data.dict())
-
-    db_user = db.query(User).filter(User.email == user_data.email).first()
+async def register_user(user_data: user_schema.UserCreate, db=Depends(get_session)):
+    db_user = await run_db(db, user_service.find_by_email, user_data.email, User.id)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_pw = hash_password(user_data.password)
+    hashed_pw = await hash_password_async(user_data.password)
     user_obj = User(
         username=user_data.username,
         email=user_data.email,
         password=hashed_pw,
         role=user_data.role
     )
-    db.add(user_obj)
-    try:
-        db.commit()
-    except IntegrityError as e:
-        db.rollback()
-        print("DB Error:", str(e))
-        raise HTTPException(status_code=400, detail="Database error: {}".format(e.orig))
-    db.refresh(user_obj)
-    return user_obj
+    db_user = await run_db(db, user_service.create_user, user_obj)
+    response_cache.invalidate(USERS)
+    return db_user
 
 # ---------- GET ALL USERS ----------
 @router.get("/", response_model=List[user_schema.UserRead])
-def get_all_users(db: Session = Depends(get_db)):
-    return db.query(User).all()
+async def get_all_users(request: Request, page: PageParams = Depends(), db=Depends(get_session)):
+    cache_key = response_cache.key(USERS, request)
+    cached = response_cache.get(cache_key, request)
+    if cached is not None:
+        return cached
+    users, next_cursor = await run_db(db, user_service.list_users, page)
+    return response_cache.set(cache_key, list_response(user_schema.UserRead, None, users, next_cursor))
+
+# ---------- TYPEAHEAD ----------
+@router.get("/search", response_model=List[user_schema.UserRead])
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=128, description="Username or email prefix (case-insensitive)"),
+    limit: int = Query(10, ge=1, le=50),
+    project_id: Optional[int] = Query(None, description="Only the project's owner and members"),
+    db=Depends(get_session),
+    user: Principal = Depends(get_current_user)
+):
+    rows = await run_db(db, user_service.search_users, q, limit, project_id)
+    if rows is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return row_response(user_service.USER_SEARCH_FIELDS, rows)
 
 @router.get("/me", response_model=user_schema.UserRead)
-def get_current_user_info(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    return user
\ No newline at end of file
+async def get_current_user_info(user: Principal = Depends(get_current_user)):
+    return user
@@ -0,0 +1,35 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class StoryRequest(BaseModel):
+    project_id: int
+    # Optional steer, e.g. "onboarding and billing"
+    prompt: Optional[str] = Field(None, max_length=2000)
+    count: int = Field(5, ge=1, le=20)
+
+
+class Story(BaseModel):
+    title: str = Field(..., max_length=100)
+    description: str = ""
+
+
+class StoriesResponse(BaseModel):
+    stories: List[Story]
+    # True when served from the ai_cache table without calling the model
+    cached: bool
+    model: str
+
+
+class StoryTasksCreate(BaseModel):
+    project_id: int
+    # Typically the stories picked from a generation, possibly edited
+    stories: List[Story] = Field(..., min_length=1, max_length=100)
+    status: str = "todo"
+    assignee_id: Optional[int] = None
+
+
+class StoryTasksResult(BaseModel):
+    project_id: int
+    # Ids of the created tasks, in the order of the stories
+    task_ids: List[int]
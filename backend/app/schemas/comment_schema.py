@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, AliasChoices
 from typing import Optional
+from datetime import datetime
 
 class CommentBase(BaseModel):
     comment: str
@@ -9,10 +10,12 @@ class CommentCreate(CommentBase):
     user_id: int
 
 class CommentResponse(CommentBase):
+    # TaskComment stores the text as ``content`` and the time as ``created_at``
+    comment: str = Field(validation_alias=AliasChoices("comment", "content"))
     id: int
     task_id: int
     user_id: int
-    timestamp: Optional[str]
+    timestamp: Optional[datetime] = Field(None, validation_alias=AliasChoices("timestamp", "created_at"))
 
     class Config:
        from_attributes = True
@@ -0,0 +1,24 @@
+from typing import Any, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class JobRead(BaseModel):
+    id: int
+    kind: str
+    # queued (also while waiting for a retry), running, succeeded or failed
+    status: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    # Whatever the handler last reported, e.g. rows deleted so far
+    progress: Optional[Any] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,7 @@
 from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field
+from app.schemas.user_schema import UserResponse
 
 class ProjectBase(BaseModel):
     name: str = Field(..., max_length=100, title="Project Name")
@@ -17,10 +18,24 @@ class ProjectRead(ProjectBase):
     owner_id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    # Read from project_task_counters, not by counting tasks
+    task_count: int = 0
+    progress: float = 0.0
 
     class Config:
         from_attributes = True
 
+class PurgeRemaining(BaseModel):
+    comments: int
+    tasks: int
+    members: int
+
+class ProjectPurgeStatus(BaseModel):
+    project_id: int
+    deleted_at: datetime
+    # Rows the background purge has yet to delete
+    remaining: PurgeRemaining
+
 # If you want to include task summaries in project details:
 class TaskSummary(BaseModel):
     id: int
@@ -32,8 +47,17 @@ class TaskSummary(BaseModel):
     class Config:
         from_attributes = True
 
+class MemberSummary(BaseModel):
+    user_id: int
+    user: UserResponse
+
+    class Config:
+        from_attributes = True
+
+# Relationships are only present when requested with ?include=
 class ProjectDetail(ProjectRead):
-    tasks: List[TaskSummary] = []
+    tasks: Optional[List[TaskSummary]] = None
+    members: Optional[List[MemberSummary]] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,23 @@
+from typing import List
+from pydantic import BaseModel
+from app.schemas.comment_schema import CommentResponse
+from app.schemas.project_schema import ProjectRead
+from app.schemas.task_schema import TaskRead
+
+
+class SyncDeleted(BaseModel):
+    tasks: List[int] = []
+    projects: List[int] = []
+    comments: List[int] = []
+
+
+class SyncResponse(BaseModel):
+    # Pass back as ?since= on the next call; keep calling while has_more is true
+    cursor: int
+    has_more: bool
+    # Projects the caller can see now; local data of any other project is stale
+    project_ids: List[int]
+    tasks: List[TaskRead] = []
+    projects: List[ProjectRead] = []
+    comments: List[CommentResponse] = []
+    deleted: SyncDeleted = SyncDeleted()
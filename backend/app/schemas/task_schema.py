@@ -1,17 +1,25 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, field_validator
+from typing import Dict, List, Optional
 import enum
-from datetime import date
+from datetime import date, datetime
 class StatusType(str, enum.Enum):
     todo = "todo"
     in_progress = "in_progress"
     done = "done"
 
+class TaskSort(str, enum.Enum):
+    created_at = "created_at"
+    created_at_desc = "-created_at"
+    due_date = "due_date"
+    due_date_desc = "-due_date"
+    title = "title"
+    title_desc = "-title"
+
 class TaskBase(BaseModel):
     title: str
     description: Optional[str] = None
     status: StatusType = StatusType.todo
-    due_date: Optional[str] = None
+    due_date: Optional[datetime] = None
 
 class TaskCreate(BaseModel):
     title: str
@@ -21,10 +29,13 @@ class TaskCreate(BaseModel):
     assignee_id: Optional[int] = None
     due_date: Optional[date] = None
 class TaskRead(TaskBase):
+    # Stored statuses are free-form (TaskCreate.status is a plain str)
+    status: str
     id: int
     project_id: int
     assignee_id: Optional[int]
-    created_at: str
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True    
@@ -35,3 +46,47 @@ class TaskResponse(TaskBase):
     assignee_id: Optional[int]
     class Config:
         from_attributes = True
+
+# PATCH /tasks/bulk item: only the fields present are changed
+class TaskPatch(BaseModel):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[str] = None
+    assignee_id: Optional[int] = None
+    due_date: Optional[date] = None
+
+    @field_validator("title", "description", "status")
+    @classmethod
+    def not_null(cls, value):
+        # Omit a field to leave it unchanged; only assignee_id and due_date can be cleared
+        if value is None:
+            raise ValueError("may not be null")
+        return value
+
+class BulkItemResult(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+class TaskSearchHit(TaskRead):
+    # Higher is more relevant; only comparable within one query
+    score: float
+    # Matching excerpt with terms in [brackets] (SQLite only)
+    snippet: Optional[str] = None
+
+class AssigneeCount(BaseModel):
+    assignee_id: Optional[int]
+    count: int
+
+class TaskStats(BaseModel):
+    total: int
+    overdue: int
+    by_status: Dict[str, int]
+    by_assignee: List[AssigneeCount]
@@ -0,0 +1,3 @@
+# Importing any service registers the change-log session hooks, so every
+# process that writes through the services (API, manage.py) keeps GET /sync/ complete
+from app.services import sync_service  # noqa: F401
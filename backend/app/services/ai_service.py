@@ -0,0 +1,352 @@
+"""AI user-story generation with a persistent response cache.
+
+Replies are cached in ``ai_cache`` under a hash of the normalized prompt,
+the model and the sampling params, so asking again for the same project
+and focus is a row lookup instead of a multi-second paid call. Concurrent
+identical requests in this process share one upstream call (single-flight);
+across processes the cache catches repeats once the first call has finished.
+Entries expire after AI_CACHE_TTL and the least recently used are evicted
+past AI_CACHE_MAX_ENTRIES.
+
+Every model call, blocking or streamed, takes a slot from ``limiter`` (global
+and per-user caps) and goes through ``breaker``, which stops calling a
+failing provider for a while instead of tying up slots on doomed requests.
+Streams are per client and not coalesced, but their result is cached too.
+"""
+import asyncio
+import hashlib
+import threading
+from collections import Counter
+from contextlib import aclosing
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional, Tuple
+import orjson
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+import models
+from app.config import (
+    AI_BREAKER_FAILURES,
+    AI_BREAKER_RESET,
+    AI_CACHE_MAX_ENTRIES,
+    AI_CACHE_TTL,
+    AI_MAX_CONCURRENT,
+    AI_MAX_CONCURRENT_PER_USER,
+    AI_MAX_TOKENS,
+    AI_MODEL,
+    AI_PROVIDER,
+    AI_STREAM_IDLE_TIMEOUT,
+    AI_STREAM_TIMEOUT,
+    AI_TEMPERATURE,
+)
+from app.database import SessionLocal
+from app.utils.ai_providers import Messages, ProviderError, make_provider
+from app.utils.limits import CircuitBreaker, ConcurrencyLimiter, Overloaded, Slot
+from app.utils.singleflight import SingleFlight
+
+SYSTEM_PROMPT = (
+    "You are a product manager writing agile user stories. Reply with only a JSON array of objects "
+    'with a "title" (at most 100 characters, "As a <role>, I want <goal>") and a "description" '
+    "holding the benefit and acceptance criteria."
+)
+
+_provider = None
+_provider_lock = threading.Lock()
+flights = SingleFlight()
+limiter = ConcurrencyLimiter(AI_MAX_CONCURRENT, AI_MAX_CONCURRENT_PER_USER)
+breaker = CircuitBreaker(AI_BREAKER_FAILURES, AI_BREAKER_RESET)
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def get_provider():
+    """The configured provider, created on first use so the app starts without AI credentials."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            try:
+                _provider = make_provider()
+            except RuntimeError as exc:
+                # Missing package or key: report it like any other upstream failure
+                raise ProviderError(str(exc)) from exc
+        return _provider
+
+
+def _count(name: str):
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def build_messages(project, count: int, prompt: Optional[str] = None) -> Messages:
+    lines = [f"Project: {project.name}"]
+    if project.description:
+        lines.append(f"Description: {project.description}")
+    if prompt:
+        lines.append(f"Focus: {prompt}")
+    lines.append(f"Write {count} user stories.")
+    return [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": "\n".join(lines)}]
+
+
+def params() -> dict:
+    return {"temperature": AI_TEMPERATURE, "max_tokens": AI_MAX_TOKENS}
+
+
+def normalize(text: str) -> str:
+    """Prompt text as compared for caching: case and runs of whitespace do not matter."""
+    return " ".join(text.split()).casefold()
+
+
+def cache_key(messages: Messages, model: str, params: dict) -> str:
+    canonical = {
+        "messages": [[message["role"], normalize(message["content"])] for message in messages],
+        "model": model,
+        "params": params,
+    }
+    return hashlib.sha256(orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _story(item) -> Optional[dict]:
+    if not (isinstance(item, dict) and isinstance(item.get("title"), str) and item["title"].strip()):
+        return None
+    return {"title": item["title"].strip()[:100], "description": str(item.get("description") or "").strip()}
+
+
+def parse_stories(text: str) -> List[dict]:
+    """Stories from a model reply: the JSON array in it, with untitled items dropped."""
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end < start:
+        raise ProviderError("Model reply holds no JSON array")
+    try:
+        items = orjson.loads(text[start:end + 1])
+    except orjson.JSONDecodeError as exc:
+        raise ProviderError(f"Model reply is not valid JSON: {exc}") from exc
+    stories = [story for story in map(_story, items) if story]
+    if not stories:
+        raise ProviderError("Model reply holds no stories")
+    return stories
+
+
+class StoryStream:
+    """Picks stories out of a reply as it streams in.
+
+    Each object at the top level of a JSON array is parsed as soon as its
+    closing brace arrives; prose around the array is skipped.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.stories: List[dict] = []
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._start = None
+
+    def feed(self, chunk: str) -> List[dict]:
+        """Add ``chunk``; returns the stories it completed."""
+        self.text += chunk
+        found = []
+        for index in range(self._pos, len(self.text)):
+            char = self.text[index]
+            if self._depth == 0:
+                # Prose around the array may hold quotes; only the array is scanned
+                self._depth = 1 if char == "[" else 0
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+                if char == "{" and self._depth == 2:
+                    self._start = index
+            elif char in "]}":
+                if char == "}" and self._depth == 2 and self._start is not None:
+                    try:
+                        story = _story(orjson.loads(self.text[self._start:index + 1]))
+                    except orjson.JSONDecodeError:
+                        story = None
+                    if story:
+                        found.append(story)
+                    self._start = None
+                self._depth -= 1
+        self._pos = len(self.text)
+        self.stories.extend(found)
+        return found
+
+
+def cache_get(db: Session, key: str) -> Optional[list]:
+    """Cached reply for ``key`` if it has not expired; a hit refreshes its LRU position."""
+    entry = models.AICache
+    now = datetime.now()
+    response = db.execute(select(entry.response).where(entry.key == key, entry.expires_at > now)).scalar()
+    if response is not None:
+        db.execute(update(entry).where(entry.key == key).values(hits=entry.hits + 1, last_used_at=now))
+        db.commit()
+    return response
+
+
+def cache_put(db: Session, key: str, model: str, response, ttl: float = AI_CACHE_TTL):
+    now = datetime.now()
+    db.merge(models.AICache(
+        key=key, model=model, response=response, hits=0,
+        created_at=now, last_used_at=now, expires_at=now + timedelta(seconds=ttl),
+    ))
+    db.flush()
+    evict(db, now)
+    db.commit()
+
+
+def evict(db: Session, now: Optional[datetime] = None, max_entries: int = AI_CACHE_MAX_ENTRIES) -> int:
+    """Delete expired entries, then the least recently used beyond ``max_entries``."""
+    entry = models.AICache
+    removed = db.execute(delete(entry).where(entry.expires_at <= (now or datetime.now()))).rowcount
+    excess = db.execute(select(func.count()).select_from(entry)).scalar() - max_entries
+    if excess > 0:
+        oldest = db.execute(select(entry.key).order_by(entry.last_used_at).limit(excess)).scalars().all()
+        removed += db.execute(delete(entry).where(entry.key.in_(oldest))).rowcount
+    with _counters_lock:
+        _counters["evictions"] += removed
+    return removed
+
+
+def admit(user_id: Optional[int]) -> Slot:
+    """Reserve a model call for ``user_id``; raises ``CircuitOpen`` or ``Overloaded``."""
+    probe = breaker.allow()
+    try:
+        return limiter.acquire(user_id)
+    except Overloaded:
+        if probe:
+            breaker.cancel_probe()
+        raise
+
+
+def generate_stories(project, count: int, prompt: Optional[str] = None, user_id: Optional[int] = None) -> dict:
+    """``count`` user stories for ``project``, from the cache or one upstream call.
+
+    Blocks for the length of the model call; run it off the event loop.
+    Raises ``ProviderError`` if the model fails or its reply cannot be parsed
+    (nothing is cached then), and ``CircuitOpen`` or ``Overloaded`` if the
+    call is refused.
+    """
+    messages = build_messages(project, count, prompt)
+    key = cache_key(messages, AI_MODEL, params())
+    db = SessionLocal()
+    try:
+        stories = cache_get(db, key)
+    finally:
+        db.close()
+    if stories is not None:
+        _count("hits")
+        return {"stories": stories, "cached": True, "model": AI_MODEL}
+    _count("misses")
+
+    def call():
+        db = SessionLocal()
+        try:
+            # Filled meanwhile by a leader that finished after our lookup, here or in another process
+            stories = cache_get(db, key)
+            if stories is None:
+                provider = get_provider()
+                try:
+                    with admit(user_id):
+                        _count("upstream_calls")
+                        try:
+                            reply = provider.complete(messages, model=AI_MODEL, **params())
+                        except ProviderError:
+                            breaker.record_failure()
+                            raise
+                        breaker.record_success()
+                    stories = parse_stories(reply)
+                except ProviderError:
+                    _count("errors")
+                    raise
+                cache_put(db, key, AI_MODEL, stories)
+            return stories
+        finally:
+            db.close()
+
+    return {"stories": flights.do(key, call), "cached": False, "model": AI_MODEL}
+
+
+def _store(key: str, stories: List[dict]):
+    db = SessionLocal()
+    try:
+        cache_put(db, key, AI_MODEL, stories)
+    finally:
+        db.close()
+
+
+Event = Tuple[str, dict]
+
+
+async def replay_stories(stories: List[dict]) -> AsyncIterator[Event]:
+    """The events of ``stream_stories`` for a reply found in the cache."""
+    _count("hits")
+    for index, story in enumerate(stories):
+        yield "story", {"index": index, **story}
+    yield "done", {"stories": stories, "cached": True, "model": AI_MODEL}
+
+
+async def stream_stories(
+    messages: Messages, key: str, slot: Slot, *,
+    timeout: float = AI_STREAM_TIMEOUT, idle_timeout: float = AI_STREAM_IDLE_TIMEOUT,
+) -> AsyncIterator[Event]:
+    """Stream a model call as ``(event, data)`` pairs.
+
+    ``token`` carries each piece of reply text and ``story`` each story once
+    complete; the stream ends with ``done`` (all stories, now cached) or
+    ``error``. ``slot`` (from ``admit``) is released as soon as the model is
+    done, or when the client goes away.
+    """
+    _count("misses")
+    parser = StoryStream()
+    loop = asyncio.get_running_loop()
+    try:
+        try:
+            provider = get_provider()
+            _count("upstream_calls")
+            _count("streams")
+            deadline = loop.time() + timeout
+            async with aclosing(provider.stream(messages, model=AI_MODEL, **params())) as chunks:
+                while True:
+                    wait = max(0.0, min(idle_timeout, deadline - loop.time()))
+                    try:
+                        text = await asyncio.wait_for(anext(chunks), wait)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        breaker.record_failure()
+                        if wait < idle_timeout:
+                            raise ProviderError(f"Model reply took longer than {timeout:g}s") from None
+                        raise ProviderError(f"No reply from the model for {idle_timeout:g}s") from None
+                    except ProviderError:
+                        breaker.record_failure()
+                        raise
+                    yield "token", {"text": text}
+                    found = parser.feed(text)
+                    for index, story in enumerate(found, len(parser.stories) - len(found)):
+                        yield "story", {"index": index, **story}
+            breaker.record_success()
+        finally:
+            slot.release()
+        stories = parser.stories or parse_stories(parser.text)
+    except ProviderError as exc:
+        _count("errors")
+        yield "error", {"detail": f"AI provider error: {exc}"}
+        return
+    await run_in_threadpool(_store, key, stories)
+    yield "done", {"stories": stories, "cached": False, "model": AI_MODEL}
+
+
+def stats() -> dict:
+    with _counters_lock:
+        counters = dict(_counters)
+    return {
+        "provider": AI_PROVIDER, **counters, **flights.stats(),
+        "limiter": limiter.stats(), "breaker": breaker.stats(),
+    }
@@ -0,0 +1,30 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from models import Project, Task, TaskComment
+from app.schemas import comment_schema
+from app.utils.pagination import Keyset, PageParams, paginate
+
+COMMENT_KEYSET = Keyset("created_at", TaskComment.created_at, TaskComment.id)
+
+
+def _visible_task(db: Session, task_id: int) -> bool:
+    # The join lets the soft-delete criteria hide tasks of deleted projects
+    return db.query(Task.id).join(Project).filter(Task.id == task_id).first() is not None
+
+
+def add_comment(db: Session, comment: comment_schema.CommentCreate) -> Optional[TaskComment]:
+    if not _visible_task(db, comment.task_id):
+        return None
+    entry = TaskComment(content=comment.comment, task_id=comment.task_id, user_id=comment.user_id)
+    db.add(entry)
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+def list_comments_for_task(db: Session, task_id: int, page: PageParams):
+    """A page of the task's comments, or ``None`` if the task is gone or its project deleted."""
+    if not _visible_task(db, task_id):
+        return None
+    query = db.query(TaskComment).filter(TaskComment.task_id == task_id)
+    return paginate(query, COMMENT_KEYSET, page)
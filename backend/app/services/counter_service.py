@@ -0,0 +1,74 @@
+from collections import defaultdict
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import models
+
+Counter = models.ProjectTaskCounter
+
+# (project_id, status) -- the counter row a task contributes to. Overdue is
+# left out: it changes with the clock, not with writes, so it is counted at read time
+CounterKey = Tuple[int, str]
+
+
+def counter_key(task: models.Task) -> Optional[CounterKey]:
+    if task.project_id is None:
+        return None
+    return task.project_id, task.status
+
+
+def _bump(db: Session, project_id: int, status: str, count: int):
+    values = {"count": Counter.count + count}
+    where = and_(Counter.project_id == project_id, Counter.status == status)
+    if db.execute(update(Counter).where(where).values(**values)).rowcount:
+        return
+    try:
+        # A concurrent writer may create the row first; retry as an update then
+        with db.begin_nested():
+            db.execute(insert(Counter).values(
+                project_id=project_id, status=status, count=count
+            ))
+    except IntegrityError:
+        db.execute(update(Counter).where(where).values(**values))
+
+
+def track_task(db: Session, before: Optional[CounterKey], after):
+    """Move a task's contribution from ``before`` to ``after`` in the current transaction.
+
+    ``after`` is a task (its key is read now) or ``None`` when the task is deleted.
+    """
+    track_tasks(db, [(before, after)])
+
+
+def track_tasks(db: Session, changes: Iterable[Tuple[Optional[CounterKey], object]]):
+    """Apply many ``(before, after)`` moves with one UPDATE per distinct counter row."""
+    deltas = defaultdict(int)
+    for before, after in changes:
+        if isinstance(after, models.Task):
+            after = counter_key(after)
+        if before == after:
+            continue
+        for key, sign in ((before, -1), (after, 1)):
+            if key is not None:
+                deltas[key] += sign
+    for (project_id, status), count in deltas.items():
+        if count:
+            _bump(db, project_id, status, count)
+
+
+def rebuild_counters(db: Session, project_id: Optional[int] = None) -> int:
+    """Recompute counters from the tasks table; returns the number of counter rows written."""
+    source = select(
+        models.Task.project_id, models.Task.status, func.count(models.Task.id)
+    ).where(models.Task.project_id.isnot(None)).group_by(models.Task.project_id, models.Task.status)
+    clear = delete(Counter)
+    if project_id is not None:
+        source = source.where(models.Task.project_id == project_id)
+        clear = clear.where(Counter.project_id == project_id)
+    db.execute(clear)
+    result = db.execute(insert(Counter).from_select(
+        [Counter.project_id, Counter.status, Counter.count], source
+    ))
+    db.commit()
+    return result.rowcount
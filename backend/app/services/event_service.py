@@ -0,0 +1,113 @@
+"""Change events for GET /events/, captured from the ORM session.
+
+Every flush records the task, project and comment rows it inserted, updated
+or deleted; the events are published only once the transaction commits and
+are discarded if it does not. Because this hooks the session rather than
+individual endpoints, bulk writes and imports publish like single writes.
+Rows written with Core statements (``query.update()``, ``insert()``) are not
+seen.
+"""
+from typing import Dict, List, Tuple
+import orjson
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+import models
+from app.utils.broker import broker
+
+KINDS = {models.Task: "task", models.Project: "project", models.TaskComment: "comment"}
+
+_PENDING = "pending_events"
+_CHANGES = "flushed_changes"
+
+
+def _columns(model) -> Tuple[str, ...]:
+    return tuple(inspect(model).column_attrs.keys())
+
+
+COLUMNS = {model: _columns(model) for model in KINDS}
+
+
+def _row(obj) -> dict:
+    return {key: getattr(obj, key) for key in COLUMNS[type(obj)]}
+
+
+def _changed(obj) -> set:
+    return {attr.key for attr in inspect(obj).attrs if attr.history.has_changes()}
+
+
+def _action(obj, state: str) -> str:
+    if state == "updated" and isinstance(obj, models.Task) and _changed(obj) - {"updated_at"} == {"assignee_id"}:
+        return "assigned"
+    return state
+
+
+def _comment_projects(session: Session, comments) -> Dict[int, int]:
+    task_ids = {comment.task_id for comment in comments}
+    if not task_ids:
+        return {}
+    rows = session.connection().execute(
+        select(models.Task.id, models.Task.project_id).where(models.Task.id.in_(task_ids))
+    )
+    return dict(rows.all())
+
+
+def flushed_changes(session: Session, flush_context) -> List[Tuple[object, str, int]]:
+    """``(obj, state, project_id)`` for each task, project and comment written by this flush.
+
+    ``state`` is created, updated or deleted. Computed once per flush and
+    shared by every hook that needs it (events here, the change log in
+    sync_service); rows without a project are left out.
+    """
+    if _CHANGES in flush_context.attributes:
+        return flush_context.attributes[_CHANGES]
+    changes: List[tuple] = []
+    for objects, state in ((session.new, "created"), (session.dirty, "updated"), (session.deleted, "deleted")):
+        for obj in objects:
+            if type(obj) not in KINDS:
+                continue
+            if state == "updated" and not session.is_modified(obj, include_collections=False):
+                continue
+            if state == "updated" and isinstance(obj, models.Project) and obj.deleted_at is not None:
+                # Soft delete; the purge later removes the rows without the session
+                state = "deleted"
+            changes.append((obj, state))
+    projects = _comment_projects(session, [obj for obj, _ in changes if isinstance(obj, models.TaskComment)])
+    located = []
+    for obj, state in changes:
+        if isinstance(obj, models.Project):
+            project_id = obj.id
+        elif isinstance(obj, models.Task):
+            project_id = obj.project_id
+        else:
+            project_id = projects.get(obj.task_id)
+        if project_id is not None:
+            located.append((obj, state, project_id))
+    flush_context.attributes[_CHANGES] = located
+    return located
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, flush_context):
+    if not broker.active:
+        return
+    changes = flushed_changes(session, flush_context)
+    if not changes:
+        return
+    pending = session.info.setdefault(_PENDING, [])
+    for obj, state, topic in changes:
+        data = {"id": obj.id} if state == "deleted" else _row(obj)
+        kind = f"{KINDS[type(obj)]}.{_action(obj, state)}"
+        pending.append((topic, orjson.dumps({"type": kind, "project_id": topic, "data": data})))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish(session: Session):
+    for topic, payload in session.info.pop(_PENDING, ()):
+        broker.publish(topic, payload)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard(session: Session, transaction):
+    # Rolled back or closed without committing (after_commit already took committed events)
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
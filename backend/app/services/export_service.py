@@ -0,0 +1,114 @@
+import csv
+import enum
+import io
+import zlib
+from datetime import date, datetime
+from typing import Iterator, Optional, Sequence, Tuple
+from sqlalchemy import select
+import models
+from app import config
+from app.database import SessionLocal
+from app.services import task_service
+from app.utils.serialization import row_encoder
+
+
+class ExportFormat(str, enum.Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+PROJECT_FIELDS = ("id", "name", "description", "owner_id", "created_at", "updated_at")
+COMMENT_FIELDS = ("id", "task_id", "user_id", "content", "created_at")
+
+
+def _columns(model, fields: Sequence[str]) -> list:
+    return [getattr(model, name) for name in fields]
+
+
+def task_export(owner_id: int, filters: task_service.TaskFilters) -> Tuple[Tuple[str, ...], object]:
+    fields = task_service.TASK_FIELDS
+    query = select(*_columns(models.Task, fields)).select_from(models.Task).join(models.Project)
+    query = task_service.filter_tasks(query, filters, owner_id)
+    return fields, query.order_by(*task_service.TASK_SORTS[filters.sort].order_by())
+
+
+def project_export(owner_id: int) -> Tuple[Tuple[str, ...], object]:
+    query = select(*_columns(models.Project, PROJECT_FIELDS)).where(models.Project.owner_id == owner_id)
+    return PROJECT_FIELDS, query.order_by(models.Project.id)
+
+
+def comment_export(owner_id: int, project_id: Optional[int] = None, task_id: Optional[int] = None):
+    query = (
+        select(*_columns(models.TaskComment, COMMENT_FIELDS))
+        .join(models.Task, models.Task.id == models.TaskComment.task_id)
+        .join(models.Project, models.Project.id == models.Task.project_id)
+        .where(models.Project.owner_id == owner_id)
+    )
+    if project_id is not None:
+        query = query.where(models.Task.project_id == project_id)
+    if task_id is not None:
+        query = query.where(models.TaskComment.task_id == task_id)
+    return COMMENT_FIELDS, query.order_by(models.TaskComment.id)
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return "" if value is None else value
+
+
+class _CsvEncoder:
+    def __init__(self, fields: Sequence[str]):
+        self.fields = fields
+
+    def header(self) -> bytes:
+        return self.encode([self.fields])
+
+    def encode(self, rows) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        return buffer.getvalue().encode()
+
+
+def stream_export(
+    fields: Tuple[str, ...], query, fmt: ExportFormat, compress: bool = False, chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Yield the encoded export one server-side cursor batch at a time.
+
+    The stream owns its session: it outlives the request handler and must
+    not share the request's (possibly async) session. Memory is bounded by
+    ``chunk_size`` rows whatever the total row count.
+    """
+    chunk_size = chunk_size or config.EXPORT_CHUNK_SIZE
+    gzip = zlib.compressobj(wbits=31) if compress else None
+
+    def emit(data: bytes) -> bytes:
+        return gzip.compress(data) if gzip else data
+
+    if fmt is ExportFormat.csv:
+        encoder = _CsvEncoder(fields)
+        encode = encoder.encode
+        header = encoder.header()
+    else:
+        encode = row_encoder(fields).encode_lines
+        header = b""
+
+    db = SessionLocal()
+    try:
+        result = db.execute(query.execution_options(yield_per=chunk_size))
+        if header:
+            yield emit(header)
+        for rows in result.partitions():
+            chunk = emit(encode(rows))
+            if chunk:
+                yield chunk
+        if gzip:
+            yield gzip.flush()
+    finally:
+        db.close()
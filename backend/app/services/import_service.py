@@ -0,0 +1,161 @@
+import csv
+import io
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+import models
+from app import config
+from app.database import SessionLocal
+from app.schemas import task_schema
+from app.services import counter_service, task_service
+from app.services.export_service import ExportFormat as ImportFormat
+from app.utils.serialization import adapter
+
+__all__ = ["ImportFormat", "TaskImporter", "guess_format", "read_records", "stream_import"]
+
+# Parsed record, or None with the reason the line could not be parsed
+Record = Tuple[int, Optional[Any], Optional[str]]
+
+
+def guess_format(filename: Optional[str]) -> ImportFormat:
+    if filename and filename.lower().endswith(".csv"):
+        return ImportFormat.csv
+    return ImportFormat.ndjson
+
+
+def _read_csv(stream: BinaryIO) -> Iterator[Record]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Empty cells mean "not given", so optional fields fall back to their defaults
+            yield reader.line_num, {key: value for key, value in row.items() if key and value != ""}, None
+    except (csv.Error, UnicodeDecodeError) as exc:
+        yield reader.line_num, None, f"Unreadable CSV: {exc}"
+    finally:
+        # Leave the caller's file open
+        text.detach()
+
+
+def _read_ndjson(stream: BinaryIO) -> Iterator[Record]:
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, orjson.loads(line), None
+        except orjson.JSONDecodeError as exc:
+            yield line_no, None, f"Invalid JSON: {exc}"
+
+
+def read_records(stream: BinaryIO, fmt: ImportFormat) -> Iterator[Record]:
+    """Parse ``stream`` lazily into ``(line number, record, error)`` tuples."""
+    return _read_csv(stream) if fmt is ImportFormat.csv else _read_ndjson(stream)
+
+
+class TaskImporter:
+    """Insert parsed records as tasks owned by ``owner_id``, one batch at a time.
+
+    Each batch is staged inside savepoints (see ``task_service.flush_batch``)
+    and committed on its own, so nothing but the current batch and the
+    per-value lookup caches is held in memory. Records may name the
+    assignee by ``assignee_email`` instead of ``assignee_id``.
+    """
+
+    def __init__(self, db: Session, owner_id: int, batch_size: int = config.IMPORT_BATCH_SIZE):
+        self.db = db
+        self.owner_id = owner_id
+        self.batch_size = batch_size
+        self.processed = 0
+        self.imported = 0
+        self.rejected = 0
+        self._assignees: Dict[str, Optional[int]] = {}
+        self._projects: Dict[int, bool] = {}
+
+    def progress(self, event: str = "progress") -> dict:
+        return {"event": event, "processed": self.processed, "imported": self.imported, "rejected": self.rejected}
+
+    def _assignee_id(self, email: str) -> Optional[int]:
+        if email not in self._assignees:
+            self._assignees[email] = self.db.query(models.User.id).filter(models.User.email == email).scalar()
+        return self._assignees[email]
+
+    def _owns_project(self, project_id: int) -> bool:
+        if project_id not in self._projects:
+            self._projects[project_id] = self.db.query(models.Project.id).filter(
+                models.Project.id == project_id, models.Project.owner_id == self.owner_id
+            ).scalar() is not None
+        return self._projects[project_id]
+
+    def _prepare(self, record: Any) -> dict:
+        """Validated column values for one record; raises ValueError with the reason."""
+        if isinstance(record, dict) and "assignee_email" in record:
+            record = dict(record)
+            email = record.pop("assignee_email")
+            if email is not None:
+                assignee_id = self._assignee_id(email)
+                if assignee_id is None:
+                    raise ValueError(f"Unknown assignee: {email}")
+                record["assignee_id"] = assignee_id
+        try:
+            task = adapter(task_schema.TaskCreate).validate_python(record)
+        except ValidationError as exc:
+            raise ValueError(task_service.describe_error(exc)) from None
+        if not self._owns_project(task.project_id):
+            raise ValueError("Project not found")
+        return task.model_dump()
+
+    def _flush(self, batch: Dict[int, dict], records: Dict[int, Any]) -> Iterator[dict]:
+        def creator(values):
+            def op():
+                task = models.Task(**values)
+                self.db.add(task)
+                return None, task
+            return op
+
+        errors: Dict[int, str] = {}
+        done = task_service.flush_batch(self.db, {line: creator(values) for line, values in batch.items()}, errors)
+        counter_service.track_tasks(self.db, done.values())
+        self.db.commit()
+        self.db.expunge_all()
+        self.imported += len(done)
+        for line, error in errors.items():
+            yield self._reject(line, error, records[line])
+
+    def _reject(self, line: int, error: str, record: Any) -> dict:
+        self.rejected += 1
+        return {"event": "reject", "line": line, "error": error, "record": record}
+
+    def run(self, records: Iterator[Record]) -> Iterator[dict]:
+        """Import ``records``, yielding a ``reject`` event per failed line, a
+        ``progress`` event per committed batch and a final ``done`` event."""
+        batch: Dict[int, dict] = {}
+        raw: Dict[int, Any] = {}
+        for line, record, error in records:
+            self.processed += 1
+            if error is None:
+                try:
+                    batch[line] = self._prepare(record)
+                    raw[line] = record
+                except ValueError as exc:
+                    error = str(exc)
+            if error is not None:
+                yield self._reject(line, error, record)
+            if len(batch) >= self.batch_size:
+                yield from self._flush(batch, raw)
+                batch, raw = {}, {}
+                yield self.progress()
+        if batch:
+            yield from self._flush(batch, raw)
+        yield self.progress("done")
+
+
+def stream_import(stream: BinaryIO, fmt: ImportFormat, owner_id: int, batch_size: Optional[int] = None) -> Iterator[bytes]:
+    """Run an import on its own session, yielding its events as NDJSON lines."""
+    db = SessionLocal()
+    try:
+        importer = TaskImporter(db, owner_id, batch_size or config.IMPORT_BATCH_SIZE)
+        for event in importer.run(read_records(stream, fmt)):
+            yield orjson.dumps(event) + b"\n"
+    finally:
+        db.close()
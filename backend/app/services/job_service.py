@@ -0,0 +1,298 @@
+"""Durable background jobs kept in the ``jobs`` table.
+
+Producers call ``enqueue`` inside their own transaction, so a job exists
+exactly when the change that needs it commits. Workers (threads started with
+the app, or ``python manage.py run-worker`` processes) claim the most urgent
+due job with a conditional UPDATE, which behaves the same on SQLite and MySQL
+without row locks or an external broker. A claim is a lease: handlers renew
+it by reporting progress, and a job whose worker died is queued again once
+``lease_until`` passes. Every write of a finished job is fenced on the lease
+holder, so a worker that lost its lease cannot overwrite the new owner's
+outcome. Failures are retried with exponential backoff up to ``max_attempts``.
+"""
+import enum
+import importlib
+import logging
+import os
+import random
+import socket
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+import models
+from app.config import (
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_INTERVAL,
+    JOB_RETRY_BASE,
+    JOB_RETRY_MAX,
+    JOB_WORKERS,
+)
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Job kind -> "module:function" taking a JobContext; imported when first run
+JOB_HANDLERS = {
+    "project.purge": "app.services.project_service:purge_job",
+}
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+# Due jobs a worker tries to claim per poll before giving up to other workers
+CLAIM_CANDIDATES = 8
+
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class LeaseLost(Exception):
+    """The job's lease expired and another worker may have taken it over."""
+
+
+def enqueue(
+    db: Session, kind: str, payload: Optional[dict] = None, *, priority: int = PRIORITY_NORMAL,
+    delay: float = 0, max_attempts: int = JOB_MAX_ATTEMPTS, user_id: Optional[int] = None,
+) -> models.Job:
+    """Add a job to ``db``; it becomes visible to workers when the caller commits."""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = models.Job(
+        kind=kind, payload=payload or {}, status=JobStatus.queued.value, priority=priority,
+        max_attempts=max_attempts, run_at=datetime.now() + timedelta(seconds=delay), user_id=user_id,
+    )
+    db.add(job)
+    return job
+
+
+def get_job(db: Session, job_id: int) -> Optional[models.Job]:
+    return db.get(models.Job, job_id)
+
+
+def _update(db: Session, *where, **values) -> int:
+    statement = update(models.Job).where(*where).values(**values)
+    return db.execute(statement.execution_options(synchronize_session=False)).rowcount
+
+
+def requeue_expired(db: Session, now: Optional[datetime] = None) -> int:
+    """Hand jobs whose lease ran out back to the queue, or fail them if out of attempts."""
+    job = models.Job
+    now = now or datetime.now()
+    expired = (job.status == JobStatus.running.value, job.lease_until < now)
+    released = dict(locked_by=None, lease_until=None)
+    count = _update(db, *expired, job.attempts < job.max_attempts,
+                    status=JobStatus.queued.value, run_at=now, error="Lease expired", **released)
+    count += _update(db, *expired, job.attempts >= job.max_attempts,
+                     status=JobStatus.failed.value, finished_at=now, error="Lease expired", **released)
+    db.commit()
+    return count
+
+
+def claim(db: Session, worker_id: str, lease: float = JOB_LEASE_SECONDS) -> Optional[models.Job]:
+    """Lease the most urgent due job to ``worker_id``, or return ``None`` if there is none."""
+    job = models.Job
+    now = datetime.now()
+    requeue_expired(db, now)
+    candidates = db.execute(
+        select(job.id)
+        .where(job.status == JobStatus.queued.value, job.run_at <= now)
+        .order_by(job.priority.desc(), job.run_at)
+        .limit(CLAIM_CANDIDATES)
+    ).scalars().all()
+    for job_id in candidates:
+        # Only one worker's UPDATE can still see the job queued
+        claimed = _update(
+            db, job.id == job_id, job.status == JobStatus.queued.value,
+            status=JobStatus.running.value, locked_by=worker_id, attempts=job.attempts + 1,
+            lease_until=now + timedelta(seconds=lease), started_at=now,
+        )
+        db.commit()
+        if claimed:
+            return db.get(job, job_id)
+    return None
+
+
+def _held(job_id: int, worker_id: str) -> tuple:
+    job = models.Job
+    return job.id == job_id, job.locked_by == worker_id, job.status == JobStatus.running.value
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before retry ``attempts``: doubling from JOB_RETRY_BASE, capped, with jitter."""
+    delay = min(JOB_RETRY_MAX, JOB_RETRY_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def complete(db: Session, job: models.Job, worker_id: str, result=None) -> bool:
+    """Mark a leased job succeeded; ``False`` if the lease was lost meanwhile."""
+    done = _update(
+        db, *_held(job.id, worker_id), status=JobStatus.succeeded.value, result=result, error=None,
+        finished_at=datetime.now(), locked_by=None, lease_until=None,
+    )
+    db.commit()
+    return bool(done)
+
+
+def fail(db: Session, job: models.Job, worker_id: str, error: str) -> bool:
+    """Queue a leased job for retry after a backoff, or fail it for good once out of attempts."""
+    now = datetime.now()
+    if job.attempts < job.max_attempts:
+        outcome = dict(status=JobStatus.queued.value, run_at=now + timedelta(seconds=retry_delay(job.attempts)))
+    else:
+        outcome = dict(status=JobStatus.failed.value, finished_at=now)
+    done = _update(db, *_held(job.id, worker_id), error=error, locked_by=None, lease_until=None, **outcome)
+    db.commit()
+    return bool(done)
+
+
+class JobContext:
+    """What a handler gets: the job's payload, a session of its own and progress reporting."""
+
+    def __init__(self, job: models.Job, worker_id: str, lease: float = JOB_LEASE_SECONDS):
+        self.id = job.id
+        self.kind = job.kind
+        self.payload = job.payload
+        self.attempt = job.attempts
+        self.worker_id = worker_id
+        self.lease = lease
+        self.db = SessionLocal()
+
+    def progress(self, progress: dict):
+        """Record ``progress`` on the job and renew the lease.
+
+        Long handlers should report more often than JOB_LEASE_SECONDS. Raises
+        ``LeaseLost`` if the job has been handed to another worker.
+        """
+        db = SessionLocal()
+        try:
+            renewed = _update(
+                db, *_held(self.id, self.worker_id),
+                progress=dict(progress), lease_until=datetime.now() + timedelta(seconds=self.lease),
+            )
+            db.commit()
+        finally:
+            db.close()
+        if not renewed:
+            raise LeaseLost(f"Job {self.id} is no longer leased to {self.worker_id}")
+
+
+@lru_cache(maxsize=None)
+def _handler(kind: str) -> Callable[[JobContext], object]:
+    module, name = JOB_HANDLERS[kind].split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def run_job(job: models.Job, worker_id: str, lease: float = JOB_LEASE_SECONDS) -> str:
+    """Run a claimed job's handler and record the outcome.
+
+    Returns ``succeeded``, ``retrying``, ``failed`` or ``lease_lost`` (the
+    outcome belongs to whichever worker holds the job now).
+    """
+    context = JobContext(job, worker_id, lease)
+    db = SessionLocal()
+    try:
+        try:
+            result = _handler(job.kind)(context)
+        except LeaseLost:
+            return "lease_lost"
+        except Exception as exc:
+            context.db.rollback()
+            if not fail(db, job, worker_id, f"{type(exc).__name__}: {exc}"):
+                return "lease_lost"
+            return "retrying" if job.attempts < job.max_attempts else "failed"
+        return "succeeded" if complete(db, job, worker_id, result) else "lease_lost"
+    finally:
+        context.db.close()
+        db.close()
+
+
+class WorkerPool:
+    """Threads that claim and run jobs until stopped.
+
+    Run one pool per process; several processes (app workers, ``manage.py
+    run-worker``) can share a database, each claim goes to exactly one.
+    """
+
+    def __init__(self, size: int = JOB_WORKERS, poll_interval: float = JOB_POLL_INTERVAL,
+                 lease: float = JOB_LEASE_SECONDS):
+        self.size = size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self.busy = 0
+        self.outcomes = dict.fromkeys(("succeeded", "retrying", "failed", "lease_lost"), 0)
+
+    def run_once(self, worker_id: Optional[str] = None) -> Optional[int]:
+        """Claim and run one due job; returns its id, or ``None`` if the queue had nothing due."""
+        worker_id = worker_id or f"{self.prefix}:{threading.current_thread().name}"
+        db = SessionLocal()
+        try:
+            job = claim(db, worker_id, self.lease)
+            if job is None:
+                return None
+            db.expunge(job)
+        finally:
+            db.close()
+        with self._lock:
+            self.busy += 1
+        outcome = None
+        try:
+            outcome = run_job(job, worker_id, self.lease)
+        finally:
+            with self._lock:
+                self.busy -= 1
+                if outcome:
+                    self.outcomes[outcome] += 1
+        return job.id
+
+    def _work(self, worker_id: str):
+        while not self._stopping.is_set():
+            try:
+                ran = self.run_once(worker_id)
+            except DBAPIError:
+                # Database unavailable or locked: back off and try again
+                logger.warning("Job worker %s: database error, retrying", worker_id, exc_info=True)
+                ran = None
+            except Exception:
+                # A bug in claiming or bookkeeping; keep the worker alive but leave a trace
+                logger.exception("Job worker %s: unexpected error outside a job handler", worker_id)
+                ran = None
+            if ran is None:
+                self._stopping.wait(self.poll_interval)
+
+    def start(self):
+        if self._threads or self.size <= 0:
+            return
+        self._stopping.clear()
+        for index in range(self.size):
+            worker_id = f"{self.prefix}:{index}"
+            thread = threading.Thread(target=self._work, args=(worker_id,), name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop claiming; running jobs finish (or, past ``timeout``, are recovered by lease expiry)."""
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"workers": len(self._threads), "busy": self.busy, **self.outcomes}
+
+
+job_pool = WorkerPool()
@@ -0,0 +1,246 @@
+from datetime import datetime
+from typing import Callable, Iterable, Optional, Set, Tuple
+from fastapi import HTTPException
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, noload, selectinload
+import models
+from app.config import PURGE_CHUNK_SIZE
+from app.schemas import project_schema
+from app.services import job_service
+from app.utils.fieldsets import load_fields
+from app.utils.pagination import Keyset, PageParams, paginate
+
+PROJECT_KEYSET = Keyset("created_at", models.Project.created_at, models.Project.id)
+
+# ?include= name -> loader; each relationship costs one extra SELECT ... IN query
+PROJECT_INCLUDES = {
+    "tasks": selectinload(models.Project.tasks),
+    "members": selectinload(models.Project.members).selectinload(models.ProjectMember.user),
+}
+
+
+def create_project(db: Session, project: project_schema.ProjectCreate, owner_id: int) -> models.Project:
+    db_project = models.Project(
+        name=project.name,
+        description=project.description,
+        owner_id=owner_id
+    )
+    db.add(db_project)
+    _commit_name(db, project.name)
+    db.refresh(db_project)
+    return db_project
+
+
+def _commit_name(db: Session, name: str):
+    """Commit a project insert or rename; a name already in use is a 409, not a 500."""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"A project named {name!r} already exists")
+
+
+def released_name(project_id: int, name: str) -> str:
+    """Name a soft-deleted project keeps until its purge: Project.name is unique,
+    so the original is freed for reuse straight away."""
+    suffix = f" (deleted #{project_id})"
+    return name[:100 - len(suffix)] + suffix
+
+
+# Response fields computed from project_task_counters rather than columns
+COUNTER_FIELDS = {"task_count", "progress"}
+
+
+def list_projects(db: Session, page: PageParams, fields: Optional[Tuple[str, ...]] = None):
+    query = db.query(models.Project)
+    if fields:
+        query = query.options(load_fields(models.Project, fields, PROJECT_KEYSET.column, PROJECT_KEYSET.id_column))
+        if not COUNTER_FIELDS & set(fields):
+            query = query.options(noload(models.Project.task_counters))
+    return paginate(query, PROJECT_KEYSET, page)
+
+
+def accessible_projects(db: Session, user_id: int, project_ids: Iterable[int]) -> Set[int]:
+    """The ``project_ids`` that ``user_id`` owns or is a member of."""
+    project_ids = set(project_ids)
+    owned = db.query(models.Project.id).filter(
+        models.Project.id.in_(project_ids), models.Project.owner_id == user_id
+    )
+    member = db.query(models.ProjectMember.project_id).join(models.ProjectMember.project).filter(
+        models.ProjectMember.project_id.in_(project_ids), models.ProjectMember.user_id == user_id
+    )
+    allowed = {project_id for (project_id,) in owned.union(member)}
+    # Callers hold the request open for a long time; release the pooled connection now
+    db.close()
+    return allowed
+
+
+def get_project(db: Session, project_id: int) -> Optional[models.Project]:
+    return db.query(models.Project).filter(models.Project.id == project_id).first()
+
+
+def _counter_totals(project_id: Optional[int] = None) -> list:
+    # task_count/progress come from the counters, so their totals validate those fields
+    counter = models.ProjectTaskCounter
+    totals = []
+    for aggregate in (
+        func.sum(counter.count),
+        func.sum(case((counter.status.in_(models.DONE_STATUSES), counter.count), else_=0)),
+    ):
+        query = select(aggregate)
+        if project_id is not None:
+            query = query.where(counter.project_id == project_id)
+        totals.append(query.scalar_subquery())
+    return totals
+
+
+def projects_version(db: Session) -> tuple:
+    """ETag validators for the project listing, in one round trip."""
+    project = models.Project
+    return tuple(db.execute(select(
+        func.count(project.id),
+        func.max(project.id),
+        func.max(func.coalesce(project.updated_at, project.created_at)),
+        *_counter_totals(),
+    )).one())
+
+
+def project_version(db: Session, project_id: int, include: Iterable[str] = ()) -> Optional[tuple]:
+    """ETag validators for one project and its requested relationships, in one round trip."""
+    project = models.Project
+    parts = [
+        select(func.coalesce(project.updated_at, project.created_at)).where(project.id == project_id).scalar_subquery(),
+        *_counter_totals(project_id),
+    ]
+    if "tasks" in include:
+        task = models.Task
+        parts += [
+            select(aggregate).where(task.project_id == project_id).scalar_subquery()
+            for aggregate in (func.count(task.id), func.max(task.id), func.max(task.updated_at))
+        ]
+    if "members" in include:
+        member, user = models.ProjectMember, models.User
+        parts += [
+            select(aggregate).where(member.project_id == project_id).scalar_subquery()
+            for aggregate in (func.count(member.id), func.max(member.id))
+        ]
+        # The embedded users' own fields (a member renaming themselves) change no membership row
+        parts.append(
+            select(func.max(user.updated_at)).join(member, member.user_id == user.id)
+            .where(member.project_id == project_id).scalar_subquery()
+        )
+    row = tuple(db.execute(select(*parts)).one())
+    return row if row[0] is not None else None
+
+
+def get_project_detail(db: Session, project_id: int, include: Iterable[str] = ()) -> Optional[dict]:
+    """Project with the requested relationships eager-loaded, as ProjectDetail input."""
+    include = sorted(include)
+    project = db.query(models.Project).options(
+        *(PROJECT_INCLUDES[name] for name in include)
+    ).filter(models.Project.id == project_id).first()
+    if not project:
+        return None
+    detail = project_schema.ProjectRead.model_validate(project).model_dump()
+    detail.update((name, getattr(project, name)) for name in include)
+    return detail
+
+
+def update_project(db: Session, project_id: int, new_data: project_schema.ProjectCreate) -> Optional[models.Project]:
+    project = get_project(db, project_id)
+    if not project:
+        return None
+    project.name = new_data.name
+    project.description = new_data.description
+    _commit_name(db, new_data.name)
+    db.refresh(project)
+    return project
+
+
+def delete_project(db: Session, project_id: int) -> Optional[int]:
+    """Soft-delete: the project disappears from every query now, and a purge job is
+    queued in the same transaction to remove its rows. Returns the job's id."""
+    project = get_project(db, project_id)
+    if not project:
+        return None
+    project.deleted_at = datetime.now()
+    project.name = released_name(project.id, project.name)
+    job = job_service.enqueue(
+        db, "project.purge", {"project_id": project_id}, priority=job_service.PRIORITY_LOW, user_id=project.owner_id
+    )
+    db.commit()
+    return job.id
+
+
+def _purge_steps(project_id: int):
+    """``(name, model, SELECT of ids)`` for the project's rows, children first."""
+    task_ids = select(models.Task.id).where(models.Task.project_id == project_id)
+    comment, member = models.TaskComment, models.ProjectMember
+    return (
+        ("comments", comment, select(comment.id).where(comment.task_id.in_(task_ids))),
+        ("tasks", models.Task, task_ids),
+        ("members", member, select(member.id).where(member.project_id == project_id)),
+    )
+
+
+def _deleted_project(db: Session, project_id: int) -> Optional[datetime]:
+    project = models.Project
+    return db.execute(
+        select(project.deleted_at).where(project.id == project_id, project.deleted_at.isnot(None))
+        .execution_options(include_deleted=True)
+    ).scalar()
+
+
+def purge_project(
+    db: Session, project_id: int, chunk_size: int = PURGE_CHUNK_SIZE,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> Optional[dict]:
+    """Remove a soft-deleted project's comments, tasks and memberships, then the project itself.
+
+    Rows go in chunks of ``chunk_size``: one indexed SELECT of ids and one
+    set-based DELETE by primary key, committed on their own, so no chunk holds
+    locks for long or loads ORM objects, and an interrupted purge resumes
+    where it stopped. ``progress`` receives the running counts after each
+    chunk. Returns the counts, or ``None`` if the project is not marked deleted.
+    """
+    if _deleted_project(db, project_id) is None:
+        return None
+    steps = _purge_steps(project_id)
+    counts = {name: 0 for name, _, _ in steps}
+    for name, model, ids_query in steps:
+        while ids := db.execute(ids_query.limit(chunk_size)).scalars().all():
+            db.execute(delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+            db.commit()
+            counts[name] += len(ids)
+            if progress:
+                progress(counts)
+    db.execute(delete(models.ProjectTaskCounter).where(models.ProjectTaskCounter.project_id == project_id))
+    db.execute(delete(models.Project).where(models.Project.id == project_id).execution_options(synchronize_session=False))
+    db.commit()
+    return counts
+
+
+def purge_job(context: job_service.JobContext) -> Optional[dict]:
+    """``project.purge`` job handler; progress doubles as the lease heartbeat."""
+    return purge_project(context.db, context.payload["project_id"], progress=context.progress)
+
+
+def deleted_project_ids(db: Session) -> list:
+    """Soft-deleted projects still waiting for (or part way through) their purge."""
+    project = models.Project
+    return db.execute(
+        select(project.id).where(project.deleted_at.isnot(None)).execution_options(include_deleted=True)
+    ).scalars().all()
+
+
+def purge_status(db: Session, project_id: int) -> Optional[dict]:
+    """Rows a soft-deleted project still has, or ``None`` if it is not being purged."""
+    deleted_at = _deleted_project(db, project_id)
+    if deleted_at is None:
+        return None
+    remaining = {
+        name: db.execute(select(func.count()).select_from(ids_query.subquery())).scalar()
+        for name, _, ids_query in _purge_steps(project_id)
+    }
+    return {"project_id": project_id, "deleted_at": deleted_at, "remaining": remaining}
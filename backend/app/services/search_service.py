@@ -0,0 +1,75 @@
+import re
+from typing import List, Optional
+from sqlalchemy import func, literal_column, or_, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+import models
+from app.services.task_service import TASK_FIELDS
+from app.utils.pagination import Keyset, PageParams, paginate
+
+# Row layout of a search hit: the TaskRead columns, then relevance and a highlighted excerpt
+SEARCH_FIELDS = TASK_FIELDS + ("score", "snippet")
+
+# Title matches outweigh description matches, which outweigh comment matches (SQLite)
+TITLE_WEIGHT, DESCRIPTION_WEIGHT, COMMENT_WEIGHT = 10.0, 2.0, 1.0
+
+MAX_TERMS = 8
+
+_WORD = re.compile(r"\w+")
+
+
+def search_terms(q: str) -> List[str]:
+    """Words of ``q``; punctuation and query operators are dropped so input can never be a syntax error."""
+    return _WORD.findall(q.lower())[:MAX_TERMS]
+
+
+def _sqlite_query(db: Session, terms: List[str]):
+    # Every term must match; the last one as a prefix, so results follow the user's typing
+    expression = " ".join(f'"{term}"' for term in terms) + "*"
+    fts = literal_column("task_search")
+    score = (-func.bm25(fts, TITLE_WEIGHT, DESCRIPTION_WEIGHT, COMMENT_WEIGHT)).label("score")
+    snippet = func.snippet(fts, -1, "[", "]", "…", 12).label("snippet")
+    columns = [getattr(models.Task, name) for name in TASK_FIELDS] + [score, snippet]
+    query = db.query(*columns).select_from(models.task_search).join(
+        models.Task, models.Task.id == models.task_search.c.rowid
+    ).filter(fts.match(expression))
+    return query, score
+
+
+def _mysql_query(db: Session, terms: List[str]):
+    required = " ".join(f"+{term}" for term in terms) + "*"
+    natural = " ".join(terms)
+    comment_score = select(
+        func.max(match(models.TaskComment.content, against=natural))
+    ).where(models.TaskComment.task_id == models.Task.id).scalar_subquery()
+    score = (
+        match(models.Task.title, models.Task.description, against=natural) + func.coalesce(comment_score, 0)
+    ).label("score")
+    commented = select(models.TaskComment.task_id).where(
+        match(models.TaskComment.content, against=required).in_boolean_mode()
+    )
+    columns = [getattr(models.Task, name) for name in TASK_FIELDS] + [score, literal_column("NULL").label("snippet")]
+    query = db.query(*columns).select_from(models.Task).filter(or_(
+        match(models.Task.title, models.Task.description, against=required).in_boolean_mode(),
+        models.Task.id.in_(commented),
+    ))
+    return query, score
+
+
+def search_tasks(db: Session, owner_id: int, q: str, page: PageParams, project_id: Optional[int] = None):
+    """Page of ``SEARCH_FIELDS`` rows for tasks in the owner's projects matching every term of ``q``,
+    most relevant first.
+
+    Backed by the ``task_search`` FTS5 table on SQLite and by the FULLTEXT
+    indexes on MySQL (which has no snippets).
+    """
+    terms = search_terms(q)
+    if not terms:
+        return [], None
+    build = _mysql_query if db.get_bind().dialect.name == "mysql" else _sqlite_query
+    query, score = build(db, terms)
+    query = query.join(models.Project, models.Project.id == models.Task.project_id)
+    if project_id is not None:
+        query = query.filter(models.Task.project_id == project_id)
+    query = query.filter(models.Project.owner_id == owner_id)
+    return paginate(query, Keyset("score", score, models.Task.id, descending=True), page)
@@ -0,0 +1,121 @@
+"""Delta sync for GET /sync/, read from the change log.
+
+Every flush that writes a task, project or comment appends one ``change_log``
+row per object in the same transaction (deletes as tombstones), so the log
+commits or rolls back with the change itself. A sync reads the log after the
+client's cursor through ``ix_change_log_project_seq`` and loads the current
+state of the rows it names, so its cost follows the number of changes, not
+the size of the projects. Core statements bypass the session and are not
+logged, as for change events.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.orm import Session
+import models
+from app.config import SYNC_SETTLE_SECONDS
+from app.services.event_service import KINDS, flushed_changes
+
+# Sync entity name -> (model, response key)
+ENTITIES = {
+    "task": (models.Task, "tasks"),
+    "project": (models.Project, "projects"),
+    "comment": (models.TaskComment, "comments"),
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _record(session: Session, flush_context):
+    changes = flushed_changes(session, flush_context)
+    if not changes:
+        return
+    now = datetime.now()
+    session.connection().execute(insert(models.ChangeLog), [
+        {
+            "entity": KINDS[type(obj)], "entity_id": obj.id, "project_id": project_id,
+            "deleted": state == "deleted", "changed_at": now,
+        }
+        for obj, state, project_id in changes
+    ])
+
+
+def visible_projects(user_id: int):
+    """SELECT of the project ids ``user_id`` owns or is a member of."""
+    owned = select(models.Project.id).where(models.Project.owner_id == user_id)
+    # Joined to projects so that deleted projects are filtered out of this half too
+    member = select(models.ProjectMember.project_id).join(models.ProjectMember.project).where(
+        models.ProjectMember.user_id == user_id
+    )
+    return owned.union(member)
+
+
+def _current_rows(db: Session, entity: str, ids, project_ids) -> list:
+    """The rows among ``ids`` that still exist in one of ``project_ids``."""
+    model, _ = ENTITIES[entity]
+    query = db.query(model).filter(model.id.in_(ids))
+    if model is models.Project:
+        return query.filter(model.id.in_(project_ids)).all()
+    if model is models.TaskComment:
+        query = query.join(models.Task, models.Task.id == model.task_id)
+    return query.filter(models.Task.project_id.in_(project_ids)).all()
+
+
+def sync_changes(db: Session, user_id: int, since: int, limit: int, project_id: Optional[int] = None):
+    """Changes after cursor ``since`` in the caller's projects, or ``None`` if ``project_id`` is not one of them.
+
+    Several log rows for one object collapse into its current state (or a
+    tombstone if it is gone or left the caller's projects). ``project_ids``
+    lists the projects the caller can see now; a client drops local data of
+    any other project, which covers deleted projects and revoked memberships.
+    """
+    project_ids = set(db.execute(visible_projects(user_id)).scalars())
+    if project_id is not None and project_id not in project_ids:
+        return None
+    log = models.ChangeLog
+    entries = db.execute(
+        select(log.seq, log.entity, log.entity_id, log.deleted, log.changed_at)
+        .where(log.project_id.in_([project_id] if project_id is not None else project_ids), log.seq > since)
+        .order_by(log.seq)
+        .limit(limit + 1)
+    ).all()
+    full = len(entries) > limit
+    entries = entries[:limit]
+
+    # The cursor stops before the first change still inside the settle window
+    settled = datetime.now() - timedelta(seconds=SYNC_SETTLE_SECONDS)
+    cursor = since
+    for entry in entries:
+        if entry.changed_at > settled:
+            break
+        cursor = entry.seq
+
+    latest = {}
+    for entry in entries:
+        latest[entry.entity, entry.entity_id] = entry.deleted
+    result = {"cursor": cursor, "has_more": full and cursor > since, "project_ids": sorted(project_ids)}
+    deleted = {}
+    for entity, (_, key) in ENTITIES.items():
+        ids = [entity_id for (name, entity_id), gone in latest.items() if name == entity and not gone]
+        rows = _current_rows(db, entity, ids, project_ids) if ids else []
+        found = {row.id for row in rows}
+        result[key] = rows
+        deleted[key] = sorted(
+            entity_id for (name, entity_id), gone in latest.items()
+            if name == entity and (gone or entity_id not in found)
+        )
+    result["deleted"] = deleted
+    return result
+
+
+def compact_changes(db: Session) -> int:
+    """Delete log rows superseded by a later row for the same object; returns the count.
+
+    A client behind a removed row still reaches the newer one, so compaction
+    never changes what a sync returns, only how many log rows it reads.
+    """
+    log = models.ChangeLog
+    latest = select(func.max(log.seq).label("seq")).group_by(log.entity, log.entity_id).subquery()
+    # MySQL only lets a DELETE read its own table through a derived table
+    result = db.execute(delete(log).where(log.seq.notin_(select(latest.c.seq))))
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,333 @@
+from datetime import datetime, time, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import and_, case, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import models
+from app.services import counter_service
+from app.schemas import task_schema
+from app.utils.pagination import Keyset, PageParams, paginate
+from app.utils.serialization import adapter
+
+def _sort_keyset(sort: task_schema.TaskSort) -> Keyset:
+    name = sort.value.lstrip("-")
+    return Keyset(
+        sort.value,
+        getattr(models.Task, name),
+        models.Task.id,
+        descending=sort.value.startswith("-"),
+        nullable=name == "due_date",
+    )
+
+
+TASK_SORTS = {sort: _sort_keyset(sort) for sort in task_schema.TaskSort}
+
+# Every TaskRead field is a plain column, so listings select row tuples, not ORM objects
+TASK_FIELDS = tuple(task_schema.TaskRead.model_fields)
+
+
+class TaskFilters:
+    """Filters for task listings; every field maps onto an indexed WHERE clause."""
+
+    def __init__(
+        self,
+        project_id: Optional[int] = None,
+        status: Optional[list] = None,
+        assignee_id: Optional[int] = None,
+        due_from=None,
+        due_to=None,
+        created_from=None,
+        created_to=None,
+        sort: task_schema.TaskSort = task_schema.TaskSort.created_at,
+    ):
+        self.project_id = project_id
+        self.status = status
+        self.assignee_id = assignee_id
+        self.due_from = due_from
+        self.due_to = due_to
+        self.created_from = created_from
+        self.created_to = created_to
+        self.sort = sort
+
+
+def _day_start(day) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def _between(query, column, start, end):
+    # Date bounds are inclusive: [start 00:00, end + 1 day 00:00)
+    if start is not None:
+        query = query.filter(column >= _day_start(start))
+    if end is not None:
+        query = query.filter(column < _day_start(end + timedelta(days=1)))
+    return query
+
+
+def filter_tasks(query, filters: TaskFilters, owner_id: int):
+    """Apply ``filters`` to a query joined to Project; only the owner's tasks ever match."""
+    query = query.filter(models.Project.owner_id == owner_id)
+    if filters.project_id is not None:
+        query = query.filter(models.Task.project_id == filters.project_id)
+    if filters.status:
+        query = query.filter(models.Task.status.in_(filters.status))
+    if filters.assignee_id is not None:
+        query = query.filter(models.Task.assignee_id == filters.assignee_id)
+    query = _between(query, models.Task.due_date, filters.due_from, filters.due_to)
+    query = _between(query, models.Task.created_at, filters.created_from, filters.created_to)
+    return query
+
+
+def _owned_task(db: Session, task_id: int, owner_id: int) -> Optional[models.Task]:
+    return db.query(models.Task).join(models.Project).filter(
+        models.Task.id == task_id,
+        models.Project.owner_id == owner_id
+    ).first()
+
+
+def create_task(db: Session, task: task_schema.TaskCreate, owner_id: int) -> Optional[models.Task]:
+    project = db.query(models.Project).filter(
+        models.Project.id == task.project_id,
+        models.Project.owner_id == owner_id
+    ).first()
+    if not project:
+        return None
+
+    db_task = models.Task(
+        title=task.title,
+        description=task.description,
+        status=task.status,
+        project_id=task.project_id,
+        assignee_id=task.assignee_id,
+        due_date=task.due_date
+    )
+    db.add(db_task)
+    db.flush()
+    counter_service.track_task(db, None, db_task)
+    db.commit()
+    db.refresh(db_task)
+    return db_task
+
+
+def list_tasks(
+    db: Session, owner_id: int, page: PageParams, filters: TaskFilters, fields: Optional[Tuple[str, ...]] = None
+):
+    """Page of rows holding ``fields`` (default: all TaskRead fields) in that order.
+
+    The keyset columns are appended when not requested so the next cursor
+    can still be encoded.
+    """
+    keyset = TASK_SORTS[filters.sort]
+    fields = fields or TASK_FIELDS
+    columns = [getattr(models.Task, name) for name in fields]
+    columns += [column for column in (keyset.column, keyset.id_column) if column.key not in fields]
+    query = db.query(*columns).select_from(models.Task).join(models.Project)
+    return paginate(filter_tasks(query, filters, owner_id), keyset, page)
+
+
+def tasks_version(db: Session, owner_id: int, filters: TaskFilters) -> tuple:
+    """ETag validators for a filtered listing: any insert, update or delete changes one of them."""
+    query = db.query(
+        func.count(models.Task.id), func.max(models.Task.id), func.max(models.Task.updated_at)
+    ).select_from(models.Task).join(models.Project)
+    return tuple(filter_tasks(query, filters, owner_id).one())
+
+
+def get_task(db: Session, task_id: int, owner_id: int) -> Optional[models.Task]:
+    return _owned_task(db, task_id, owner_id)
+
+
+def update_task(db: Session, task_id: int, new_data: task_schema.TaskCreate, owner_id: int) -> Optional[models.Task]:
+    task = _owned_task(db, task_id, owner_id)
+    if not task:
+        return None
+    before = counter_service.counter_key(task)
+    task.title = new_data.title
+    task.description = new_data.description
+    task.status = new_data.status
+    task.assignee_id = new_data.assignee_id
+    task.due_date = new_data.due_date
+    counter_service.track_task(db, before, task)
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+def delete_task(db: Session, task_id: int, owner_id: int) -> bool:
+    task = _owned_task(db, task_id, owner_id)
+    if not task:
+        return False
+    counter_service.track_task(db, counter_service.counter_key(task), None)
+    db.delete(task)
+    db.commit()
+    return True
+
+
+def assign_task(db: Session, task_id: int, assignee_id: int, owner_id: int) -> Optional[models.Task]:
+    task = _owned_task(db, task_id, owner_id)
+    if not task:
+        return None
+    task.assignee_id = assignee_id
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+def describe_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+def _validate_items(schema, payloads: List[Any]):
+    """Validate each payload on its own so one bad item does not reject the batch."""
+    items, errors = {}, {}
+    compiled = adapter(schema)
+    for index, payload in enumerate(payloads):
+        try:
+            items[index] = compiled.validate_python(payload)
+        except ValidationError as exc:
+            errors[index] = describe_error(exc)
+    return items, errors
+
+
+def flush_batch(db: Session, ops: Dict[int, Callable], errors: Dict[int, str]) -> dict:
+    """Run every op and flush once; on a constraint error retry each op in its own
+    savepoint so only the offending items are reported.
+
+    Each op stages one task and returns its ``(counter key before, task)``.
+    """
+    try:
+        with db.begin_nested():
+            done = {index: op() for index, op in ops.items()}
+            db.flush()
+        return done
+    except IntegrityError:
+        pass
+    done = {}
+    for index, op in ops.items():
+        try:
+            with db.begin_nested():
+                result = op()
+                db.flush()
+            done[index] = result
+        except IntegrityError as exc:
+            errors[index] = f"Rejected by the database: {exc.orig}"
+    return done
+
+
+def _bulk_result(count: int, ids: Dict[int, int], errors: Dict[int, str]) -> dict:
+    results = [
+        {"index": index, "ok": True, "id": ids[index]} if index in ids
+        else {"index": index, "ok": False, "error": errors.get(index, "Not processed")}
+        for index in range(count)
+    ]
+    return {"succeeded": len(ids), "failed": count - len(ids), "results": results}
+
+
+def bulk_create_tasks(db: Session, payloads: List[Any], owner_id: int) -> dict:
+    """Create many tasks with one ownership query, batched INSERTs and a single commit."""
+    items, errors = _validate_items(task_schema.TaskCreate, payloads)
+    project_ids = {item.project_id for item in items.values()}
+    owned = {
+        project_id for (project_id,) in db.query(models.Project.id).filter(
+            models.Project.id.in_(project_ids), models.Project.owner_id == owner_id
+        )
+    } if project_ids else set()
+
+    def creator(values):
+        def op():
+            task = models.Task(**values)
+            db.add(task)
+            return None, task
+        return op
+
+    ops = {}
+    for index, item in items.items():
+        if item.project_id in owned:
+            ops[index] = creator(item.model_dump())
+        else:
+            errors[index] = "Project not found"
+    done = flush_batch(db, ops, errors)
+    counter_service.track_tasks(db, done.values())
+    ids = {index: task.id for index, (_, task) in done.items()}
+    db.commit()
+    return _bulk_result(len(payloads), ids, errors)
+
+
+def create_project_tasks(db: Session, project_id: int, tasks: List[dict], owner_id: int) -> Optional[List[int]]:
+    """Create ``tasks`` in one owned project in a single transaction: all of them or none.
+
+    Returns the new ids in order, or ``None`` if the project is not the owner's.
+    """
+    owned = db.query(models.Project.id).filter(
+        models.Project.id == project_id, models.Project.owner_id == owner_id
+    ).first()
+    if not owned:
+        return None
+    created = [models.Task(project_id=project_id, **values) for values in tasks]
+    db.add_all(created)
+    db.flush()
+    counter_service.track_tasks(db, [(None, task) for task in created])
+    ids = [task.id for task in created]
+    db.commit()
+    return ids
+
+
+def bulk_update_tasks(db: Session, payloads: List[Any], owner_id: int) -> dict:
+    """Patch many tasks: one SELECT for all owned targets, batched UPDATEs, one commit."""
+    items, errors = _validate_items(task_schema.TaskPatch, payloads)
+    task_ids = {item.id for item in items.values()}
+    owned = {
+        task.id: task for task in db.query(models.Task).join(models.Project).filter(
+            models.Task.id.in_(task_ids), models.Project.owner_id == owner_id
+        )
+    } if task_ids else {}
+
+    def patcher(task, changes):
+        def op():
+            before = counter_service.counter_key(task)
+            for name, value in changes.items():
+                setattr(task, name, value)
+            return before, task
+        return op
+
+    ops, seen = {}, set()
+    for index, item in items.items():
+        if item.id not in owned:
+            errors[index] = "Task not found"
+        elif item.id in seen:
+            errors[index] = "Task appears more than once in this request"
+        else:
+            seen.add(item.id)
+            ops[index] = patcher(owned[item.id], item.model_dump(exclude_unset=True, exclude={"id"}))
+    done = flush_batch(db, ops, errors)
+    counter_service.track_tasks(db, done.values())
+    ids = {index: task.id for index, (_, task) in done.items()}
+    db.commit()
+    return _bulk_result(len(payloads), ids, errors)
+
+
+def task_stats(db: Session, owner_id: int, project_id: Optional[int] = None) -> dict:
+    """Task counts by status, assignee and overdue flag in a single GROUP BY query."""
+    overdue = case(
+        (and_(models.Task.due_date < datetime.now(), models.Task.status.notin_(models.DONE_STATUSES)), 1),
+        else_=0,
+    )
+    query = db.query(
+        models.Task.status, models.Task.assignee_id, overdue, func.count(models.Task.id)
+    ).join(models.Project)
+    query = filter_tasks(query, TaskFilters(project_id=project_id), owner_id)
+    rows = query.group_by(models.Task.status, models.Task.assignee_id, overdue).all()
+
+    stats = {"total": 0, "overdue": 0, "by_status": {}, "by_assignee": {}}
+    for status, assignee_id, is_overdue, count in rows:
+        stats["total"] += count
+        stats["overdue"] += count if is_overdue else 0
+        stats["by_status"][status] = stats["by_status"].get(status, 0) + count
+        stats["by_assignee"][assignee_id] = stats["by_assignee"].get(assignee_id, 0) + count
+    stats["by_assignee"] = [
+        {"assignee_id": assignee_id, "count": count}
+        for assignee_id, count in stats["by_assignee"].items()
+    ]
+    return stats
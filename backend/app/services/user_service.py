@@ -0,0 +1,108 @@
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy import event, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import Project, ProjectMember, User
+from app.config import USER_INDEX_MAX_USERS, USER_INDEX_TTL
+from app.utils.pagination import Keyset, PageParams, paginate
+from app.utils.prefix_index import RecordIndex
+
+# users has no created_at; ids are assigned in registration order
+USER_KEYSET = Keyset("id", User.id, User.id)
+
+# Row layout of GET /users/search results and of the typeahead index
+USER_SEARCH_FIELDS = ("id", "username", "email", "role")
+
+# username/email -> user prefix index for typeahead lookups (per process)
+user_index = RecordIndex(keys=("username", "email"), max_rows=USER_INDEX_MAX_USERS, ttl=USER_INDEX_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _reload_index_on_user_change(mapper, connection, target):
+    # Renames and deletes are rare; the next lookup reloads this process's index
+    user_index.invalidate()
+
+
+def get_user(db: Session, user_id: int) -> Optional[User]:
+    return db.query(User).filter(User.id == user_id).first()
+
+
+def find_by_email(db: Session, email: str, *columns):
+    row = db.query(*(columns or (User,))).filter(User.email == email).first()
+    # End the transaction so no pooled connection is held while bcrypt runs
+    db.close()
+    return row
+
+
+def update_password(db: Session, user_id: int, password_hash: str):
+    db.query(User).filter(User.id == user_id).update({User.password: password_hash})
+    db.commit()
+
+
+def create_user(db: Session, user_obj: User) -> User:
+    db.add(user_obj)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Database error: {}".format(e.orig))
+    db.refresh(user_obj)
+    user_index.add(_search_row(user_obj))
+    return user_obj
+
+
+def list_users(db: Session, page: PageParams):
+    return paginate(db.query(User), USER_KEYSET, page)
+
+
+def _search_row(user) -> tuple:
+    role = user.role.value if hasattr(user.role, "value") else user.role
+    return user.id, user.username, user.email, role
+
+
+def _users_since(db: Session, last_id: int, limit: int) -> list:
+    rows = db.query(User.id, User.username, User.email, User.role).filter(
+        User.id > last_id
+    ).order_by(User.id).limit(limit)
+    return [_search_row(row) for row in rows]
+
+
+def _project_user_ids(db: Session, project_id: int) -> Optional[set]:
+    owner = db.query(Project.owner_id).filter(Project.id == project_id).first()
+    if owner is None:
+        return None
+    members = db.query(ProjectMember.user_id).filter(ProjectMember.project_id == project_id)
+    return {user_id for (user_id,) in members} | {owner.owner_id}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_like(db: Session, prefix: str, limit: int, allowed: Optional[set]) -> List[tuple]:
+    pattern = _escape_like(prefix) + "%"
+    query = db.query(User.id, User.username, User.email, User.role).filter(
+        or_(User.username.like(pattern, escape="\\"), User.email.like(pattern, escape="\\"))
+    )
+    if allowed is not None:
+        query = query.filter(User.id.in_(allowed))
+    return [_search_row(row) for row in query.order_by(User.username).limit(limit)]
+
+
+def search_users(db: Session, prefix: str, limit: int, project_id: Optional[int] = None) -> Optional[List[tuple]]:
+    """Up to ``limit`` ``USER_SEARCH_FIELDS`` rows whose username or email starts with ``prefix``.
+
+    With ``project_id`` only the project's owner and members are returned
+    (``None`` if there is no such project). Served from ``user_index`` when it
+    is enabled, otherwise from the username/email unique indexes with LIKE.
+    """
+    allowed = None
+    if project_id is not None:
+        allowed = _project_user_ids(db, project_id)
+        if allowed is None:
+            return None
+    if user_index.refresh(lambda last_id, count: _users_since(db, last_id, count)):
+        return user_index.search(prefix, limit, allowed)
+    return _search_like(db, prefix, limit, allowed)
@@ -10,6 +10,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 os.environ["TESTING"] = "true"
 os.environ["DB_URL"] = "sqlite:///./test.db"
 os.environ["SECRET_KEY"] = "test-secret-key-for-testing-only"
+os.environ["BCRYPT_ROUNDS"] = "4"
+# Tests run queued jobs explicitly (job_pool.run_once) instead of in worker threads
+os.environ["JOB_WORKERS"] = "0"
+os.environ["AI_PROVIDER"] = "fake"
 
 @pytest.fixture(scope="session")
 def test_config():
@@ -50,3 +54,87 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(pytest.mark.integration)
         else:
             item.add_marker(pytest.mark.unit)
+
+@pytest.fixture(scope="function", params=["sync", "async"])
+def client(request):
+    """Test client backed by a freshly created schema.
+
+    Every router test runs twice: once on the blocking Session and once on the
+    AsyncSession (aiosqlite) path selected by DB_ASYNC.
+    """
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import engine, get_session, get_async_db, get_async_engine
+    from app.dependencies import principal_cache
+    from app.services.user_service import user_index
+    from app.utils.response_cache import response_cache
+    from models import Base
+
+    Base.metadata.create_all(bind=engine)
+    principal_cache.clear()
+    response_cache.clear()
+    user_index.clear()
+    if request.param == "async":
+        app.dependency_overrides[get_session] = get_async_db
+    try:
+        with TestClient(app) as test_client:
+            test_client.db_mode = request.param
+            yield test_client
+            # aiosqlite connections are bound to this client's event loop
+            test_client.portal.call(get_async_engine().dispose)
+    finally:
+        app.dependency_overrides.clear()
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(scope="function")
+def statements():
+    """Record SQL statements issued through either the sync or async engine."""
+    from sqlalchemy import event
+    from app.database import engine, get_async_engine
+
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    targets = (engine, get_async_engine().sync_engine)
+    for target in targets:
+        event.listen(target, "before_cursor_execute", record)
+    yield recorded
+    for target in targets:
+        event.remove(target, "before_cursor_execute", record)
+
+@pytest.fixture(scope="function")
+def auth_headers(client):
+    """Register and log in an admin user, returning bearer auth headers."""
+    client.post("/users/", json={
+        "username": "owner",
+        "email": "owner@example.com",
+        "role": "admin",
+        "password": "password123"
+    })
+    response = client.post("/users/login", json={
+        "email": "owner@example.com",
+        "password": "password123"
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture(scope="function")
+def project_id(client, auth_headers):
+    """Project owned by the authenticated user (demo owner_id=1)."""
+    return client.post("/projects/", json={"name": "Sprint"}).json()["id"]
+
+@pytest.fixture(scope="function")
+def stranger_headers(client, auth_headers):
+    """Register and log in a second, non-admin user who owns nothing, returning bearer auth headers."""
+    client.post("/users/", json={
+        "username": "stranger",
+        "email": "stranger@example.com",
+        "role": "developer",
+        "password": "password123"
+    })
+    response = client.post("/users/login", json={
+        "email": "stranger@example.com",
+        "password": "password123"
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
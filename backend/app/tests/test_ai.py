@@ -0,0 +1,346 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from app.database import SessionLocal
+from app.services import ai_service, counter_service
+from app.utils.ai_providers import FakeProvider, ProviderError
+from app.utils.limits import CircuitBreaker, CircuitOpen, ConcurrencyLimiter
+from models import AICache, Project, Task
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Fresh fake model for each test."""
+    fake = FakeProvider()
+    monkeypatch.setattr(ai_service, "_provider", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def guards(monkeypatch):
+    """Fresh concurrency limits and circuit breaker for each test."""
+    monkeypatch.setattr(ai_service, "limiter", ConcurrencyLimiter(4, 2))
+    monkeypatch.setattr(ai_service, "breaker", CircuitBreaker(3, 60))
+
+
+def generate(client, headers, project_id, **body):
+    return client.post("/ai/stories", json={"project_id": project_id, **body}, headers=headers)
+
+
+def stream(client, headers, project_id, **body):
+    """POST /ai/stories/stream; returns the response and its ``(event, data)`` pairs."""
+    response = client.post("/ai/stories/stream", json={"project_id": project_id, **body}, headers=headers)
+    if response.status_code != 200:
+        return response, []
+    frames = [frame.split("\n") for frame in response.text.split("\n\n") if frame]
+    return response, [(event[len("event: "):], json.loads(data[len("data: "):])) for event, data in frames]
+
+
+def cache_rows():
+    db = SessionLocal()
+    try:
+        return db.query(AICache).order_by(AICache.created_at).all()
+    finally:
+        db.close()
+
+
+class TestStoryGeneration:
+    """Test cases for POST /ai/stories and its response cache."""
+
+    def test_repeat_prompt_served_from_cache(self, client, auth_headers, project_id, provider):
+        """Test that the second identical request is answered from ai_cache without a model call."""
+        first = generate(client, auth_headers, project_id)
+        assert first.status_code == 200
+        body = first.json()
+        assert body["cached"] is False and len(body["stories"]) == 5
+        assert body["stories"][0]["title"] == "Story 1 for Sprint"
+
+        second = generate(client, auth_headers, project_id).json()
+        assert second["cached"] is True and second["stories"] == body["stories"]
+        assert provider.calls == 1
+        assert cache_rows()[0].hits == 1
+
+    def test_key_normalizes_prompt_but_not_params(self, client, auth_headers, project_id, provider):
+        """Test that case and spacing share an entry while a different count does not."""
+        generate(client, auth_headers, project_id, prompt="Billing  and\n ONBOARDING", count=3)
+        assert generate(client, auth_headers, project_id, prompt="billing and onboarding", count=3).json()["cached"]
+        assert not generate(client, auth_headers, project_id, prompt="billing and onboarding", count=4).json()["cached"]
+        assert provider.calls == 2
+
+    def test_expired_entry_is_refetched(self, client, auth_headers, project_id, provider):
+        """Test that entries past their TTL are not served."""
+        generate(client, auth_headers, project_id)
+        db = SessionLocal()
+        db.query(AICache).update({AICache.expires_at: datetime.now() - timedelta(seconds=1)})
+        db.commit()
+        db.close()
+        assert generate(client, auth_headers, project_id).json()["cached"] is False
+        assert provider.calls == 2 and len(cache_rows()) == 1
+
+    def test_eviction_keeps_recently_used(self, client, auth_headers, project_id, provider):
+        """Test that eviction bounds the table by dropping the least recently used entries."""
+        for count in (1, 2, 3):
+            generate(client, auth_headers, project_id, count=count)
+        generate(client, auth_headers, project_id, count=1)  # hit: now the most recently used
+        db = SessionLocal()
+        assert ai_service.evict(db, max_entries=2) == 1
+        db.commit()
+        db.close()
+        assert [len(row.response) for row in cache_rows()] == [1, 3]
+
+    def test_concurrent_requests_share_one_call(self, client, monkeypatch):
+        """Test that identical in-flight requests wait for a single upstream call."""
+        slow = FakeProvider(delay=0.3)
+        monkeypatch.setattr(ai_service, "_provider", slow)
+        project = SimpleNamespace(name="Orbit", description=None)
+        results = []
+
+        def worker():
+            results.append(ai_service.generate_stories(project, 2))
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert slow.calls == 1
+        assert len({str(result["stories"]) for result in results}) == 1
+
+    def test_provider_failures_are_502_and_not_cached(self, client, auth_headers, project_id, monkeypatch):
+        """Test that upstream errors and unusable replies surface as 502 and leave no cache entry."""
+        monkeypatch.setattr(ai_service, "_provider", FakeProvider(error="quota exceeded"))
+        response = generate(client, auth_headers, project_id)
+        assert response.status_code == 502 and "quota exceeded" in response.json()["detail"]
+        monkeypatch.setattr(ai_service, "_provider", FakeProvider(reply="Sorry, I cannot help with that."))
+        assert generate(client, auth_headers, project_id).status_code == 502
+        assert cache_rows() == []
+
+    def test_parse_stories(self):
+        """Test that the JSON array is taken from a chatty reply and untitled items are dropped."""
+        reply = 'Here you go:\n[{"title": "  Login  ", "description": "SSO"}, {"description": "x"}, "y", ' \
+                '{"title": "' + "t" * 150 + '"}]\nEnjoy!'
+        assert ai_service.parse_stories(reply) == [
+            {"title": "Login", "description": "SSO"}, {"title": "t" * 100, "description": ""}
+        ]
+        with pytest.raises(ProviderError):
+            ai_service.parse_stories("[]")
+
+    def test_requires_project_access(self, client, auth_headers, provider):
+        """Test that stories can only be generated for the caller's projects."""
+        other = client.post("/projects/", json={"name": "Private"}).json()["id"]
+        db = SessionLocal()
+        db.query(Project).filter(Project.id == other).update({Project.owner_id: 2})
+        db.commit()
+        db.close()
+        assert generate(client, auth_headers, other).status_code == 404
+        assert client.post("/ai/stories", json={"project_id": other}).status_code == 401
+        assert provider.calls == 0
+
+
+class TestStoryStreaming:
+    """Test cases for POST /ai/stories/stream and the limits on model calls."""
+
+    def test_stream_then_replay_from_cache(self, client, auth_headers, project_id, provider):
+        """Test that tokens and stories stream as they arrive and a repeat replays the cached stories."""
+        response, events = stream(client, auth_headers, project_id, count=3)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        names = [event for event, _ in events]
+        assert names[-1] == "done" and names.count("story") == 3 and names.count("token") > 3
+        # Each story is sent before the rest of the reply has streamed in
+        assert names.index("story") < len(names) - names[::-1].index("token") - 1
+        text = "".join(data["text"] for event, data in events if event == "token")
+        stories = [data for event, data in events if event == "story"]
+        done = events[-1][1]
+        assert [story.pop("index") for story in stories] == [0, 1, 2]
+        assert stories == done["stories"] == ai_service.parse_stories(text)
+        assert done["cached"] is False
+
+        _, replay = stream(client, auth_headers, project_id, count=3)
+        assert [event for event, _ in replay] == ["story", "story", "story", "done"]
+        assert replay[-1][1]["cached"] is True and replay[-1][1]["stories"] == done["stories"]
+        assert provider.calls == 1
+        # The blocking endpoint shares the cache
+        assert generate(client, auth_headers, project_id, count=3).json()["cached"] is True
+        assert ai_service.limiter.stats()["active"] == 0
+
+    def test_story_parser_across_chunks(self):
+        """Test that stories are found however the reply is split, braces and quotes in strings included."""
+        reply = 'Sure! "Quoted" prose [ignored]\n[{"title": "A {b}", "description": "say \\"hi\\" ]"},' \
+                ' {"oops": 1}, {"title": "C", "description": "d"}]'
+        parser = ai_service.StoryStream()
+        found = [story for char in reply for story in parser.feed(char)]
+        assert found == parser.stories == [
+            {"title": "A {b}", "description": 'say "hi" ]'}, {"title": "C", "description": "d"}
+        ]
+
+    def test_stream_failure_is_an_error_event(self, client, auth_headers, project_id, monkeypatch):
+        """Test that a failed or unusable stream ends with an error event and caches nothing."""
+        monkeypatch.setattr(ai_service, "_provider", FakeProvider(error="model overloaded"))
+        response, events = stream(client, auth_headers, project_id)
+        assert response.status_code == 200
+        assert events == [("error", {"detail": "AI provider error: model overloaded"})]
+        monkeypatch.setattr(ai_service, "_provider", FakeProvider(reply="no stories today"))
+        _, events = stream(client, auth_headers, project_id)
+        assert events[-1][0] == "error"
+        assert cache_rows() == [] and ai_service.limiter.stats()["active"] == 0
+        # Only the upstream failure counts against the provider, not the unusable reply
+        assert ai_service.breaker.stats()["failures"] == 0
+
+    def test_stalled_stream_times_out(self, monkeypatch):
+        """Test that a model going quiet past the idle timeout ends the stream and frees the slot."""
+        monkeypatch.setattr(ai_service, "_provider", FakeProvider(chunk_delay=0.5))
+        messages = ai_service.build_messages(SimpleNamespace(name="Slow", description=None), 2)
+
+        async def run():
+            slot = ai_service.admit(1)
+            return [event async for event in ai_service.stream_stories(messages, "k", slot, idle_timeout=0.05)]
+
+        events = asyncio.run(run())
+        assert events[0][0] == "token"
+        assert events[-1] == ("error", {"detail": "AI provider error: No reply from the model for 0.05s"})
+        assert ai_service.limiter.stats()["active"] == 0
+        assert ai_service.breaker.stats()["failures"] == 1
+
+    def test_per_user_and_global_limits(self, client, auth_headers, project_id, provider, monkeypatch):
+        """Test that model calls past the per-user or global cap are refused with 429."""
+        monkeypatch.setattr(ai_service, "limiter", ConcurrencyLimiter(2, 1))
+        held = ai_service.admit(1)
+        for response in (generate(client, auth_headers, project_id), stream(client, auth_headers, project_id)[0]):
+            assert response.status_code == 429 and response.headers["retry-after"] == "1"
+        held.release()
+        held.release()  # no-op: the slot was already given back
+
+        others = [ai_service.admit(2), ai_service.admit(3)]
+        assert generate(client, auth_headers, project_id).status_code == 429
+        others.pop().release()
+        assert generate(client, auth_headers, project_id).status_code == 200
+        # Cache hits do not need a slot
+        others.append(ai_service.admit(3))
+        assert generate(client, auth_headers, project_id).json()["cached"] is True
+        assert stream(client, auth_headers, project_id)[1][-1][1]["cached"] is True
+        assert provider.calls == 1
+        for slot in others:
+            slot.release()
+        assert ai_service.limiter.stats()["rejected"] == 3
+
+    def test_breaker_opens_after_failures(self, client, auth_headers, project_id, monkeypatch):
+        """Test that repeated provider failures stop further calls with 503 until the reset timeout."""
+        failing = FakeProvider(error="upstream down")
+        monkeypatch.setattr(ai_service, "_provider", failing)
+        assert [generate(client, auth_headers, project_id).status_code for _ in range(3)] == [502, 502, 502]
+        refused = generate(client, auth_headers, project_id)
+        assert refused.status_code == 503 and int(refused.headers["retry-after"]) > 0
+        assert stream(client, auth_headers, project_id)[0].status_code == 503
+        assert failing.calls == 3
+        assert client.get("/metrics/").json()["ai"]["breaker"]["state"] == "open"
+
+    def test_breaker_half_open(self):
+        """Test that after the reset timeout one probe is let through, and its result closes or reopens the circuit."""
+        now = [0.0]
+        breaker = CircuitBreaker(2, 10, clock=lambda: now[0])
+        breaker.record_failure()
+        assert breaker.allow() is False
+        breaker.record_failure()
+        with pytest.raises(CircuitOpen):
+            breaker.allow()
+        now[0] = 10
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        with pytest.raises(CircuitOpen):
+            breaker.allow()  # the probe is still out
+        breaker.record_failure()
+        assert breaker.state == "open"
+        now[0] = 20
+        assert breaker.allow() is True
+        breaker.cancel_probe()
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.stats()["opened"] == 2
+        assert breaker.allow() is False and breaker.allow() is False
+
+    def test_abandoned_probe_expires(self):
+        """Test that a probe which never reports back stops blocking callers after the reset timeout."""
+        now = [0.0]
+        breaker = CircuitBreaker(1, 10, clock=lambda: now[0])
+        breaker.record_failure()
+        now[0] = 10
+        assert breaker.allow() is True
+        now[0] = 15
+        with pytest.raises(CircuitOpen):
+            breaker.allow()
+        now[0] = 20
+        assert breaker.allow() is True
+
+    def test_half_open_lets_one_concurrent_call_through(self, client, monkeypatch):
+        """Test that concurrent requests against a half-open circuit make a single upstream call."""
+        now = [0.0]
+        monkeypatch.setattr(ai_service, "breaker", CircuitBreaker(1, 10, clock=lambda: now[0]))
+        monkeypatch.setattr(ai_service, "limiter", ConcurrencyLimiter(20, 20))
+        failing = FakeProvider(delay=0.2, error="still down")
+        monkeypatch.setattr(ai_service, "_provider", failing)
+        project = SimpleNamespace(name="Probe", description=None)
+        with pytest.raises(ProviderError):
+            ai_service.generate_stories(project, 1)
+        now[0] = 10
+        outcomes = []
+
+        def worker(count):
+            # Different counts, so single-flight does not merge the calls
+            try:
+                ai_service.generate_stories(project, count)
+            except Exception as exc:
+                outcomes.append(type(exc).__name__)
+
+        threads = [threading.Thread(target=worker, args=(count,)) for count in range(2, 10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert failing.calls == 2
+        assert sorted(outcomes) == ["CircuitOpen"] * 7 + ["ProviderError"]
+        assert ai_service.breaker.state == "open"
+
+
+class TestStoryTasks:
+    """Test cases for POST /ai/stories/tasks."""
+
+    def test_creates_tasks_in_order(self, client, auth_headers, project_id, provider):
+        """Test that generated stories become tasks of the project and are counted."""
+        stories = generate(client, auth_headers, project_id, count=3).json()["stories"]
+        response = client.post("/ai/stories/tasks", json={"project_id": project_id, "stories": stories},
+                               headers=auth_headers)
+        assert response.status_code == 201
+        task_ids = response.json()["task_ids"]
+        tasks = {task["id"]: task for task in client.get(
+            "/tasks/", params={"project_id": project_id}, headers=auth_headers).json()}
+        assert [tasks[task_id]["title"] for task_id in task_ids] == [story["title"] for story in stories]
+        assert all(tasks[task_id]["status"] == "todo" for task_id in task_ids)
+        stats = client.get(
+            "/tasks/stats", params={"project_id": project_id}, headers=auth_headers).json()
+        assert stats["by_status"] == {"todo": 3}
+
+    def test_all_or_nothing(self, client, auth_headers, project_id, monkeypatch):
+        """Test that a failure part way leaves none of the tasks behind."""
+        def broken(db, changes):
+            raise RuntimeError("counter update failed")
+        monkeypatch.setattr(counter_service, "track_tasks", broken)
+        stories = [{"title": f"Story {i}"} for i in range(5)]
+        with pytest.raises(RuntimeError):
+            client.post("/ai/stories/tasks", json={"project_id": project_id, "stories": stories},
+                        headers=auth_headers)
+        db = SessionLocal()
+        assert db.query(Task).filter(Task.project_id == project_id).count() == 0
+        db.close()
+
+    def test_requires_owned_project(self, client, auth_headers, project_id):
+        """Test that tasks can only be added to the caller's own projects, and need at least one story."""
+        story = [{"title": "Story"}]
+        assert client.post("/ai/stories/tasks", json={"project_id": 999, "stories": story},
+                           headers=auth_headers).status_code == 404
+        assert client.post("/ai/stories/tasks", json={"project_id": project_id, "stories": []},
+                           headers=auth_headers).status_code == 422
+        assert client.post("/ai/stories/tasks", json={"project_id": project_id, "stories": story}).status_code == 401
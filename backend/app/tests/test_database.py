@@ -0,0 +1,40 @@
+import pytest
+from app import database
+from app.database import InstrumentedQueuePool, engine, get_session, pool_stats
+
+
+class TestSessionFactory:
+    """Test cases for the shared session factory and pool."""
+
+    def test_routers_share_one_session_dependency(self):
+        """Test that every router resolves sessions through app.database.get_session."""
+        from app.routers import user, comment, project, task
+        for module in (user, comment, project, task):
+            assert module.get_session is get_session
+
+    def test_file_database_uses_instrumented_pool(self):
+        """Test that the configured pool settings are applied."""
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+        assert engine.pool.size() == database.DB_POOL_SIZE
+        assert engine.pool._pre_ping == database.DB_POOL_PRE_PING
+        assert engine.pool._recycle == database.DB_POOL_RECYCLE
+
+    def test_memory_database_keeps_default_pool(self):
+        """Test that pool sizing is not forced onto in-memory SQLite."""
+        options = database._engine_options("sqlite:///:memory:")
+        assert "poolclass" not in options
+
+    def test_pool_stats_track_checkouts(self):
+        """Test that checkouts and wait times are recorded."""
+        before = pool_stats()["checkouts"]
+        with engine.connect() as connection:
+            assert pool_stats()["checked_out"] >= 1
+        stats = pool_stats()
+        assert stats["checkouts"] == before + 1
+        assert stats["wait_max_ms"] >= 0
+
+    def test_metrics_endpoint_reports_pool(self, client):
+        """Test that pool statistics are exposed on /metrics."""
+        response = client.get("/metrics/")
+        assert response.status_code == 200
+        assert response.json()["db_pool"]["pool"] == "InstrumentedQueuePool"
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import pytest
+from app.database import SessionLocal
+from app.routers.events import event_stream
+from app.tests.test_tasks import make_task
+from app.utils.broker import RESYNC, Subscription, broker
+from models import Project, Task
+
+
+@pytest.fixture
+def subscribe(client):
+    """Subscribe to projects on the app's event loop; returns a function draining received events."""
+    subscriptions = []
+
+    def subscribe(*topics):
+        async def make():
+            return broker.subscribe(topics)
+        subscription = client.portal.call(make)
+        subscriptions.append(subscription)
+
+        def received(timeout=0.2):
+            events = []
+            while (payload := client.portal.call(subscription.get, timeout)) is not None:
+                events.append(json.loads(payload))
+            return events
+        return received
+
+    yield subscribe
+    for subscription in subscriptions:
+        broker.unsubscribe(subscription)
+
+
+class TestChangeEvents:
+    """Test cases for change events published after commit."""
+
+    def test_task_lifecycle(self, client, auth_headers, project_id, subscribe):
+        """Test that task writes publish compact created/updated/assigned/deleted events."""
+        received = subscribe(project_id)
+        task = make_task(client, auth_headers, project_id, title="Ship it")
+        client.put(f"/tasks/{task['id']}", json={
+            "title": "Ship it now", "description": "Details", "status": "todo", "project_id": project_id
+        }, headers=auth_headers)
+        client.post(f"/tasks/{task['id']}/assign", json={"assignee_id": 1}, headers=auth_headers)
+        client.post("/comments/", json={"comment": "On it", "task_id": task["id"], "user_id": 1})
+        client.delete(f"/tasks/{task['id']}", headers=auth_headers)
+
+        events = received()
+        assert [event["type"] for event in events] == [
+            "task.created", "task.updated", "task.assigned", "comment.created", "task.deleted"
+        ]
+        assert {event["project_id"] for event in events} == {project_id}
+        assert events[0]["data"]["title"] == "Ship it"
+        assert events[2]["data"]["assignee_id"] == 1
+        assert events[3]["data"]["content"] == "On it"
+        assert events[4]["data"] == {"id": task["id"]}
+
+    def test_only_subscribed_projects(self, client, auth_headers, project_id, subscribe):
+        """Test that subscribers only receive events of their projects, bulk writes included."""
+        other = client.post("/projects/", json={"name": "Other"}).json()["id"]
+        received = subscribe(project_id)
+        client.post("/tasks/bulk", json=[
+            {"title": f"T{i}", "description": "d", "status": "todo", "project_id": pid}
+            for i, pid in enumerate([project_id, other, project_id])
+        ], headers=auth_headers)
+        client.put(f"/projects/{other}", json={"name": "Renamed"})
+        assert [event["data"]["title"] for event in received()] == ["T0", "T2"]
+
+    def test_rolled_back_writes_are_not_published(self, client, project_id, subscribe):
+        """Test that flushed but uncommitted changes never reach subscribers."""
+        received = subscribe(project_id)
+        db = SessionLocal()
+        try:
+            db.add(Task(title="Draft", description="d", status="todo", project_id=project_id))
+            db.flush()
+            db.rollback()
+            db.add(Project(name="Other", owner_id=1))
+            db.commit()
+        finally:
+            db.close()
+        assert received() == []
+
+    def test_event_stream_frames(self, client, project_id):
+        """Test the SSE framing, keep-alives and unsubscribe on disconnect."""
+        async def read():
+            stream = event_stream({project_id}, heartbeat=0.05)
+            frames = [await stream.__anext__()]
+            broker.publish(project_id, b'{"type":"task.created"}')
+            frames += [await stream.__anext__(), await stream.__anext__()]
+            subscribers = broker.stats()["subscribers"]
+            await stream.aclose()
+            return frames, subscribers
+
+        frames, subscribers = client.portal.call(read)
+        assert frames == [b"retry: 3000\n\n", b'data: {"type":"task.created"}\n\n', b": ping\n\n"]
+        assert subscribers == 1
+        assert broker.stats()["subscribers"] == 0
+
+
+class TestEventsEndpoint:
+    """Test cases for GET /events/ authorization."""
+
+    def test_requires_auth(self, client, project_id):
+        """Test that unauthenticated subscriptions are rejected."""
+        assert client.get("/events/", params={"project_id": project_id}).status_code == 401
+
+    def test_unknown_project(self, client, auth_headers, project_id):
+        """Test that projects the user neither owns nor belongs to cannot be subscribed to."""
+        token = auth_headers["Authorization"].split()[1]
+        response = client.get("/events/", params={"project_id": [project_id, 999], "access_token": token})
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Project not found: 999"
+
+
+class TestSubscription:
+    """Test cases for per-subscriber backpressure."""
+
+    def test_overflow_replaced_by_resync(self):
+        """Test that a full queue is dropped in favour of a single resync marker."""
+        async def fill():
+            subscription = Subscription([1], maxsize=2)
+            for payload in (b"1", b"2", b"3"):
+                subscription.deliver(payload)
+            return subscription
+
+        subscription = asyncio.run(fill())
+        assert subscription.overflows == 1
+        assert subscription.queue.qsize() == 1
+        assert subscription.queue.get_nowait() == RESYNC
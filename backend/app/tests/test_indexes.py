@@ -0,0 +1,193 @@
+import os
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine, event, insert, inspect, text
+from sqlalchemy.orm import sessionmaker
+from app.services import comment_service, project_service, task_service, user_service
+from app.utils.pagination import PageParams
+from models import Base, Project, Task, TaskComment, User, UserRole
+
+# Tables on the authenticated request path; each query touching them must use an index
+HOT_TABLES = ("tasks", "task_comments", "projects", "users")
+
+
+@pytest.fixture(params=["sqlite", "mysql"])
+def explain_db(request, tmp_path):
+    """Session on a seeded database of the given dialect, recording every SQL statement."""
+    if request.param == "sqlite":
+        url = f"sqlite:///{tmp_path / 'explain.db'}"
+    else:
+        url = os.getenv("TEST_MYSQL_URL")
+        if not url:
+            pytest.skip("TEST_MYSQL_URL not set")
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password": "x", "role": UserRole.user}
+            for i in range(1, 21)
+        ])
+        conn.execute(insert(Project), [
+            {"id": i, "name": f"Project {i}", "owner_id": i % 20 + 1, "created_at": now} for i in range(1, 41)
+        ])
+        conn.execute(insert(Task), [
+            {
+                "title": f"Task {i}", "status": ("todo", "done")[i % 2], "project_id": i % 40 + 1,
+                "assignee_id": i % 20 + 1, "due_date": now + timedelta(days=i % 30 - 15),
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(1, 801)
+        ])
+        conn.execute(insert(TaskComment), [
+            {"content": "note", "task_id": i % 800 + 1, "user_id": 1, "created_at": now} for i in range(1, 801)
+        ])
+        if engine.dialect.name == "sqlite":
+            conn.execute(text("ANALYZE"))
+
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db, recorded
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", record)
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def run_router_queries(db):
+    """Issue the queries behind the auth, task and comment endpoints."""
+    page = PageParams(limit=20, cursor=None)
+    user_service.get_user(db, 1)
+    user_service.find_by_email(db, "user1@example.com", User.id, User.password)
+    task_service.list_tasks(db, 1, page, task_service.TaskFilters())
+    task_service.list_tasks(db, 1, page, task_service.TaskFilters(project_id=1, status=["todo"]))
+    task_service.list_tasks(db, 1, page, task_service.TaskFilters(
+        assignee_id=2, sort=task_service.task_schema.TaskSort.due_date
+    ))
+    task_service.get_task(db, 1, 2)
+    task_service.task_stats(db, 1)
+    task_service.task_stats(db, 1, project_id=1)
+    comment_service.list_comments_for_task(db, 1, page)
+
+
+def sqlite_full_scans(conn, statement, parameters):
+    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    # "SCAN t" without "USING ... INDEX" reads every row of t
+    return [row[-1] for row in plan if row[-1].startswith("SCAN") and "INDEX" not in row[-1]]
+
+
+def mysql_full_scans(conn, statement, parameters):
+    result = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+    return [f"{row['table']}: type=ALL" for row in result if row["type"] == "ALL"]
+
+
+def sqlite_sorts(conn, statement, parameters):
+    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in plan if "TEMP B-TREE" in row[-1]]
+
+
+def mysql_sorts(conn, statement, parameters):
+    result = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+    return [f"{row['table']}: {row['Extra']}" for row in result if "filesort" in (row["Extra"] or "")]
+
+
+class TestHotPathIndexes:
+    """EXPLAIN every router query and assert no hot table is read with a full scan."""
+
+    def test_router_queries_use_indexes(self, explain_db):
+        """Test that auth, task and comment queries are index lookups."""
+        db, recorded = explain_db
+        run_router_queries(db)
+        queries = [
+            (statement, parameters) for statement, parameters in recorded
+            if statement.lstrip().upper().startswith("SELECT")
+            and any(f"FROM {table}" in statement for table in HOT_TABLES)
+        ]
+        assert len(queries) >= 9
+
+        engine = db.get_bind()
+        full_scans = sqlite_full_scans if engine.dialect.name == "sqlite" else mysql_full_scans
+        with engine.connect() as conn:
+            problems = {
+                statement: scans for statement, parameters in queries
+                if (scans := full_scans(conn, statement, parameters))
+            }
+        assert problems == {}
+
+    def test_project_members_unique(self, explain_db):
+        """Test that a user can only be added to a project once."""
+        from sqlalchemy.exc import IntegrityError
+        from models import ProjectMember
+        db, _ = explain_db
+        db.add(ProjectMember(project_id=1, user_id=1))
+        db.commit()
+        db.add(ProjectMember(project_id=1, user_id=1))
+        with pytest.raises(IntegrityError):
+            db.commit()
+
+    def test_project_pages_read_index_in_order(self, explain_db):
+        """Test that every GET /projects/ page, deep ones included, walks (created_at, id) without sorting."""
+        db, recorded = explain_db
+        page, cursor = PageParams(limit=10, cursor=None), None
+        for _ in range(3):
+            _, cursor = project_service.list_projects(db, page)
+            page = PageParams(limit=10, cursor=cursor)
+        queries = [
+            (statement, parameters) for statement, parameters in recorded
+            if statement.lstrip().upper().startswith("SELECT") and "FROM projects" in statement
+        ]
+        assert len(queries) == 3 and cursor is not None
+
+        engine = db.get_bind()
+        dialect = engine.dialect.name
+        full_scans = sqlite_full_scans if dialect == "sqlite" else mysql_full_scans
+        sorts = sqlite_sorts if dialect == "sqlite" else mysql_sorts
+        with engine.connect() as conn:
+            problems = {
+                statement: scans for statement, parameters in queries
+                if (scans := full_scans(conn, statement, parameters) + sorts(conn, statement, parameters))
+            }
+        assert problems == {}
+
+
+class TestMigrations:
+    """Apply the Alembic chain to an empty database and compare it with models.py."""
+
+    def test_upgrade_head_from_empty(self, tmp_path):
+        """Test that every table, column and index of the models is created by the migrations."""
+        from alembic import command
+        from alembic.config import Config
+        backend = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        url = f"sqlite:///{tmp_path / 'migrated.db'}"
+        # No ini file: env.py would otherwise reconfigure (and disable) the app's loggers
+        config = Config()
+        config.set_main_option("script_location", os.path.join(backend, "alembic"))
+        config.set_main_option("sqlalchemy.url", url)
+        command.upgrade(config, "head")
+
+        engine = create_engine(url)
+        try:
+            inspector = inspect(engine)
+            missing = {}
+            for table in Base.metadata.sorted_tables:
+                columns = {column["name"] for column in inspector.get_columns(table.name)}
+                indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+                # FULLTEXT indexes are MySQL only; SQLite gets the task_search FTS5 table
+                wanted = {column.name for column in table.columns} - columns
+                wanted |= {index.name for index in table.indexes if not index.name.startswith("ft_")} - indexes
+                if wanted:
+                    missing[table.name] = wanted
+            assert missing == {}
+            assert "task_search" in inspector.get_table_names()
+        finally:
+            engine.dispose()
+        command.downgrade(config, "base")
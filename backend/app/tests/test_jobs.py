@@ -0,0 +1,162 @@
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+from app.database import SessionLocal
+from app.services import job_service
+from app.services.job_service import WorkerPool, claim, complete, enqueue, job_pool
+from models import Job
+
+ran = []
+ran_lock = threading.Lock()
+
+
+def echo_job(context):
+    context.progress({"step": 1})
+    with ran_lock:
+        ran.append(context.id)
+    return context.payload
+
+
+def failing_job(context):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def handlers(monkeypatch):
+    """Register the test handlers and start each test with an empty run log."""
+    monkeypatch.setitem(job_service.JOB_HANDLERS, "test.echo", "app.tests.test_jobs:echo_job")
+    monkeypatch.setitem(job_service.JOB_HANDLERS, "test.fail", "app.tests.test_jobs:failing_job")
+    ran.clear()
+
+
+@pytest.fixture
+def db(client):
+    """Session on the test schema created by the client fixture."""
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def add_jobs(db, *jobs):
+    """Enqueue ``(kind, options)`` pairs and commit; returns the job ids."""
+    created = [enqueue(db, kind, {"n": index}, **options) for index, (kind, options) in enumerate(jobs)]
+    db.commit()
+    return [job.id for job in created]
+
+
+class TestJobQueue:
+    """Test cases for claiming, leasing and retrying jobs."""
+
+    def test_claim_order(self, db):
+        """Test that jobs are claimed by priority, then age, and not before they are due."""
+        low, normal, high, _ = add_jobs(
+            db, ("test.echo", {"priority": -10}), ("test.echo", {}), ("test.echo", {"priority": 10}),
+            ("test.echo", {"priority": 20, "delay": 3600}),
+        )
+        claimed = [claim(db, "w1").id for _ in range(3)]
+        assert claimed == [high, normal, low]
+        assert claim(db, "w1") is None
+
+    def test_success_records_progress_and_result(self, db):
+        """Test that a run stores the handler's progress and return value."""
+        (job_id,) = add_jobs(db, ("test.echo", {}))
+        assert job_pool.run_once() == job_id
+        job = db.get(Job, job_id)
+        assert (job.status, job.attempts, job.progress, job.result) == ("succeeded", 1, {"step": 1}, {"n": 0})
+        assert job.locked_by is None and job.finished_at is not None
+
+    def test_retries_with_backoff_then_fails(self, db, monkeypatch):
+        """Test that a failing job is retried after a delay and fails for good after max_attempts."""
+        monkeypatch.setattr(job_service, "JOB_RETRY_BASE", 60)
+        (job_id,) = add_jobs(db, ("test.fail", {"max_attempts": 2}))
+        assert job_pool.run_once() == job_id
+        job = db.get(Job, job_id)
+        assert (job.status, job.attempts, job.error) == ("queued", 1, "RuntimeError: boom")
+        assert job.run_at > datetime.now() + timedelta(seconds=20)
+        assert job_pool.run_once() is None  # not due yet
+
+        job.run_at = datetime.now()
+        db.commit()
+        assert job_pool.run_once() == job_id
+        db.refresh(job)
+        assert (job.status, job.attempts) == ("failed", 2)
+
+    def test_expired_lease_is_reclaimed_and_fenced(self, db):
+        """Test that a dead worker's job goes to another worker and the old lease can no longer finish it."""
+        (job_id,) = add_jobs(db, ("test.echo", {}))
+        stale = claim(db, "dead-worker", lease=0.01)
+        time.sleep(0.02)
+        fresh = claim(db, "live-worker")
+        assert fresh.id == stale.id == job_id and fresh.attempts == 2
+
+        assert not complete(db, stale, "dead-worker", {"from": "dead"})
+        assert complete(db, fresh, "live-worker", {"from": "live"})
+        db.expire_all()
+        assert db.get(Job, job_id).result == {"from": "live"}
+
+    def test_expired_lease_out_of_attempts_fails(self, db):
+        """Test that a job whose last attempt's lease expires is failed rather than retried."""
+        (job_id,) = add_jobs(db, ("test.echo", {"max_attempts": 1}))
+        claim(db, "dead-worker", lease=0.01)
+        time.sleep(0.02)
+        assert claim(db, "live-worker") is None
+        job = db.get(Job, job_id)
+        assert (job.status, job.error) == ("failed", "Lease expired")
+
+    def test_worker_threads_run_each_job_once(self, db):
+        """Test that concurrent workers share the queue without running a job twice."""
+        job_ids = add_jobs(db, *[("test.echo", {}) for _ in range(20)])
+        pool = WorkerPool(size=4, poll_interval=0.01)
+        pool.start()
+        deadline = time.monotonic() + 20
+        while len(ran) < len(job_ids) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        pool.stop()
+        assert sorted(ran) == job_ids
+        assert pool.stats()["succeeded"] == len(job_ids)
+
+    def test_worker_logs_errors_and_keeps_polling(self, db, monkeypatch, caplog):
+        """Test that an error outside a handler is logged and the worker carries on."""
+        calls = []
+
+        def broken_claim(db, worker_id, lease):
+            calls.append(worker_id)
+            raise RuntimeError("claim is broken")
+
+        monkeypatch.setattr(job_service, "claim", broken_claim)
+        pool = WorkerPool(size=1, poll_interval=0.01)
+        with caplog.at_level("WARNING", logger=job_service.__name__):
+            pool.start()
+            deadline = time.monotonic() + 5
+            while len(calls) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            pool.stop()
+        assert len(calls) >= 2
+        errors = [record for record in caplog.records if record.levelname == "ERROR"]
+        assert errors and "claim is broken" in errors[0].exc_text
+
+    def test_unknown_kind(self, db):
+        """Test that only registered job kinds can be queued."""
+        with pytest.raises(ValueError):
+            enqueue(db, "nope")
+
+
+class TestJobRouter:
+    """Test cases for GET /jobs/{id}."""
+
+    def test_only_owner_sees_job(self, client, auth_headers, db):
+        """Test that a job is visible to the user it belongs to and 404 for anyone else."""
+        mine, theirs = add_jobs(db, ("test.echo", {"user_id": 1}), ("test.echo", {"user_id": 2}))
+        response = client.get(f"/jobs/{mine}", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["status"] == "queued" and response.json()["kind"] == "test.echo"
+
+        client.post("/users/", json={
+            "username": "dev", "email": "dev@example.com", "role": "developer", "password": "password123"
+        })
+        token = client.post("/users/login", json={"email": "dev@example.com", "password": "password123"}).json()
+        other = {"Authorization": f"Bearer {token['access_token']}"}
+        assert client.get(f"/jobs/{mine}", headers=other).status_code == 404
+        assert client.get("/jobs/999", headers=auth_headers).status_code == 404
+        assert client.get(f"/jobs/{theirs}").status_code == 401
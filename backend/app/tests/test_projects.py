@@ -0,0 +1,324 @@
+import pytest
+
+
+class TestProjectRouter:
+    """Test cases for Project router endpoints (sync and async DB modes)."""
+
+    def test_project_crud(self, client):
+        """Test creating, reading, updating and deleting a project."""
+        response = client.post("/projects/", json={"name": "Apollo", "description": "Moonshot"})
+        assert response.status_code == 200
+        project = response.json()
+        assert project["name"] == "Apollo"
+        assert project["owner_id"] == 1
+
+        response = client.get(f"/projects/{project['id']}")
+        assert response.status_code == 200
+        assert response.json()["description"] == "Moonshot"
+
+        response = client.put(f"/projects/{project['id']}", json={"name": "Artemis"})
+        assert response.status_code == 200
+        assert response.json()["name"] == "Artemis"
+
+        response = client.delete(f"/projects/{project['id']}")
+        assert response.status_code == 200
+        assert client.get(f"/projects/{project['id']}").status_code == 404
+
+    def test_list_projects(self, client):
+        """Test listing all projects."""
+        client.post("/projects/", json={"name": "One"})
+        client.post("/projects/", json={"name": "Two"})
+        response = client.get("/projects/")
+        assert response.status_code == 200
+        assert [p["name"] for p in response.json()] == ["One", "Two"]
+
+    def test_missing_project(self, client):
+        """Test 404s for unknown projects."""
+        assert client.get("/projects/999").status_code == 404
+        assert client.put("/projects/999", json={"name": "x"}).status_code == 404
+        assert client.delete("/projects/999").status_code == 404
+
+
+class TestProjectDetail:
+    """Test cases for GET /projects/{id}?include=."""
+
+    def add_member(self, project_id, user_id):
+        from app.database import SessionLocal
+        from models import ProjectMember, User, UserRole
+        db = SessionLocal()
+        try:
+            db.add(User(id=user_id, username=f"member{user_id}", email=f"member{user_id}@example.com",
+                        password="x", role=UserRole.developer))
+            db.add(ProjectMember(project_id=project_id, user_id=user_id))
+            db.commit()
+        finally:
+            db.close()
+
+    def detail_queries(self, client, statements, project_id):
+        statements.clear()
+        response = client.get(f"/projects/{project_id}", params={"include": "tasks,members"})
+        assert response.status_code == 200
+        return response.json(), len([s for s in statements if s.lstrip().startswith("SELECT")])
+
+    def test_plain_detail_omits_relationships(self, client):
+        """Test that relationships are only embedded when requested."""
+        project = client.post("/projects/", json={"name": "Plain"}).json()
+        body = client.get(f"/projects/{project['id']}").json()
+        assert "tasks" not in body
+        assert "members" not in body
+        assert body["name"] == "Plain"
+
+    def test_unknown_include_rejected(self, client):
+        """Test that an unknown include name returns 400."""
+        project = client.post("/projects/", json={"name": "Plain"}).json()
+        response = client.get(f"/projects/{project['id']}", params={"include": "tasks,owner"})
+        assert response.status_code == 400
+
+    def test_include_query_count_is_constant(self, client, auth_headers, statements):
+        """Test that embedding tasks and members costs the same queries for 1 or 20 tasks."""
+        project_id = client.post("/projects/", json={"name": "Eager"}).json()["id"]
+        task = {"title": "T", "description": "d", "status": "todo", "project_id": project_id}
+        client.post("/tasks/", json=task, headers=auth_headers)
+        self.add_member(project_id, 2)
+
+        body, small = self.detail_queries(client, statements, project_id)
+        assert len(body["tasks"]) == 1
+        assert body["members"][0]["user"]["username"] == "member2"
+
+        for _ in range(19):
+            client.post("/tasks/", json=task, headers=auth_headers)
+        for user_id in range(3, 8):
+            self.add_member(project_id, user_id)
+
+        body, large = self.detail_queries(client, statements, project_id)
+        assert len(body["tasks"]) == 20
+        assert len(body["members"]) == 6
+        # project + counters + tasks + members + users, plus the ETag validator query
+        assert large == small <= 6
+
+    def test_member_rename_changes_etag(self, client):
+        """Test that a member editing their own user row invalidates the detail that embeds them."""
+        from app.database import SessionLocal
+        from models import User
+        project_id = client.post("/projects/", json={"name": "Team"}).json()["id"]
+        self.add_member(project_id, 2)
+        params = {"include": "members"}
+        first = client.get(f"/projects/{project_id}", params=params)
+        etag = first.headers["ETag"]
+        assert client.get(f"/projects/{project_id}", params=params, headers={"If-None-Match": etag}).status_code == 304
+
+        db = SessionLocal()
+        try:
+            db.get(User, 2).username = "renamed"
+            db.commit()
+        finally:
+            db.close()
+        response = client.get(f"/projects/{project_id}", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["members"][0]["user"]["username"] == "renamed"
+
+
+class TestResponseCache:
+    """Test cases for the project and user list response cache."""
+
+    def test_repeat_list_served_from_cache(self, client, statements):
+        """Test that an unchanged listing is answered without touching the database."""
+        from app.utils.response_cache import response_cache
+        client.post("/projects/", json={"name": "Cached"})
+        first = client.get("/projects/")
+        statements.clear()
+        hits = response_cache.hits
+        second = client.get("/projects/")
+        assert second.json() == first.json()
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert statements == []
+        assert response_cache.hits - hits == 1
+
+        response = client.get("/projects/", headers={"If-None-Match": first.headers["ETag"]})
+        assert response.status_code == 304
+
+    def test_project_writes_invalidate(self, client, auth_headers):
+        """Test that create, update, delete and task writes refresh the cached listing."""
+        project = client.post("/projects/", json={"name": "One"}).json()
+        assert [p["name"] for p in client.get("/projects/").json()] == ["One"]
+
+        client.put(f"/projects/{project['id']}", json={"name": "Renamed"})
+        assert [p["name"] for p in client.get("/projects/").json()] == ["Renamed"]
+
+        client.post("/tasks/", json={
+            "title": "T", "description": "d", "status": "todo", "project_id": project["id"]
+        }, headers=auth_headers)
+        assert client.get("/projects/").json()[0]["task_count"] == 1
+
+        client.delete(f"/projects/{project['id']}")
+        assert client.get("/projects/").json() == []
+
+    def test_register_invalidates_users(self, client):
+        """Test that registering a user refreshes the cached user list."""
+        assert client.get("/users/").json() == []
+        client.post("/users/", json={
+            "username": "new", "email": "new@example.com", "role": "user", "password": "password123"
+        })
+        assert [u["username"] for u in client.get("/users/").json()] == ["new"]
+
+    def test_shared_backend_invalidation(self):
+        """Test that a bump from one worker's cache hides entries from another's."""
+        from starlette.requests import Request
+        from fastapi import Response
+        from app.utils.response_cache import MemoryBackend, ResponseCache
+        backend = MemoryBackend(maxsize=10, ttl=60)
+        worker_a, worker_b = ResponseCache(backend), ResponseCache(backend)
+        request = Request({"type": "http", "method": "GET", "path": "/projects/", "query_string": b"", "headers": []})
+
+        worker_a.set(worker_a.key("projects", request), Response(b"[]", media_type="application/json"))
+        assert worker_b.get(worker_b.key("projects", request), request).body == b"[]"
+        worker_b.invalidate("projects")
+        assert worker_a.get(worker_a.key("projects", request), request) is None
+
+    def test_metrics_report_hit_ratio_and_memory(self, client):
+        """Test that cache stats are exposed on /metrics."""
+        client.get("/projects/")
+        client.get("/projects/")
+        stats = client.get("/metrics/").json()["response_cache"]
+        assert stats["backend"] == "memory"
+        assert stats["hits"] >= 1
+        assert 0 < stats["hit_ratio"] <= 1
+        assert stats["memory_bytes"] > 0
+
+
+class TestSoftDelete:
+    """Test cases for project soft delete and the chunked purge."""
+
+    def soft_delete(self, project_id):
+        from app.database import SessionLocal
+        from app.services import project_service
+        db = SessionLocal()
+        try:
+            assert project_service.delete_project(db, project_id)
+        finally:
+            db.close()
+
+    def seed(self, client, auth_headers, tasks=5):
+        from app.database import SessionLocal
+        from app.tests.test_tasks import make_task
+        from models import ProjectMember
+        project_id = client.post("/projects/", json={"name": "Doomed"}).json()["id"]
+        task_ids = [make_task(client, auth_headers, project_id)["id"] for _ in range(tasks)]
+        for task_id in task_ids[:3]:
+            client.post("/comments/", json={"comment": "bye", "task_id": task_id, "user_id": 1})
+        db = SessionLocal()
+        db.add(ProjectMember(project_id=project_id, user_id=1))
+        db.commit()
+        db.close()
+        return project_id, task_ids
+
+    def test_deleted_project_is_hidden(self, client, auth_headers):
+        """Test that a soft-deleted project and its tasks vanish from reads before the purge."""
+        project_id, task_ids = self.seed(client, auth_headers)
+        self.soft_delete(project_id)
+
+        assert client.get(f"/projects/{project_id}").status_code == 404
+        assert client.get("/projects/").json() == []
+        assert client.get("/tasks/", headers=auth_headers).json() == []
+        assert client.get("/tasks/", params={"project_id": project_id}, headers=auth_headers).json() == []
+        assert client.get(f"/tasks/{task_ids[0]}", headers=auth_headers).status_code == 404
+        assert client.get("/tasks/stats", headers=auth_headers).json()["total"] == 0
+        assert client.get("/sync/", headers=auth_headers).json()["project_ids"] == []
+        assert client.get("/search/", params={"q": "task"}, headers=auth_headers).json() == []
+        assert client.get("/export/tasks", headers=auth_headers).content == b""
+        assert client.post("/tasks/", json={
+            "title": "T", "description": "d", "status": "todo", "project_id": project_id
+        }, headers=auth_headers).status_code == 404
+
+        status = client.get(f"/projects/{project_id}/purge").json()
+        assert status["remaining"] == {"comments": 3, "tasks": 5, "members": 1}
+
+    def test_deleted_project_comments_hidden(self, client, auth_headers):
+        """Test that comments of a soft-deleted project's tasks can be neither read nor added."""
+        project_id, task_ids = self.seed(client, auth_headers)
+        assert len(client.get(f"/comments/task/{task_ids[0]}").json()) == 1
+        self.soft_delete(project_id)
+
+        assert client.get(f"/comments/task/{task_ids[0]}").status_code == 404
+        response = client.post("/comments/", json={"comment": "late", "task_id": task_ids[0], "user_id": 1})
+        assert response.status_code == 404
+        status = client.get(f"/projects/{project_id}/purge").json()
+        assert status["remaining"]["comments"] == 3
+
+    def test_purge_in_chunks(self, client, auth_headers, statements):
+        """Test that the purge deletes by primary key in bounded chunks and reports progress."""
+        from app.database import SessionLocal
+        from app.services import project_service
+        from app.tests.test_tasks import make_task
+        from models import Project, Task, TaskComment
+        project_id, _ = self.seed(client, auth_headers)
+        kept = client.post("/projects/", json={"name": "Kept"}).json()["id"]
+        kept_task = make_task(client, auth_headers, kept)
+        self.soft_delete(project_id)
+
+        reports = []
+        statements.clear()
+        db = SessionLocal()
+        counts = project_service.purge_project(db, project_id, chunk_size=2, progress=lambda c: reports.append(dict(c)))
+        assert counts == {"comments": 3, "tasks": 5, "members": 1}
+        assert [report["tasks"] for report in reports if report["comments"] == 3] == [0, 2, 4, 5, 5]
+        deletes = [s for s in statements if s.startswith("DELETE FROM tasks")]
+        assert len(deletes) == 3 and all("tasks.id IN" in s for s in deletes)
+
+        assert db.query(Project).execution_options(include_deleted=True).filter(Project.id == project_id).count() == 0
+        assert db.query(Task).filter(Task.project_id == project_id).count() == 0
+        assert db.query(TaskComment).count() == 0
+        assert project_service.purge_project(db, project_id) is None
+        db.close()
+        assert client.get(f"/tasks/{kept_task['id']}", headers=auth_headers).status_code == 200
+        assert client.get(f"/projects/{project_id}/purge").status_code == 404
+
+    def test_delete_endpoint_queues_purge_job(self, client, auth_headers):
+        """Test that DELETE returns at once and the queued purge job removes every row."""
+        from app.database import SessionLocal
+        from app.services.job_service import job_pool
+        from models import Project, Task
+        project_id, _ = self.seed(client, auth_headers)
+        response = client.delete(f"/projects/{project_id}")
+        assert response.status_code == 200
+        job_id = response.json()["job_id"]
+        assert client.get(f"/jobs/{job_id}", headers=auth_headers).json()["status"] == "queued"
+
+        assert job_pool.run_once() == job_id
+        job = client.get(f"/jobs/{job_id}", headers=auth_headers).json()
+        assert job["status"] == "succeeded" and job["attempts"] == 1
+        assert job["result"] == job["progress"] == {"comments": 3, "tasks": 5, "members": 1}
+        db = SessionLocal()
+        assert db.query(Project).execution_options(include_deleted=True).count() == 0
+        assert db.query(Task).count() == 0
+        db.close()
+
+    def test_delete_is_a_tombstone(self, client, auth_headers, monkeypatch):
+        """Test that a soft delete is logged as a project tombstone for sync."""
+        from app.database import SessionLocal
+        from app.services import sync_service
+        from models import ChangeLog
+        monkeypatch.setattr(sync_service, "SYNC_SETTLE_SECONDS", 0)
+        project_id = client.post("/projects/", json={"name": "Brief"}).json()["id"]
+        self.soft_delete(project_id)
+        db = SessionLocal()
+        last = db.query(ChangeLog).order_by(ChangeLog.seq.desc()).first()
+        db.close()
+        assert (last.entity, last.entity_id, last.deleted) == ("project", project_id, True)
+
+    def test_name_reusable_before_purge(self, client, auth_headers):
+        """Test that a deleted project's name is free at once and duplicate live names are a 409."""
+        from app.services.job_service import job_pool
+        first = client.post("/projects/", json={"name": "Alpha"}).json()["id"]
+        assert client.delete(f"/projects/{first}").status_code == 200
+        again = client.post("/projects/", json={"name": "Alpha"})
+        assert again.status_code == 200
+
+        duplicate = client.post("/projects/", json={"name": "Alpha"})
+        assert duplicate.status_code == 409 and "Alpha" in duplicate.json()["detail"]
+        other = client.post("/projects/", json={"name": "Beta"}).json()["id"]
+        assert client.put(f"/projects/{other}", json={"name": "Alpha"}).status_code == 409
+        assert client.get(f"/projects/{other}").json()["name"] == "Beta"
+
+        job_pool.run_once()
+        assert [p["name"] for p in client.get("/projects/").json()] == ["Alpha", "Beta"]
@@ -0,0 +1,86 @@
+from app.tests.test_tasks import make_task
+
+
+def search(client, headers, q, **params):
+    response = client.get("/search/", params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+class TestSearch:
+    """Test cases for GET /search/ (FTS5 on SQLite)."""
+
+    def test_ranks_title_over_description_over_comments(self, client, auth_headers, project_id):
+        """Test that matches in titles outrank descriptions, which outrank comments."""
+        in_comment = make_task(client, auth_headers, project_id, title="Refactor", description="Cleanup")
+        in_description = make_task(client, auth_headers, project_id, title="Audit", description="Check the invoice totals")
+        in_title = make_task(client, auth_headers, project_id, title="Invoice export", description="CSV")
+        make_task(client, auth_headers, project_id, title="Unrelated", description="Nothing here")
+        client.post("/comments/", json={"comment": "Invoices render wrong", "task_id": in_comment["id"], "user_id": 1})
+
+        hits = search(client, auth_headers, "invoice").json()
+        assert [hit["id"] for hit in hits] == [in_title["id"], in_description["id"], in_comment["id"]]
+        assert hits[0]["score"] > hits[1]["score"] > hits[2]["score"]
+        assert hits[0]["snippet"] == "[Invoice] export"
+        assert "[Invoices]" in hits[2]["snippet"]
+        assert set(hits[0]) == set(client.get("/tasks/", headers=auth_headers).json()[0]) | {"score", "snippet"}
+
+    def test_all_terms_required_last_as_prefix(self, client, auth_headers, project_id):
+        """Test that every word must match and the last word matches as a prefix."""
+        login = make_task(client, auth_headers, project_id, title="Login page crashes")
+        make_task(client, auth_headers, project_id, title="Login copy")
+        assert [hit["id"] for hit in search(client, auth_headers, "login cras").json()] == [login["id"]]
+        assert search(client, auth_headers, '"(*) -').json() == []
+        assert client.get("/search/", headers=auth_headers).status_code == 422
+
+    def test_scoped_to_owned_projects(self, client, auth_headers, project_id):
+        """Test that results can be narrowed to a project and never include other owners' tasks."""
+        from app.database import SessionLocal
+        from models import Project, Task
+        other = client.post("/projects/", json={"name": "Other"}).json()["id"]
+        make_task(client, auth_headers, project_id, title="Deploy api")
+        make_task(client, auth_headers, other, title="Deploy web")
+        db = SessionLocal()
+        try:
+            foreign = Project(name="Foreign", owner_id=2)
+            db.add(foreign)
+            db.flush()
+            db.add(Task(title="Deploy secret", description="x", status="todo", project_id=foreign.id))
+            db.commit()
+        finally:
+            db.close()
+
+        assert len(search(client, auth_headers, "deploy").json()) == 2
+        assert [hit["title"] for hit in search(client, auth_headers, "deploy", project_id=other).json()] == ["Deploy web"]
+
+    def test_cursor_pagination(self, client, auth_headers, project_id):
+        """Test that pages follow the X-Next-Cursor header without repeats."""
+        client.post("/tasks/bulk", json=[
+            {"title": f"Report {i}", "description": "report " * (i + 1), "status": "todo", "project_id": project_id}
+            for i in range(5)
+        ], headers=auth_headers)
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = search(client, auth_headers, "report", **params)
+            seen += [hit["id"] for hit in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert len(seen) == len(set(seen)) == 5
+        assert seen == [hit["id"] for hit in search(client, auth_headers, "report", limit=10).json()]
+
+    def test_index_follows_writes(self, client, auth_headers, project_id):
+        """Test that updates, comments and deletes are reflected immediately."""
+        task = make_task(client, auth_headers, project_id, title="Draft roadmap")
+        client.put(f"/tasks/{task['id']}", json={
+            "title": "Final roadmap", "description": "Details", "status": "todo", "project_id": project_id
+        }, headers=auth_headers)
+        assert search(client, auth_headers, "draft").json() == []
+        assert len(search(client, auth_headers, "final").json()) == 1
+
+        client.post("/comments/", json={"comment": "Needs budget sign-off", "task_id": task["id"], "user_id": 1})
+        assert [hit["id"] for hit in search(client, auth_headers, "budget").json()] == [task["id"]]
+
+        client.delete(f"/tasks/{task['id']}", headers=auth_headers)
+        assert search(client, auth_headers, "roadmap").json() == []
@@ -0,0 +1,143 @@
+import pytest
+from sqlalchemy import func, select
+from app.database import SessionLocal
+from app.services import sync_service
+from app.tests.test_tasks import make_task
+from models import ChangeLog, Project, Task
+
+
+@pytest.fixture(autouse=True)
+def settled(monkeypatch):
+    """Let the cursor pass changes as soon as they are written."""
+    monkeypatch.setattr(sync_service, "SYNC_SETTLE_SECONDS", 0)
+
+
+def sync(client, headers, since=0, **params):
+    response = client.get("/sync/", params={"since": since, **params}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def ids(items):
+    return [item["id"] for item in items]
+
+
+class TestDeltaSync:
+    """Test cases for GET /sync/ over the change log."""
+
+    def test_initial_sync(self, client, auth_headers, project_id):
+        """Test that since=0 returns every project, task and comment with a cursor."""
+        task = make_task(client, auth_headers, project_id)
+        client.post("/comments/", json={"comment": "First", "task_id": task["id"], "user_id": 1})
+        body = sync(client, auth_headers)
+        assert ids(body["projects"]) == [project_id]
+        assert ids(body["tasks"]) == [task["id"]]
+        assert [comment["comment"] for comment in body["comments"]] == ["First"]
+        assert body["project_ids"] == [project_id]
+        assert body["deleted"] == {"tasks": [], "projects": [], "comments": []}
+        assert body["cursor"] > 0 and body["has_more"] is False
+
+    def test_only_changes_after_cursor(self, client, auth_headers, project_id):
+        """Test that a delta holds just the rows written since the cursor, updates collapsed."""
+        first, second = (make_task(client, auth_headers, project_id, title=title) for title in ("A", "B"))
+        cursor = sync(client, auth_headers)["cursor"]
+        for title in ("B1", "B2"):
+            client.put(f"/tasks/{second['id']}", json={
+                "title": title, "description": "d", "status": "todo", "project_id": project_id
+            }, headers=auth_headers)
+        body = sync(client, auth_headers, cursor)
+        assert [task["title"] for task in body["tasks"]] == ["B2"]
+        assert body["projects"] == [] and body["comments"] == []
+        assert body["cursor"] > cursor
+
+        unchanged = sync(client, auth_headers, body["cursor"])
+        assert unchanged["tasks"] == [] and unchanged["cursor"] == body["cursor"]
+        assert first["id"] not in ids(body["tasks"])
+
+    def test_deletes_are_tombstones(self, client, auth_headers, project_id):
+        """Test that deleted rows come back as ids, including a row created and deleted in the window."""
+        kept = make_task(client, auth_headers, project_id)
+        cursor = sync(client, auth_headers)["cursor"]
+        gone = make_task(client, auth_headers, project_id)
+        client.delete(f"/tasks/{gone['id']}", headers=auth_headers)
+        client.delete(f"/tasks/{kept['id']}", headers=auth_headers)
+        body = sync(client, auth_headers, cursor)
+        assert body["tasks"] == []
+        assert body["deleted"]["tasks"] == sorted([kept["id"], gone["id"]])
+
+    def test_pages_with_limit(self, client, auth_headers, project_id):
+        """Test that has_more pages through the log and the pages add up to every change."""
+        created = [make_task(client, auth_headers, project_id, title=f"T{i}")["id"] for i in range(5)]
+        seen, cursor, calls = [], 0, 0
+        while True:
+            body = sync(client, auth_headers, cursor, limit=2)
+            seen += ids(body["tasks"])
+            cursor, calls = body["cursor"], calls + 1
+            if not body["has_more"]:
+                break
+        assert sorted(seen) == created
+        assert calls == 3  # project + 5 tasks = 6 log rows
+
+    def test_settle_window_holds_cursor(self, client, auth_headers, project_id, monkeypatch):
+        """Test that fresh changes are returned without the cursor moving past them."""
+        cursor = sync(client, auth_headers)["cursor"]
+        monkeypatch.setattr(sync_service, "SYNC_SETTLE_SECONDS", 60)
+        task = make_task(client, auth_headers, project_id)
+        body = sync(client, auth_headers, cursor)
+        assert ids(body["tasks"]) == [task["id"]]
+        assert body["cursor"] == cursor and body["has_more"] is False
+
+    def test_scoped_to_visible_projects(self, client, auth_headers, project_id):
+        """Test that other users' changes are never returned and their projects are 404."""
+        db = SessionLocal()
+        other = Project(name="Private", owner_id=2)
+        db.add(other)
+        db.flush()
+        db.add(Task(title="Hidden", status="todo", project_id=other.id))
+        db.commit()
+        other_id = other.id
+        db.close()
+
+        body = sync(client, auth_headers)
+        assert body["project_ids"] == [project_id]
+        assert ids(body["projects"]) == [project_id] and body["tasks"] == []
+        assert client.get("/sync/", params={"project_id": other_id}, headers=auth_headers).status_code == 404
+        assert sync(client, auth_headers, project_id=project_id)["project_ids"] == [project_id]
+
+    def test_rolled_back_writes_are_not_logged(self, client, project_id):
+        """Test that the log commits and rolls back with the change it records."""
+        db = SessionLocal()
+        before = db.scalar(select(func.count()).select_from(ChangeLog))
+        db.add(Task(title="Draft", status="todo", project_id=project_id))
+        db.flush()
+        db.rollback()
+        assert db.scalar(select(func.count()).select_from(ChangeLog)) == before
+        db.close()
+
+    def test_compaction_keeps_sync_result(self, client, auth_headers, project_id):
+        """Test that dropping superseded log rows leaves the delta unchanged."""
+        task = make_task(client, auth_headers, project_id)
+        for status in ("in_progress", "done"):
+            client.put(f"/tasks/{task['id']}", json={
+                "title": "T", "description": "d", "status": status, "project_id": project_id
+            }, headers=auth_headers)
+        before = sync(client, auth_headers)
+        db = SessionLocal()
+        assert sync_service.compact_changes(db) == 2
+        db.close()
+        after = sync(client, auth_headers)
+        assert after["tasks"] == before["tasks"] and after["cursor"] == before["cursor"]
+
+    def test_log_read_uses_index(self, client, project_id):
+        """Test that the delta query is a range search on ix_change_log_project_seq."""
+        db = SessionLocal()
+        log = ChangeLog
+        query = select(log.seq).where(log.project_id.in_([project_id]), log.seq > 0).order_by(log.seq)
+        compiled = query.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+        plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+        db.close()
+        assert any("ix_change_log_project_seq" in row[-1] for row in plan)
+
+    def test_requires_auth(self, client, project_id):
+        """Test that sync is only available to authenticated users."""
+        assert client.get("/sync/").status_code == 401
@@ -0,0 +1,707 @@
+from datetime import datetime
+import pytest
+
+
+def make_task(client, headers, project_id, **overrides):
+    payload = {
+        "title": "Task",
+        "description": "Details",
+        "status": "todo",
+        "project_id": project_id,
+    }
+    payload.update(overrides)
+    response = client.post("/tasks/", json=payload, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestTaskRouter:
+    """Test cases for Task router endpoints (sync and async DB modes)."""
+
+    def test_create_and_get_task(self, client, auth_headers, project_id):
+        """Test creating a task and reading it back."""
+        task = make_task(client, auth_headers, project_id, due_date="2030-01-31")
+        assert task["project_id"] == project_id
+        assert task["due_date"].startswith("2030-01-31")
+        assert task["created_at"] is not None
+
+        response = client.get(f"/tasks/{task['id']}", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["title"] == "Task"
+
+    def test_create_task_requires_owned_project(self, client, auth_headers):
+        """Test that tasks cannot be created in unknown projects."""
+        response = client.post("/tasks/", json={
+            "title": "x", "description": "y", "status": "todo", "project_id": 42
+        }, headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_list_tasks(self, client, auth_headers, project_id):
+        """Test listing tasks for the user's projects."""
+        make_task(client, auth_headers, project_id, title="A")
+        make_task(client, auth_headers, project_id, title="B")
+        response = client.get("/tasks/", headers=auth_headers)
+        assert response.status_code == 200
+        assert sorted(t["title"] for t in response.json()) == ["A", "B"]
+
+    def test_list_tasks_of_anothers_project(self, client, auth_headers, stranger_headers, project_id):
+        """Test that filtering by someone else's project returns none of its tasks."""
+        make_task(client, auth_headers, project_id, title="Secret")
+        response = client.get("/tasks/", params={"project_id": project_id}, headers=stranger_headers)
+        assert response.status_code == 200 and response.json() == []
+        owner = client.get("/tasks/", params={"project_id": project_id}, headers=auth_headers)
+        assert [t["title"] for t in owner.json()] == ["Secret"]
+        # The ETag is computed over the same owner-scoped rows
+        assert response.headers["etag"] != owner.headers["etag"]
+
+    def test_update_assign_delete(self, client, auth_headers, project_id):
+        """Test updating, assigning and deleting a task."""
+        task = make_task(client, auth_headers, project_id)
+        response = client.put(f"/tasks/{task['id']}", json={
+            "title": "Renamed", "description": "New", "status": "in_progress", "project_id": project_id
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["status"] == "in_progress"
+
+        response = client.post(f"/tasks/{task['id']}/assign", json={"assignee_id": 1}, headers=auth_headers)
+        assert response.json()["assignee_id"] == 1
+
+        assert client.delete(f"/tasks/{task['id']}", headers=auth_headers).status_code == 200
+        assert client.get(f"/tasks/{task['id']}", headers=auth_headers).status_code == 404
+
+    def test_requires_authentication(self, client):
+        """Test that task endpoints reject anonymous requests."""
+        assert client.get("/tasks/").status_code == 401
+
+
+class TestCommentRouter:
+    """Test cases for Comment router endpoints (sync and async DB modes)."""
+
+    def test_add_and_list_comments(self, client, auth_headers, project_id):
+        """Test adding comments and listing them for a task."""
+        task = make_task(client, auth_headers, project_id)
+        for text in ("First", "Second"):
+            response = client.post("/comments/", json={"comment": text, "task_id": task["id"], "user_id": 1})
+            assert response.status_code == 201
+            assert response.json()["comment"] == text
+
+        response = client.get(f"/comments/task/{task['id']}")
+        assert response.status_code == 200
+        assert [c["comment"] for c in response.json()] == ["First", "Second"]
+        assert response.json()[0]["timestamp"] is not None
+
+
+class TestKeysetPagination:
+    """Test cases for cursor pagination on list endpoints."""
+
+    def test_tasks_paginate_without_gaps(self, client, auth_headers, project_id, statements):
+        """Test that walking every page returns each task exactly once without OFFSET."""
+        created = [make_task(client, auth_headers, project_id, title=f"T{i}")["id"] for i in range(7)]
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/tasks/", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            assert len(response.json()) <= 3
+            seen += [t["id"] for t in response.json()]
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert seen == created
+        assert pages == 3
+        # Later pages seek past the cursor instead of skipping rows
+        assert any("tasks.created_at > ?" in s for s in statements)
+
+    def test_page_size_is_capped(self, client, auth_headers):
+        """Test that limits above the maximum are rejected."""
+        response = client.get("/tasks/", params={"limit": 100000}, headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_invalid_cursor(self, client, auth_headers):
+        """Test that a malformed cursor is a 400, not a 500."""
+        response = client.get("/tasks/", params={"cursor": "garbage"}, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_comments_users_projects_paginate(self, client, auth_headers, project_id):
+        """Test that the other list endpoints expose a next cursor."""
+        task = make_task(client, auth_headers, project_id)
+        for text in ("a", "b"):
+            client.post("/comments/", json={"comment": text, "task_id": task["id"], "user_id": 1})
+        client.post("/projects/", json={"name": "Second"})
+        client.post("/users/", json={
+            "username": "other", "email": "other@example.com", "role": "user", "password": "password123"
+        })
+
+        for url in (f"/comments/task/{task['id']}", "/projects/", "/users/"):
+            first = client.get(url, params={"limit": 1}, headers=auth_headers)
+            assert len(first.json()) == 1
+            cursor = first.headers["X-Next-Cursor"]
+            second = client.get(url, params={"limit": 1, "cursor": cursor}, headers=auth_headers)
+            assert len(second.json()) == 1
+            assert second.json()[0]["id"] != first.json()[0]["id"]
+            assert "X-Next-Cursor" not in second.headers
+
+
+class TestTaskFilters:
+    """Test cases for server-side filtering and sorting of GET /tasks/."""
+
+    @pytest.fixture
+    def tasks(self, client, auth_headers, project_id):
+        other = client.post("/users/", json={
+            "username": "dev", "email": "dev@example.com", "role": "developer", "password": "password123"
+        }).json()["id"]
+        return {
+            "a": make_task(client, auth_headers, project_id, title="a", status="todo", due_date="2030-01-10"),
+            "b": make_task(client, auth_headers, project_id, title="b", status="done", due_date="2030-01-05",
+                           assignee_id=other),
+            "c": make_task(client, auth_headers, project_id, title="c", status="in_progress"),
+            "d": make_task(client, auth_headers, project_id, title="d", status="done", due_date="2030-02-01"),
+            "assignee": other,
+        }
+
+    def titles(self, client, headers, **params):
+        response = client.get("/tasks/", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        return [t["title"] for t in response.json()]
+
+    def test_multi_value_status(self, client, auth_headers, tasks):
+        """Test filtering by several statuses at once."""
+        assert self.titles(client, auth_headers, status=["todo", "in_progress"]) == ["a", "c"]
+
+    def test_assignee_filter(self, client, auth_headers, tasks):
+        """Test filtering by assignee."""
+        assert self.titles(client, auth_headers, assignee_id=tasks["assignee"]) == ["b"]
+
+    def test_due_date_range_is_inclusive(self, client, auth_headers, tasks):
+        """Test that due date bounds include whole days."""
+        assert self.titles(client, auth_headers, due_from="2030-01-05", due_to="2030-01-10",
+                           sort="due_date") == ["b", "a"]
+
+    def test_created_range(self, client, auth_headers, tasks):
+        """Test filtering by creation date."""
+        assert self.titles(client, auth_headers, created_to="2000-01-01") == []
+        assert len(self.titles(client, auth_headers, created_from="2000-01-01")) == 4
+
+    def test_sort_due_date_nulls_last_across_pages(self, client, auth_headers, tasks):
+        """Test that due-date keyset pages keep NULL due dates last in both directions."""
+        for sort, expected in (("due_date", ["b", "a", "d", "c"]), ("-due_date", ["d", "a", "b", "c"])):
+            seen, cursor = [], None
+            while True:
+                params = {"sort": sort, "limit": 1}
+                if cursor:
+                    params["cursor"] = cursor
+                response = client.get("/tasks/", params=params, headers=auth_headers)
+                seen += [t["title"] for t in response.json()]
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+            assert seen == expected
+
+    def test_sort_title_desc(self, client, auth_headers, tasks):
+        """Test descending sort."""
+        assert self.titles(client, auth_headers, sort="-title") == ["d", "c", "b", "a"]
+
+    def test_cursor_bound_to_sort(self, client, auth_headers, tasks):
+        """Test that a cursor from one sort order is rejected for another."""
+        cursor = client.get("/tasks/", params={"limit": 1}, headers=auth_headers).headers["X-Next-Cursor"]
+        response = client.get("/tasks/", params={"limit": 1, "cursor": cursor, "sort": "title"}, headers=auth_headers)
+        assert response.status_code == 400
+
+
+class TestTaskStats:
+    """Test cases for the aggregate statistics endpoint."""
+
+    def test_stats_grouped_in_one_query(self, client, auth_headers, project_id, statements):
+        """Test counts by status, assignee and overdue flag."""
+        make_task(client, auth_headers, project_id, status="todo", due_date="2000-01-01", assignee_id=1)
+        make_task(client, auth_headers, project_id, status="done", due_date="2000-01-01")
+        make_task(client, auth_headers, project_id, status="todo", due_date="2999-01-01")
+        client.get("/users/me", headers=auth_headers)
+
+        statements.clear()
+        response = client.get("/tasks/stats", headers=auth_headers)
+        assert response.status_code == 200
+        assert len([s for s in statements if "FROM tasks" in s]) == 1
+
+        stats = response.json()
+        assert stats["total"] == 3
+        assert stats["overdue"] == 1
+        assert stats["by_status"] == {"todo": 2, "done": 1}
+        by_assignee = {row["assignee_id"]: row["count"] for row in stats["by_assignee"]}
+        assert by_assignee == {1: 1, None: 2}
+
+    def test_stats_per_project(self, client, auth_headers, project_id):
+        """Test scoping statistics to a single project."""
+        other = client.post("/projects/", json={"name": "Other"}).json()["id"]
+        make_task(client, auth_headers, project_id)
+        make_task(client, auth_headers, other)
+        make_task(client, auth_headers, other)
+        response = client.get("/tasks/stats", params={"project_id": other}, headers=auth_headers)
+        assert response.json()["total"] == 2
+
+    def test_stats_of_anothers_project(self, client, auth_headers, stranger_headers, project_id):
+        """Test that statistics never count tasks in projects the caller does not own."""
+        make_task(client, auth_headers, project_id)
+        response = client.get("/tasks/stats", params={"project_id": project_id}, headers=stranger_headers)
+        assert response.json() == {"total": 0, "overdue": 0, "by_status": {}, "by_assignee": []}
+
+    def test_stats_empty(self, client, auth_headers):
+        """Test statistics when there are no tasks."""
+        response = client.get("/tasks/stats", headers=auth_headers)
+        assert response.json() == {"total": 0, "overdue": 0, "by_status": {}, "by_assignee": []}
+
+
+class TestProjectTaskCounters:
+    """Test cases for the incrementally maintained project_task_counters table."""
+
+    def counters(self, project_id):
+        from app.database import SessionLocal
+        from models import ProjectTaskCounter
+        db = SessionLocal()
+        try:
+            rows = db.query(ProjectTaskCounter).filter(ProjectTaskCounter.project_id == project_id).all()
+            return {row.status: row.count for row in rows if row.count}
+        finally:
+            db.close()
+
+    def test_counters_follow_task_writes(self, client, auth_headers, project_id):
+        """Test that create, update and delete move counts between statuses."""
+        first = make_task(client, auth_headers, project_id, status="pending", due_date="2000-01-01")
+        make_task(client, auth_headers, project_id, status="pending")
+        assert self.counters(project_id) == {"pending": 2}
+
+        response = client.put(f"/tasks/{first['id']}", json={
+            "title": "First", "description": "d", "status": "completed",
+            "project_id": project_id, "due_date": "2000-01-01"
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        assert self.counters(project_id) == {"pending": 1, "completed": 1}
+
+        client.post(f"/tasks/{first['id']}/assign", json={"assignee_id": 1}, headers=auth_headers)
+        assert self.counters(project_id) == {"pending": 1, "completed": 1}
+
+        client.delete(f"/tasks/{first['id']}", headers=auth_headers)
+        assert self.counters(project_id) == {"pending": 1}
+
+    def test_task_overdue_without_a_write(self, client, auth_headers, project_id):
+        """Test that a task passing its due date untouched is counted as overdue and then updated and deleted cleanly."""
+        from app.database import SessionLocal
+        from models import Task
+        task = make_task(client, auth_headers, project_id, status="todo", due_date="2099-01-01")
+        db = SessionLocal()
+        try:
+            # The clock passes the due date: nothing writes the task through the API
+            db.query(Task).filter(Task.id == task["id"]).update({"due_date": datetime(2000, 1, 1)})
+            db.commit()
+        finally:
+            db.close()
+        stats = client.get("/tasks/stats", headers=auth_headers).json()
+        assert stats["overdue"] == 1
+
+        response = client.put(f"/tasks/{task['id']}", json={
+            "title": "Task", "description": "d", "status": "done", "project_id": project_id
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        assert self.counters(project_id) == {"done": 1}
+        stats = client.get("/tasks/stats", headers=auth_headers).json()
+        assert (stats["total"], stats["overdue"]) == (1, 0)
+
+        client.delete(f"/tasks/{task['id']}", headers=auth_headers)
+        assert self.counters(project_id) == {}
+        assert client.get("/tasks/stats", headers=auth_headers).json()["overdue"] == 0
+
+    def test_project_progress_from_counters(self, client, auth_headers, project_id, statements):
+        """Test that project responses carry task_count and progress without scanning tasks."""
+        make_task(client, auth_headers, project_id, status="completed")
+        make_task(client, auth_headers, project_id, status="pending")
+        make_task(client, auth_headers, project_id, status="pending")
+
+        statements.clear()
+        project = client.get(f"/projects/{project_id}").json()
+        assert project["task_count"] == 3
+        assert project["progress"] == 33.3
+        assert not [s for s in statements if "FROM tasks" in s]
+
+        listed = client.get("/projects/").json()
+        assert listed[0]["task_count"] == 3
+
+    def test_rebuild_repairs_drift(self, client, auth_headers, project_id):
+        """Test that the rebuild command recomputes counters from tasks."""
+        from app.database import SessionLocal
+        from app.services import counter_service
+        from models import ProjectTaskCounter
+        make_task(client, auth_headers, project_id, status="pending", due_date="2000-01-01")
+
+        db = SessionLocal()
+        try:
+            db.query(ProjectTaskCounter).update({"count": 42})
+            db.commit()
+            assert counter_service.rebuild_counters(db, project_id=project_id) == 1
+        finally:
+            db.close()
+        assert self.counters(project_id) == {"pending": 1}
+
+    def test_delete_project_removes_counters(self, client, auth_headers, project_id):
+        """Test that purging a deleted project deletes its counter rows with it."""
+        from app.services.job_service import job_pool
+        make_task(client, auth_headers, project_id)
+        assert client.delete(f"/projects/{project_id}").status_code == 200
+        job_pool.run_once()
+        assert self.counters(project_id) == {}
+
+
+class TestSparseFieldsets:
+    """Test cases for ?fields= on list endpoints."""
+
+    def test_fields_narrow_select_and_response(self, client, auth_headers, project_id, statements):
+        """Test that unrequested columns are neither selected nor returned."""
+        make_task(client, auth_headers, project_id, description="x" * 5000)
+        statements.clear()
+        response = client.get(
+            "/tasks/", params={"fields": "title,status,assignee_id,due_date"}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert set(response.json()[0]) == {"id", "title", "status", "assignee_id", "due_date"}
+        selects = [s for s in statements if "FROM tasks" in s]
+        assert selects and not [s for s in selects if "tasks.description" in s]
+
+    def test_fields_keep_pagination(self, client, auth_headers, project_id):
+        """Test that cursors still work when the sort column is not requested."""
+        for i in range(3):
+            make_task(client, auth_headers, project_id, title=f"T{i}")
+        params = {"fields": "title", "limit": 2, "sort": "-created_at"}
+        first = client.get("/tasks/", params=params, headers=auth_headers)
+        assert set(first.json()[0]) == {"id", "title"}
+        params["cursor"] = first.headers["X-Next-Cursor"]
+        second = client.get("/tasks/", params=params, headers=auth_headers)
+        assert [t["title"] for t in first.json() + second.json()] == ["T2", "T1", "T0"]
+
+    def test_unknown_field_rejected(self, client, auth_headers):
+        """Test that unknown field names return 400."""
+        response = client.get("/tasks/", params={"fields": "title,password"}, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_project_fields(self, client, statements):
+        """Test sparse project listings, with and without counter-backed fields."""
+        client.post("/projects/", json={"name": "Sparse", "description": "y" * 500})
+        statements.clear()
+        body = client.get("/projects/", params={"fields": "name"}).json()
+        assert body == [{"id": body[0]["id"], "name": "Sparse"}]
+        assert not [s for s in statements if "projects.description" in s]
+        assert not [s for s in statements if s.startswith("SELECT project_task_counters")]
+
+        body = client.get("/projects/", params={"fields": "name,progress"}).json()
+        assert body[0]["progress"] == 0.0
+
+
+class TestConditionalGet:
+    """Test cases for ETag / If-None-Match on task and project resources."""
+
+    def revalidate(self, client, url, headers=None, **params):
+        first = client.get(url, headers=headers, params=params)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        second = client.get(url, headers={**(headers or {}), "If-None-Match": etag}, params=params)
+        return etag, second
+
+    def test_task_list_304_until_changed(self, client, auth_headers, project_id):
+        """Test that an unchanged listing returns 304 and any write invalidates it."""
+        task = make_task(client, auth_headers, project_id)
+        etag, response = self.revalidate(client, "/tasks/", auth_headers)
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+        client.post(f"/tasks/{task['id']}/assign", json={"assignee_id": 1}, headers=auth_headers)
+        response = client.get("/tasks/", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()[0]["assignee_id"] == 1
+
+    def test_etag_varies_with_query(self, client, auth_headers, project_id):
+        """Test that different representations of the same data get different tags."""
+        make_task(client, auth_headers, project_id)
+        full = client.get("/tasks/", headers=auth_headers).headers["ETag"]
+        sparse = client.get("/tasks/", params={"fields": "title"}, headers=auth_headers).headers["ETag"]
+        assert full != sparse
+
+    def test_task_detail_304(self, client, auth_headers, project_id):
+        """Test conditional GET on a single task."""
+        task = make_task(client, auth_headers, project_id)
+        etag, response = self.revalidate(client, f"/tasks/{task['id']}", auth_headers)
+        assert response.status_code == 304
+
+    def test_project_etags_follow_writes(self, client, auth_headers, project_id):
+        """Test that project list and detail tags change with project and task writes."""
+        list_etag, response = self.revalidate(client, "/projects/")
+        assert response.status_code == 304
+        detail_url = f"/projects/{project_id}"
+        detail_etag, response = self.revalidate(client, detail_url, include="tasks")
+        assert response.status_code == 304
+
+        task = make_task(client, auth_headers, project_id)
+        assert client.get("/projects/", headers={"If-None-Match": list_etag}).status_code == 200
+        response = client.get(detail_url, params={"include": "tasks"}, headers={"If-None-Match": detail_etag})
+        assert response.status_code == 200
+        detail_etag = response.headers["ETag"]
+
+        # Renaming a task changes no counter, but the embedded task list differs
+        client.put(f"/tasks/{task['id']}", json={
+            "title": "Renamed", "description": "d", "status": "todo", "project_id": project_id
+        }, headers=auth_headers)
+        response = client.get(detail_url, params={"include": "tasks"}, headers={"If-None-Match": detail_etag})
+        assert response.status_code == 200
+        assert response.json()["tasks"][0]["title"] == "Renamed"
+
+    def test_missing_project_still_404(self, client):
+        """Test that the validator query does not mask a missing project."""
+        assert client.get("/projects/999").status_code == 404
+
+
+class TestFastSerialization:
+    """Test cases for the row-tuple JSON encoder behind GET /tasks/."""
+
+    def test_row_encoder_matches_json(self):
+        """Test that the byte template produces the same document as json.dumps."""
+        import json
+        from datetime import datetime
+        from app.utils.serialization import RowEncoder
+        rows = [(1, 'quote " and \\ slash', None, datetime(2026, 1, 2, 3, 4, 5, 6), "ünïcode", "extra")]
+        body = RowEncoder(("id", "title", "assignee_id", "due_date", "status")).encode(rows)
+        assert json.loads(body) == [{
+            "id": 1, "title": 'quote " and \\ slash', "assignee_id": None,
+            "due_date": "2026-01-02T03:04:05.000006", "status": "ünïcode",
+        }]
+        assert RowEncoder(("id",)).encode([]) == b"[]"
+
+    def test_list_body_matches_task_read(self, client, auth_headers, project_id):
+        """Test that the fast path returns exactly what TaskRead serialization would."""
+        from app.database import SessionLocal
+        from app.schemas.task_schema import TaskRead
+        from models import Task
+        make_task(client, auth_headers, project_id, due_date="2030-05-06", assignee_id=1)
+        body = client.get("/tasks/", headers=auth_headers).json()
+
+        db = SessionLocal()
+        try:
+            expected = [TaskRead.model_validate(task).model_dump(mode="json") for task in db.query(Task).all()]
+        finally:
+            db.close()
+        assert body == expected
+
+
+class TestBulkTasks:
+    """Test cases for POST/PATCH /tasks/bulk."""
+
+    def item(self, project_id, **overrides):
+        return {"title": "Bulk", "description": "d", "status": "todo", "project_id": project_id, **overrides}
+
+    def test_bulk_create_batches_round_trips(self, client, auth_headers, project_id, statements):
+        """Test that 50 tasks cost one ownership check, no per-task SELECTs and one counter update.
+
+        SQLite cannot return ids in parameter order from a multi-row INSERT,
+        so SQLAlchemy emits one INSERT per task here (batched on backends that can).
+        """
+        client.get("/users/me", headers=auth_headers)
+        statements.clear()
+        response = client.post(
+            "/tasks/bulk", json=[self.item(project_id, title=f"T{i}") for i in range(50)], headers=auth_headers
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["succeeded"] == 50 and body["failed"] == 0
+        assert len({result["id"] for result in body["results"]}) == 50
+
+        ownership = [s for s in statements if s.startswith("SELECT projects.id")]
+        assert len(ownership) == 1
+        assert len([s for s in statements if s.startswith("SELECT")]) == 1
+        assert len([s for s in statements if s.startswith("INSERT INTO tasks")]) <= 50
+        assert len([s for s in statements if s.startswith("UPDATE project_task_counters")]) == 1
+        assert client.get("/tasks/stats", headers=auth_headers).json()["total"] == 50
+
+    def test_bulk_create_reports_items_individually(self, client, auth_headers, project_id):
+        """Test that invalid or unowned items fail alone while the rest are created."""
+        response = client.post("/tasks/bulk", json=[
+            self.item(project_id),
+            {"title": "missing fields"},
+            self.item(999),
+            "not an object",
+            self.item(project_id, status="done"),
+        ], headers=auth_headers)
+        body = response.json()
+        assert [result["ok"] for result in body["results"]] == [True, False, False, False, True]
+        assert "description" in body["results"][1]["error"]
+        assert body["results"][2]["error"] == "Project not found"
+        assert (body["succeeded"], body["failed"]) == (2, 3)
+        assert client.get("/tasks/stats", headers=auth_headers).json()["by_status"] == {"todo": 1, "done": 1}
+
+    def test_bulk_patch(self, client, auth_headers, project_id):
+        """Test that bulk PATCH applies only given fields and keeps counters in step."""
+        created = client.post("/tasks/bulk", json=[self.item(project_id) for _ in range(3)], headers=auth_headers)
+        ids = [result["id"] for result in created.json()["results"]]
+        response = client.patch("/tasks/bulk", json=[
+            {"id": ids[0], "status": "done"},
+            {"id": ids[1], "assignee_id": 1},
+            {"id": ids[0], "title": "again"},
+            {"id": 999, "status": "done"},
+            {"id": ids[2], "title": None},
+        ], headers=auth_headers)
+        body = response.json()
+        assert [result["ok"] for result in body["results"]] == [True, True, False, False, False]
+        assert "more than once" in body["results"][2]["error"]
+        assert body["results"][3]["error"] == "Task not found"
+
+        first = client.get(f"/tasks/{ids[0]}", headers=auth_headers).json()
+        assert (first["status"], first["title"]) == ("done", "Bulk")
+        assert client.get(f"/tasks/{ids[1]}", headers=auth_headers).json()["assignee_id"] == 1
+        project = client.get(f"/projects/{project_id}").json()
+        assert (project["task_count"], project["progress"]) == (3, 33.3)
+
+    def test_bulk_limit(self, client, auth_headers, project_id, monkeypatch):
+        """Test that oversized batches are rejected up front."""
+        monkeypatch.setattr("app.routers.task.BULK_MAX_ITEMS", 2)
+        response = client.post("/tasks/bulk", json=[self.item(project_id)] * 3, headers=auth_headers)
+        assert response.status_code == 413
+
+
+class TestExport:
+    """Test cases for the streaming /export endpoints."""
+
+    def test_export_tasks_ndjson(self, client, auth_headers, project_id):
+        """Test that tasks stream as one JSON object per line, filters applied."""
+        import json
+        for i in range(3):
+            make_task(client, auth_headers, project_id, title=f"T{i}", status=("todo", "done")[i % 2])
+
+        response = client.get("/export/tasks", params={"status": "todo"}, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="tasks.ndjson"' in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(row["title"] for row in rows) == ["T0", "T2"]
+        assert set(rows[0]) == set(client.get("/tasks/", headers=auth_headers).json()[0])
+
+    def test_export_csv_gzip(self, client, auth_headers, project_id):
+        """Test CSV output with a header row, compressed on the fly into a .gz download."""
+        import csv
+        import gzip
+        import io
+        task = make_task(client, auth_headers, project_id, title="Comma, quoted")
+        client.post("/comments/", json={"comment": "Looks good", "task_id": task["id"], "user_id": 1})
+
+        response = client.get("/export/tasks", params={"format": "csv", "gzip": True}, headers=auth_headers)
+        assert response.status_code == 200
+        # Served as a gzip file, so clients save it compressed instead of decoding it
+        assert response.headers["content-type"] == "application/gzip"
+        assert "content-encoding" not in response.headers
+        assert 'filename="tasks.csv.gz"' in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+        assert [row["title"] for row in rows] == ["Comma, quoted"]
+        assert rows[0]["assignee_id"] == ""
+
+        projects = client.get("/export/projects", params={"format": "csv"}, headers=auth_headers)
+        assert [row["name"] for row in csv.DictReader(io.StringIO(projects.text))] == ["Sprint"]
+        comments = client.get("/export/comments", params={"task_id": task["id"]}, headers=auth_headers)
+        assert '"content":"Looks good"' in comments.text
+        assert client.get("/export/comments", params={"task_id": 999}, headers=auth_headers).text == ""
+
+    def test_export_of_anothers_project(self, client, auth_headers, stranger_headers, project_id):
+        """Test that exporting someone else's project streams none of its tasks."""
+        make_task(client, auth_headers, project_id, title="Secret")
+        response = client.get("/export/tasks", params={"project_id": project_id}, headers=stranger_headers)
+        assert response.status_code == 200 and response.text == ""
+        csv_response = client.get("/export/tasks", params={"project_id": project_id, "format": "csv"},
+                                  headers=stranger_headers)
+        assert "Secret" not in csv_response.text
+
+    def test_export_requires_auth(self, client):
+        """Test that exports are only served to authenticated users."""
+        assert client.get("/export/tasks").status_code == 401
+
+    def test_stream_is_chunked(self, client, auth_headers, project_id):
+        """Test that rows are fetched and encoded one cursor batch at a time."""
+        import zlib
+        from app.services import export_service, task_service
+        client.post("/tasks/bulk", json=[
+            {"title": f"T{i}", "description": "d", "status": "todo", "project_id": project_id} for i in range(25)
+        ], headers=auth_headers)
+
+        fields, query = export_service.task_export(1, task_service.TaskFilters())
+        chunks = list(export_service.stream_export(fields, query, export_service.ExportFormat.ndjson, chunk_size=10))
+        assert [chunk.count(b"\n") for chunk in chunks] == [10, 10, 5]
+
+        chunks = list(export_service.stream_export(
+            fields, query, export_service.ExportFormat.csv, compress=True, chunk_size=10
+        ))
+        assert zlib.decompress(b"".join(chunks), wbits=31).count(b"\n") == 26
+
+
+class TestImport:
+    """Test cases for POST /tasks/import and the import-tasks command."""
+
+    def upload(self, client, headers, name, content, **params):
+        response = client.post("/tasks/import", files={"file": (name, content)}, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        import json
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    def test_import_ndjson_reports_rejects(self, client, auth_headers, project_id):
+        """Test that bad lines are rejected individually while the rest are imported."""
+        import json
+        lines = [
+            json.dumps({"title": "A", "description": "d", "status": "todo", "project_id": project_id}),
+            "{not json",
+            json.dumps({"title": "B", "status": "todo", "project_id": project_id}),
+            "",
+            json.dumps({"title": "C", "description": "d", "status": "done", "project_id": 999}),
+            json.dumps({"title": "D", "description": "d", "status": "done", "project_id": project_id}),
+        ]
+        events = self.upload(client, auth_headers, "tasks.ndjson", "\n".join(lines))
+        rejects = {event["line"]: event["error"] for event in events if event["event"] == "reject"}
+        assert set(rejects) == {2, 3, 5}
+        assert rejects[2].startswith("Invalid JSON")
+        assert "description" in rejects[3]
+        assert rejects[5] == "Project not found"
+        assert events[-1] == {"event": "done", "processed": 5, "imported": 2, "rejected": 3}
+        assert client.get("/tasks/stats", headers=auth_headers).json()["by_status"] == {"todo": 1, "done": 1}
+
+    def test_import_csv_batches_and_assignee_lookup(self, client, auth_headers, project_id, statements):
+        """Test CSV import in batches with one user lookup per distinct assignee email."""
+        rows = ["title,description,status,project_id,assignee_email,due_date"]
+        rows += [f"T{i},d,todo,{project_id},owner@example.com,2030-01-0{i % 9 + 1}" for i in range(5)]
+        rows += [f"X,d,todo,{project_id},nobody@example.com,", f"Y,d,todo,{project_id},,"]
+        statements.clear()
+        events = self.upload(client, auth_headers, "tasks.csv", "\n".join(rows), batch_size=2)
+
+        assert [event["event"] for event in events].count("progress") == 3
+        rejects = [event for event in events if event["event"] == "reject"]
+        assert [(event["line"], event["error"]) for event in rejects] == [(7, "Unknown assignee: nobody@example.com")]
+        assert events[-1] == {"event": "done", "processed": 7, "imported": 6, "rejected": 1}
+        lookups = [s for s in statements if s.startswith("SELECT users.id AS users_id \nFROM users \nWHERE users.email")]
+        assert len(lookups) == 2
+
+        tasks = client.get("/tasks/", params={"sort": "title"}, headers=auth_headers).json()
+        assert [task["assignee_id"] for task in tasks] == [1] * 5 + [None]
+        assert client.get("/projects/").json()[0]["task_count"] == 6
+
+    def test_import_command(self, client, auth_headers, project_id, tmp_path, capsys):
+        """Test that the CLI imports a file and writes rejected lines to the reject file."""
+        import json
+        import manage
+        source = tmp_path / "tasks.ndjson"
+        source.write_text("\n".join([
+            json.dumps({"title": "A", "description": "d", "status": "todo", "project_id": project_id}),
+            json.dumps({"title": "B", "description": "d", "status": "todo", "project_id": 999}),
+        ]))
+        rejects = tmp_path / "rejects.ndjson"
+        manage.main(["import-tasks", str(source), "--owner-id", "1", "--rejects", str(rejects)])
+
+        assert "Imported 1 of 2 rows." in capsys.readouterr().out
+        [reject] = [json.loads(line) for line in rejects.read_text().splitlines()]
+        assert (reject["line"], reject["record"]["title"]) == (2, "B")
+        assert client.get("/tasks/stats", headers=auth_headers).json()["total"] == 1
@@ -0,0 +1,246 @@
+import threading
+import pytest
+from app.database import SessionLocal
+from app.dependencies import principal_cache
+from app.utils.cache import TTLCache
+from app.utils.prefix_index import RecordIndex
+from models import User, UserRole
+
+
+class TestPrincipalCache:
+    """Test cases for the authenticated principal cache."""
+
+    def test_cached_principal_skips_user_lookup(self, client, auth_headers, statements):
+        """Test that repeated requests with one token query the users table once."""
+        hits = principal_cache.hits
+        for _ in range(3):
+            response = client.get("/users/me", headers=auth_headers)
+            assert response.status_code == 200
+
+        assert len([s for s in statements if "FROM users" in s]) == 1
+        assert principal_cache.hits - hits == 2
+        assert response.json()["username"] == "owner"
+        assert response.json()["role"] == "admin"
+
+    def test_user_update_invalidates_principal(self, client, auth_headers):
+        """Test that changing the user row evicts its cached principal."""
+        client.get("/users/me", headers=auth_headers)
+        assert len(principal_cache) == 1
+
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.email == "owner@example.com").first()
+            user.role = UserRole.developer
+            db.commit()
+        finally:
+            db.close()
+
+        assert len(principal_cache) == 0
+        response = client.get("/users/me", headers=auth_headers)
+        assert response.json()["role"] == "developer"
+
+    def test_invalid_token_rejected(self, client):
+        """Test that an invalid token is not cached and returns 401."""
+        response = client.get("/users/me", headers={"Authorization": "Bearer nope"})
+        assert response.status_code == 401
+        assert len(principal_cache) == 0
+
+    def test_metrics_report_cache_counters(self, client, auth_headers):
+        """Test that hit/miss counters are exposed on /metrics."""
+        client.get("/users/me", headers=auth_headers)
+        client.get("/users/me", headers=auth_headers)
+        stats = client.get("/metrics/").json()["principal_cache"]
+        assert stats["hits"] >= 1
+        assert stats["misses"] >= 1
+
+
+class TestTTLCache:
+    """Test cases for the LRU/TTL cache helper."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test that entries expire after the ttl."""
+        now = [1000.0]
+        monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+        cache = TTLCache(maxsize=10, ttl=5)
+        cache.set("a", 1)
+        now[0] += 6
+        assert cache.get("a") is None
+        assert cache.misses == 1
+
+
+class TestRecordIndex:
+    """Test cases for the in-process prefix index behind the typeahead."""
+
+    def test_lookups_not_blocked_by_reload(self):
+        """Test that a reload loads outside the lookup lock and swaps the new rows in at the end."""
+        index = RecordIndex(keys=("username",), max_rows=10, ttl=300)
+        users = [(1, "alice"), (2, "alan")]
+        index.refresh(lambda last_id, count: users[:count])
+        loading, release = threading.Event(), threading.Event()
+
+        def slow_load(last_id, count):
+            loading.set()
+            release.wait(5)
+            return [(1, "alice"), (2, "alan"), (3, "albert")]
+
+        found = []
+
+        def lookup():
+            if index.refresh(slow_load):
+                found.extend(row[1] for row in index.search("al", 10))
+
+        index.invalidate()
+        reload = threading.Thread(target=index.refresh, args=(slow_load,))
+        reload.start()
+        assert loading.wait(5)
+        reader = threading.Thread(target=lookup)
+        reader.start()
+        # A reload holding the lookup lock would keep the reader waiting until release
+        reader.join(1)
+        blocked = reader.is_alive()
+        release.set()
+        reload.join(5)
+        reader.join(5)
+        assert not blocked
+        assert found == ["alan", "alice"]
+        assert [row[1] for row in index.search("al", 10)] == ["alan", "albert", "alice"]
+
+    def test_invalidate_during_reload(self):
+        """Test that an invalidate() racing a reload leaves another reload due."""
+        index = RecordIndex(keys=("username",), max_rows=10, ttl=300)
+        users = [(1, "alice")]
+
+        def load(last_id, count):
+            writer = threading.Thread(target=index.invalidate)
+            writer.start()
+            writer.join(1)
+            return [row for row in users if row[0] > last_id][:count]
+
+        index.refresh(load)
+        users[0] = (1, "alicia")
+        assert index.refresh(lambda last_id, count: [row for row in users if row[0] > last_id][:count])
+        assert [row[1] for row in index.search("ali", 10)] == ["alicia"]
+
+
+class TestPasswordHashing:
+    """Test cases for login/registration password handling."""
+
+    def test_register_and_login(self, client):
+        """Test that async register/login round-trips a password."""
+        response = client.post("/users/", json={
+            "username": "dev",
+            "email": "dev@example.com",
+            "role": "developer",
+            "password": "password123"
+        })
+        assert response.status_code == 200
+        response = client.post("/users/login", json={"email": "dev@example.com", "password": "password123"})
+        assert response.status_code == 200
+        assert response.json()["token_type"] == "bearer"
+
+    def test_login_wrong_password(self, client, auth_headers):
+        """Test that a wrong password is rejected."""
+        response = client.post("/users/login", json={"email": "owner@example.com", "password": "wrong-pass"})
+        assert response.status_code == 401
+
+    def test_login_rehashes_outdated_cost(self, client):
+        """Test that a hash with a different cost factor is upgraded on login."""
+        from passlib.hash import bcrypt
+        db = SessionLocal()
+        try:
+            db.add(User(
+                username="legacy",
+                email="legacy@example.com",
+                password=bcrypt.using(rounds=5).hash("password123"),
+                role=UserRole.user
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+        response = client.post("/users/login", json={"email": "legacy@example.com", "password": "password123"})
+        assert response.status_code == 200
+
+        db = SessionLocal()
+        try:
+            stored = db.query(User).filter(User.email == "legacy@example.com").first().password
+        finally:
+            db.close()
+        assert stored.startswith("$2b$04$")
+
+
+class TestUserSearch:
+    """Test cases for the GET /users/search typeahead."""
+
+    @pytest.fixture
+    def people(self, client, auth_headers):
+        for username, email in (("alice", "alice@corp.io"), ("alan", "a.turing@lab.org"), ("bob", "bob@alpha.dev")):
+            client.post("/users/", json={"username": username, "email": email, "role": "user", "password": "secret1"})
+        return auth_headers
+
+    def search(self, client, headers, q, **params):
+        response = client.get("/users/search", params={"q": q, **params}, headers=headers)
+        assert response.status_code == 200, response.text
+        return [user["username"] for user in response.json()]
+
+    @pytest.mark.parametrize("indexed", [True, False])
+    def test_prefix_match(self, client, people, indexed, monkeypatch):
+        """Test username and email prefix matching from the index and from the LIKE fallback."""
+        from app.services.user_service import user_index
+        if not indexed:
+            monkeypatch.setattr(user_index, "max_rows", 0)
+        assert self.search(client, people, "AL") == ["alan", "alice"]
+        assert self.search(client, people, "bob@") == ["bob"]
+        assert self.search(client, people, "a.t") == ["alan"]
+        assert self.search(client, people, "a", limit=1) == ["alan"]
+        assert self.search(client, people, "%") == []
+        assert user_index.stats()["rows"] == (4 if indexed else 0)
+
+    def test_project_members_only(self, client, people):
+        """Test that project_id restricts results to the project's owner and members."""
+        from models import Project, ProjectMember
+        db = SessionLocal()
+        try:
+            project = Project(name="Team", owner_id=2)
+            db.add(project)
+            db.flush()
+            db.add(ProjectMember(project_id=project.id, user_id=3))
+            db.commit()
+            project_id = project.id
+        finally:
+            db.close()
+        assert self.search(client, people, "a", project_id=project_id) == ["alan", "alice"]
+        assert self.search(client, people, "b", project_id=project_id) == []
+        response = client.get("/users/search", params={"q": "a", "project_id": 999}, headers=people)
+        assert response.status_code == 404
+
+    def test_index_catches_up_with_other_writers(self, client, people, statements):
+        """Test that users inserted elsewhere appear, renames reload the index, and lookups skip the LIKE scan."""
+        assert self.search(client, people, "car") == []
+        db = SessionLocal()
+        try:
+            db.add(User(username="carol", email="carol@corp.io", password="x", role=UserRole.user))
+            db.commit()
+            assert self.search(client, people, "car") == ["carol"]
+            db.query(User).filter(User.username == "carol").first().username = "caroline"
+            db.commit()
+        finally:
+            db.close()
+        statements.clear()
+        assert self.search(client, people, "carol") == ["caroline"]
+        assert not [s for s in statements if "LIKE" in s]
+
+    def test_requires_auth(self, client):
+        """Test that the typeahead is only served to authenticated users."""
+        assert client.get("/users/search", params={"q": "a"}).status_code == 401
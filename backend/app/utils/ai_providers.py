@@ -0,0 +1,117 @@
+import asyncio
+import re
+import threading
+import time
+from typing import AsyncIterator, List, Optional
+import orjson
+from app.config import AI_PROVIDER, AI_TIMEOUT, GROQ_API_KEY
+
+# Chat messages as the providers take them: [{"role": "system" | "user", "content": str}]
+Messages = List[dict]
+
+
+class ProviderError(Exception):
+    """The model could not be reached or gave an unusable reply."""
+
+
+class FakeProvider:
+    """Local deterministic model for tests and development; no network, no key.
+
+    Answers a story prompt with ``Write N user stories`` and ``Project: X``
+    lines with N stories about X. ``delay`` simulates upstream latency;
+    ``reply`` and ``error`` force a raw reply or a failure. Streams come in
+    ``chunk_size`` pieces, ``chunk_delay`` apart.
+    """
+
+    name = "fake"
+
+    def __init__(self, delay: float = 0.0, reply: Optional[str] = None, error: Optional[str] = None,
+                 chunk_size: int = 16, chunk_delay: float = 0.0):
+        self.delay = delay
+        self.reply = reply
+        self.error = error
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def stories(self, messages: Messages) -> List[dict]:
+        prompt = messages[-1]["content"]
+        wanted = re.search(r"Write (\d+) user stor", prompt)
+        project = re.search(r"^Project: (.+)$", prompt, re.MULTILINE)
+        count = int(wanted.group(1)) if wanted else 3
+        topic = project.group(1).strip() if project else "the product"
+        return [
+            {"title": f"Story {i} for {topic}", "description": f"As a user of {topic}, I want feature {i}."}
+            for i in range(1, count + 1)
+        ]
+
+    def complete(self, messages: Messages, *, model: str, temperature: float, max_tokens: int) -> str:
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise ProviderError(self.error)
+        return self._text(messages)
+
+    def _text(self, messages: Messages) -> str:
+        return self.reply if self.reply is not None else orjson.dumps(self.stories(messages)).decode()
+
+    async def stream(self, messages: Messages, *, model: str, temperature: float,
+                     max_tokens: int) -> AsyncIterator[str]:
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise ProviderError(self.error)
+        text = self._text(messages)
+        for start in range(0, len(text), self.chunk_size):
+            if start and self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            yield text[start:start + self.chunk_size]
+
+
+class GroqProvider:
+    """Groq chat completions (needs the ``groq`` package and GROQ_API_KEY)."""
+
+    name = "groq"
+
+    def __init__(self, api_key: str = GROQ_API_KEY, timeout: float = AI_TIMEOUT):
+        try:
+            from groq import AsyncGroq, Groq
+        except ImportError as exc:
+            raise RuntimeError("AI_PROVIDER=groq requires the 'groq' package") from exc
+        if not api_key:
+            raise RuntimeError("AI_PROVIDER=groq requires GROQ_API_KEY")
+        self._client = Groq(api_key=api_key, timeout=timeout, max_retries=1)
+        self._async_client = AsyncGroq(api_key=api_key, timeout=timeout, max_retries=1)
+
+    def complete(self, messages: Messages, *, model: str, temperature: float, max_tokens: int) -> str:
+        try:
+            response = self._client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, max_tokens=max_tokens
+            )
+        except Exception as exc:
+            raise ProviderError(f"{type(exc).__name__}: {exc}") from exc
+        return response.choices[0].message.content or ""
+
+    async def stream(self, messages: Messages, *, model: str, temperature: float,
+                     max_tokens: int) -> AsyncIterator[str]:
+        try:
+            response = await self._async_client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, max_tokens=max_tokens, stream=True
+            )
+            async for chunk in response:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    yield text
+        except Exception as exc:
+            raise ProviderError(f"{type(exc).__name__}: {exc}") from exc
+
+
+def make_provider():
+    if AI_PROVIDER == "fake":
+        return FakeProvider()
+    return GroqProvider()
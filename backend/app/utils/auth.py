@@ -1,36 +1,9 @@
 from fastapi import Depends, HTTPException, status
-from jose import JWTError, jwt
-from models import User
-from app.database import SessionLocal
-from sqlalchemy.orm import Session
-import os
+from app.dependencies import get_current_user, Principal
 
 
-SECRET_KEY = os.environ.get("SECRET_KEY","EW7zNXSvDEYF8n6S8Clh3lZQhbgxhFjSP955AA13c_0")
-ALGORITHM = "HS256"
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("user_id")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid authentication token")
-        user = db.query(User).filter(User.id == user_id).first()
-        if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-
 def require_roles(*roles):
-    def _role_dependency(user: User = Depends(get_current_user)):
+    def _role_dependency(user: Principal = Depends(get_current_user)):
         if user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+from typing import Dict, Iterable, Optional, Set
+from app.config import EVENTS_BACKEND, EVENTS_QUEUE_SIZE, EVENTS_URL
+
+# Sent in place of a backlog the subscriber could not keep up with
+RESYNC = b'{"type":"resync"}'
+
+
+class Subscription:
+    """One client's bounded event queue, fed on the event loop it subscribed from."""
+
+    def __init__(self, topics: Iterable[int], maxsize: int = EVENTS_QUEUE_SIZE):
+        self.topics = frozenset(topics)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.loop = asyncio.get_running_loop()
+        self.overflows = 0
+
+    def deliver(self, payload: bytes):
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # A slow consumer must not hold memory or stall publishers: drop its
+            # backlog and tell it to refetch instead
+            self.overflows += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next payload, or ``None`` if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class MemoryBackend:
+    """Fan-out within this process only."""
+
+    name = "memory"
+    remote = False
+
+    def start(self, broker: "EventBroker"):
+        self._broker = broker
+
+    def publish(self, topic: int, payload: bytes):
+        self._broker.dispatch(topic, payload)
+
+
+class RedisBackend:
+    """Pub/sub through Redis so every worker sees every event (needs the optional ``redis`` package)."""
+
+    name = "redis"
+    remote = True
+
+    def __init__(self, url: str, channel: str = "pmt:events"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("EVENTS_BACKEND=redis requires the 'redis' package") from exc
+        self._client = redis.Redis.from_url(url)
+        self._channel = channel
+        self._listener: Optional[threading.Thread] = None
+
+    def start(self, broker: "EventBroker"):
+        if self._listener is not None:
+            return
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._channel)
+
+        def listen():
+            for message in pubsub.listen():
+                topic, _, payload = message["data"].partition(b" ")
+                broker.dispatch(int(topic), payload)
+
+        self._listener = threading.Thread(target=listen, name="event-listener", daemon=True)
+        self._listener.start()
+
+    def publish(self, topic: int, payload: bytes):
+        self._client.publish(self._channel, str(topic).encode() + b" " + payload)
+
+
+class EventBroker:
+    """Topic (project id) -> subscriptions fan-out.
+
+    ``publish`` may be called from any thread; each payload is handed to the
+    subscriber's own event loop. Delivery never blocks the publisher: a full
+    queue is replaced by a single resync marker.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._topics: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._started = False
+        self.published = 0
+        self.delivered = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether publishing can reach anyone (always, with a cross-process backend)."""
+        return self.backend.remote or bool(self._topics)
+
+    def subscribe(self, topics: Iterable[int]) -> Subscription:
+        subscription = Subscription(topics)
+        with self._lock:
+            if not self._started:
+                self.backend.start(self)
+                self._started = True
+            for topic in subscription.topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+
+    def publish(self, topic: int, payload: bytes):
+        with self._lock:
+            self.published += 1
+        self.backend.publish(topic, payload)
+
+    def dispatch(self, topic: int, payload: bytes):
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+            self.delivered += len(subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, payload)
+            except RuntimeError:
+                # The subscriber's loop is gone (e.g. server shutdown)
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscriptions = {sub for subscribers in self._topics.values() for sub in subscribers}
+            return {
+                "backend": self.backend.name,
+                "subscribers": len(subscriptions),
+                "topics": len(self._topics),
+                "published": self.published,
+                "delivered": self.delivered,
+                "overflows": sum(sub.overflows for sub in subscriptions),
+            }
+
+
+def _make_backend():
+    if EVENTS_BACKEND == "redis":
+        return RedisBackend(EVENTS_URL)
+    return MemoryBackend()
+
+
+broker = EventBroker(_make_backend())
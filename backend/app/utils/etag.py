@@ -0,0 +1,37 @@
+import hashlib
+from fastapi import Request, Response
+
+ETAG_HEADER = "ETag"
+# Browsers keep the body but revalidate with If-None-Match on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def resource_etag(request: Request, *validators) -> str:
+    """Strong ETag for the requested URL, derived from cheap validators.
+
+    ``validators`` are small values that change whenever the representation
+    does (row counts, max ids, max ``updated_at``), so the body itself is
+    never hashed.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{request.url.path}?{request.url.query}|{validators!r}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={ETAG_HEADER: etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str):
+    response.headers[ETAG_HEADER] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,64 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from app.utils.pagination import set_next_cursor
+from app.utils.serialization import dump_json
+
+
+class FieldSet:
+    """``?fields=`` dependency for a response schema.
+
+    Resolves to ``None`` when the parameter is absent, otherwise to the
+    requested field names (plus ``always``) in schema declaration order.
+    """
+
+    def __init__(self, schema: Type[BaseModel], always: Tuple[str, ...] = ("id",)):
+        self.schema = schema
+        self.always = always
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(None, description="Comma-separated response fields; narrows the SELECT"),
+    ) -> Optional[Tuple[str, ...]]:
+        if not fields:
+            return None
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = names - self.schema.model_fields.keys()
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {', '.join(sorted(unknown))}")
+        names.update(self.always)
+        return tuple(name for name in self.schema.model_fields if name in names)
+
+
+@lru_cache(maxsize=256)
+def partial_model(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Response model with only ``fields`` of ``schema``, built once per field set."""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+
+def load_fields(model, fields: Tuple[str, ...], *required):
+    """``load_only`` option for the mapped columns among ``fields`` plus ``required``.
+
+    Names that are not columns (properties, relationships) are skipped.
+    """
+    columns = inspect(model).column_attrs.keys()
+    attributes = {getattr(model, name) for name in fields if name in columns}
+    attributes.update(required)
+    return load_only(*attributes)
+
+
+def list_response(
+    schema: Type[BaseModel], fields: Optional[Tuple[str, ...]], items, next_cursor: Optional[str] = None
+) -> Response:
+    """Serialize ``items`` through ``schema`` (or its ``fields`` subset), bypassing the route's response_model."""
+    body = dump_json(List[partial_model(schema, fields) if fields else schema], items)
+    response = Response(body, media_type="application/json")
+    set_next_cursor(response, next_cursor)
+    return response
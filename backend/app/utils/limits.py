@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import Counter
+from typing import Callable, Hashable
+
+
+class Overloaded(Exception):
+    """Every slot allowed for this caller is taken."""
+
+
+class CircuitOpen(Exception):
+    """Calls are being refused after repeated failures."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Upstream unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class Slot:
+    """A held place in a ``ConcurrencyLimiter``; releasing it twice is harmless."""
+
+    def __init__(self, limiter: "ConcurrencyLimiter", key: Hashable):
+        self._limiter = limiter
+        self._key = key
+        self._held = True
+
+    def release(self):
+        with self._limiter._lock:
+            if not self._held:
+                return
+            self._held = False
+        self._limiter._release(self._key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class ConcurrencyLimiter:
+    """At most ``limit`` concurrent holders overall and ``per_key`` for any one key.
+
+    A caller over either cap is refused at once rather than queued, so a slow
+    upstream cannot pile up waiting requests (and their open connections)
+    behind it. Usable from threads and from the event loop alike.
+    """
+
+    def __init__(self, limit: int, per_key: int):
+        self.limit = limit
+        self.per_key = per_key
+        self._active = 0
+        self._by_key = Counter()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def acquire(self, key: Hashable) -> Slot:
+        with self._lock:
+            if self._active >= self.limit or self._by_key[key] >= self.per_key:
+                self.rejected += 1
+                raise Overloaded("Too many concurrent requests" if self._active >= self.limit
+                                 else "Too many concurrent requests for this user")
+            self._active += 1
+            self._by_key[key] += 1
+        return Slot(self, key)
+
+    def _release(self, key: Hashable):
+        with self._lock:
+            self._active -= 1
+            self._by_key[key] -= 1
+            if not self._by_key[key]:
+                del self._by_key[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"active": self._active, "limit": self.limit, "per_key": self.per_key, "rejected": self.rejected}
+
+
+class CircuitBreaker:
+    """Stop calling an upstream after ``failure_threshold`` failures in a row.
+
+    While open, ``allow`` raises ``CircuitOpen`` for ``reset_timeout``
+    seconds. After that the circuit is half-open: a single caller is let
+    through as a probe and everyone else is still refused until the probe
+    reports back. A success closes the circuit, a failure opens it for another
+    ``reset_timeout``. A probe that never reports (its client went away) stops
+    blocking others after ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._probe_at = None
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "open" if self._clock() - self._opened_at < self.reset_timeout else "half_open"
+
+    def allow(self) -> bool:
+        """Raise ``CircuitOpen`` unless a call may go ahead; ``True`` if that call is the half-open probe."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            now = self._clock()
+            remaining = self.reset_timeout - (now - self._opened_at)
+            if remaining > 0:
+                raise CircuitOpen(remaining)
+            if self._probe_at is not None and now - self._probe_at < self.reset_timeout:
+                raise CircuitOpen(self.reset_timeout - (now - self._probe_at))
+            self._probe_at = now
+            return True
+
+    def cancel_probe(self):
+        """The probe let through by ``allow`` was not made after all; let the next caller probe."""
+        with self._lock:
+            self._probe_at = None
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_at = None
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._clock() - self._opened_at >= self.reset_timeout:
+                    self.opened += 1
+                self._opened_at = self._clock()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state, "failures": self._failures, "opened": self.opened,
+            "probing": self._probe_at is not None,
+        }
@@ -0,0 +1,108 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Optional
+from fastapi import HTTPException, Query
+from sqlalchemy import Date, DateTime, and_, or_
+from app.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Keyset:
+    """Stable ordering on ``(column, id)`` used for cursor pagination.
+
+    Pages are fetched with ``WHERE (column, id) > (last_column, last_id)``
+    instead of OFFSET, so deep pages cost the same as the first one. NULLs in
+    a nullable sort column are ordered last in both directions.
+    """
+
+    def __init__(self, name: str, column, id_column, descending: bool = False, nullable: bool = False):
+        self.name = name
+        self.column = column
+        self.id_column = id_column
+        self.descending = descending
+        self.nullable = nullable
+
+    @property
+    def _id_only(self) -> bool:
+        return self.column is self.id_column
+
+    def order_by(self) -> list:
+        def directed(column):
+            return column.desc() if self.descending else column.asc()
+
+        if self._id_only:
+            return [directed(self.id_column)]
+        clauses = [self.column.is_(None)] if self.nullable else []
+        return clauses + [directed(self.column), directed(self.id_column)]
+
+    def after(self, value, last_id):
+        """Filter selecting rows that sort strictly after ``(value, last_id)``."""
+        def beyond(column, bound):
+            return column < bound if self.descending else column > bound
+
+        if self._id_only:
+            return beyond(self.id_column, last_id)
+        if value is None:
+            return and_(self.column.is_(None), beyond(self.id_column, last_id))
+        condition = or_(
+            beyond(self.column, value),
+            and_(self.column == value, beyond(self.id_column, last_id)),
+        )
+        if self.nullable:
+            condition = or_(condition, self.column.is_(None))
+        return condition
+
+    def encode(self, item) -> str:
+        last_id = getattr(item, self.id_column.key)
+        value = None if self._id_only else getattr(item, self.column.key)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        raw = json.dumps([self.name, value, last_id], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode(self, cursor: str):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            name, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+            if name != self.name:
+                raise ValueError("cursor was issued for a different sort order")
+            if value is not None and not self._id_only:
+                column_type = self.column.type
+                if isinstance(column_type, DateTime):
+                    value = datetime.fromisoformat(value)
+                elif isinstance(column_type, Date):
+                    value = date.fromisoformat(value)
+            return value, int(last_id)
+        except (ValueError, TypeError, binascii.Error):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class PageParams:
+    """``limit``/``cursor`` query parameters shared by the list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def paginate(query, keyset: Keyset, page: PageParams):
+    """Return ``(items, next_cursor)`` for one page of ``query``."""
+    if page.cursor:
+        query = query.filter(keyset.after(*keyset.decode(page.cursor)))
+    items = query.order_by(*keyset.order_by()).limit(page.limit + 1).all()
+    if len(items) > page.limit:
+        items = items[:page.limit]
+        return items, keyset.encode(items[-1])
+    return items, None
+
+
+def set_next_cursor(response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,154 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class PrefixIndex:
+    """Sorted ``(key, id)`` pairs answering case-insensitive prefix queries by bisection.
+
+    Not thread-safe on its own; ``RecordIndex`` guards it.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[str, int]] = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, pairs: Iterable[Tuple[str, int]]):
+        self._entries = sorted((key.lower(), item_id) for key, item_id in pairs)
+
+    def add(self, key: str, item_id: int):
+        insort(self._entries, (key.lower(), item_id))
+
+    def match(self, prefix: str):
+        """Ids whose key starts with ``prefix`` (lower-cased), in key order."""
+        entries = self._entries
+        position = bisect_left(entries, (prefix,))
+        while position < len(entries) and entries[position][0].startswith(prefix):
+            yield entries[position][1]
+            position += 1
+
+
+class RecordIndex:
+    """In-process prefix index over a few text columns of a table's rows.
+
+    Rows are loaded once and then caught up by id (``load_since``), so rows
+    inserted by other workers show up on the next lookup. A full reload
+    happens every ``ttl`` seconds or after ``invalidate()``, which covers
+    updates, deletes and ids committed out of order. Past ``max_rows`` the
+    index switches itself off and callers fall back to the database.
+    """
+
+    def __init__(self, keys: Tuple[str, ...], max_rows: int, ttl: float):
+        self.keys = keys
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Held by the one thread reloading; lookups only take ``_lock``
+        self._refresh_lock = threading.Lock()
+        self._generation = 0
+        self._reset()
+
+    def _reset(self):
+        self._rows: Dict[int, tuple] = {}
+        self._indexes = {key: PrefixIndex() for key in self.keys}
+        self._last_id = 0
+        self._loaded_at: Optional[float] = None
+        self._built = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rows > 0
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self._generation += 1
+
+    def refresh(self, load_since: Callable[[int, int], list]) -> bool:
+        """Bring the index up to date; ``load_since(last_id, limit)`` returns rows
+        ``(id, *keys, ...)`` with a greater id, in id order. Returns whether the
+        index can serve lookups.
+
+        Rows are loaded and a full rebuild is built without holding the lock
+        that lookups take; only the swap happens under it. While another
+        thread is refreshing, a loaded index keeps serving what it has.
+        """
+        if not self.enabled:
+            return False
+        if not self._refresh_lock.acquire(blocking=not self._built):
+            return True
+        try:
+            with self._lock:
+                full = self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+                after = 0 if full else self._last_id
+                budget = self.max_rows - (0 if full else len(self._rows))
+                generation = self._generation
+            # One row over the budget tells us the table outgrew the index
+            rows = load_since(after, budget + 1)
+            if len(rows) > budget:
+                with self._lock:
+                    self.max_rows = 0
+                    self._reset()
+                return False
+            if full:
+                built = {row[0]: tuple(row) for row in rows}
+                indexes = {key: PrefixIndex() for key in self.keys}
+                for position, index in enumerate(indexes.values(), 1):
+                    index.load((row[position], row[0]) for row in rows)
+            with self._lock:
+                if full:
+                    self._rows, self._indexes, self._last_id = built, indexes, 0
+                    self._built = True
+                    # invalidate() during the load may have missed rows: leave it due
+                    if generation == self._generation:
+                        self._loaded_at = time.monotonic()
+                elif generation == self._generation:
+                    for row in rows:
+                        self._add(tuple(row))
+                else:
+                    return True
+                if rows:
+                    self._last_id = max(self._last_id, rows[-1][0])
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def _add(self, row: tuple):
+        if row[0] in self._rows:
+            return
+        self._rows[row[0]] = row
+        for position, index in enumerate(self._indexes.values(), 1):
+            index.add(row[position], row[0])
+
+    def add(self, row: tuple):
+        """Index a row written by this process right away (before the next catch-up)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._loaded_at is not None:
+                self._add(tuple(row))
+
+    def search(self, prefix: str, limit: int, allowed: Optional[set] = None) -> List[tuple]:
+        """Up to ``limit`` rows with any key starting with ``prefix``, first-key matches first."""
+        prefix = prefix.lower()
+        found: Dict[int, tuple] = {}
+        with self._lock:
+            for index in self._indexes.values():
+                for item_id in index.match(prefix):
+                    if item_id in found or (allowed is not None and item_id not in allowed):
+                        continue
+                    found[item_id] = self._rows[item_id]
+                    if len(found) >= limit:
+                        return list(found.values())
+        return list(found.values())
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "rows": len(self._rows), "max_rows": self.max_rows}
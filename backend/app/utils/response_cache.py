@@ -0,0 +1,162 @@
+import json
+import threading
+from typing import Optional
+from fastapi import Request, Response
+from app.config import RESPONSE_CACHE_BACKEND, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_URL
+from app.utils.cache import TTLCache
+from app.utils.etag import ETAG_HEADER, is_not_modified, not_modified
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+# Namespaces; a write bumps the one whose listing it changes
+PROJECTS = "projects"
+USERS = "users"
+
+# Response headers replayed on a cache hit
+CACHED_HEADERS = (NEXT_CURSOR_HEADER, ETAG_HEADER, "Cache-Control")
+
+
+class MemoryBackend:
+    """In-process LRU/TTL store; also the local stand-in for a shared backend."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes):
+        self._entries.set(key, value)
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+        self._generations.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "maxsize": self._entries.maxsize,
+            "evictions": self._entries.evictions,
+            "memory_bytes": sum(len(value) for value in self._entries.values()),
+        }
+
+
+class RedisBackend:
+    """Shared store for multi-worker deployments (needs the optional ``redis`` package)."""
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl: float = RESPONSE_CACHE_TTL, prefix: str = "pmt:cache:"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self._client = redis.Redis.from_url(url)
+        self._ttl = max(1, int(ttl))
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes):
+        self._client.set(self._prefix + key, value, ex=self._ttl)
+
+    def generation(self, namespace: str) -> int:
+        return int(self._client.get(f"{self._prefix}gen:{namespace}") or 0)
+
+    def bump(self, namespace: str):
+        # Old generations are never read again and expire on their own
+        self._client.incr(f"{self._prefix}gen:{namespace}")
+
+    def clear(self):
+        for key in self._client.scan_iter(f"{self._prefix}*"):
+            self._client.delete(key)
+
+    def stats(self) -> dict:
+        return {"memory_bytes": self._client.info("memory").get("used_memory")}
+
+
+class ResponseCache:
+    """Read-through cache of serialized list responses, keyed by URL.
+
+    Each namespace carries a generation number in the backend; writes bump
+    it, so every cached page of that namespace is invalidated at once
+    without enumerating keys.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def key(self, namespace: str, request: Request) -> str:
+        """Cache key under the namespace's current generation.
+
+        Take the key before querying and store under that same key: a write
+        that commits in between bumps the generation, so the possibly stale
+        body lands under a key nobody reads again.
+        """
+        generation = self.backend.generation(namespace)
+        return f"{namespace}:{generation}:{request.url.path}?{request.url.query}"
+
+    def get(self, key: str, request: Request) -> Optional[Response]:
+        """Cached response for ``key`` (or a 304 for a matching ETag), else ``None``."""
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        header_line, body = entry.split(b"\n", 1)
+        headers = json.loads(header_line)
+        etag = headers.get(ETAG_HEADER)
+        if etag and is_not_modified(request, etag):
+            return not_modified(etag)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def set(self, key: str, response: Response) -> Response:
+        """Store a rendered JSON response and return it unchanged."""
+        headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        self.backend.set(key, json.dumps(headers).encode() + b"\n" + response.body)
+        return response
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            self.backend.bump(namespace)
+        with self._lock:
+            self.invalidations += len(namespaces)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            **self.backend.stats(),
+        }
+
+
+def _make_backend():
+    if RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend(RESPONSE_CACHE_URL)
+    return MemoryBackend()
+
+
+response_cache = ResponseCache(_make_backend())
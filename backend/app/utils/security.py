@@ -1,15 +1,44 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
+from app.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS
+
+# Pinning min/max to the configured cost makes verify_and_update() flag any
+# stored hash created with a different cost so it is rehashed on next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a small dedicated pool runs hashes in parallel
+# without occupying the request threadpool.
+hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash")
+
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 def hash_password(password):
-    print("DEBUG password value:", password)
-    print("DEBUG password type:", type(password))
     if isinstance(password, bytes):
         password = password.decode("utf-8")
-        print("Converted bytes to string:", password)
     password = password[:72]
     return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update(plain_password: str, hashed_password: str):
+    """Return ``(valid, new_hash)``; ``new_hash`` is set when the cost factor changed."""
+    return pwd_context.verify_and_update(plain_password[:72], hashed_password)
+
+
+async def hash_password_async(password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_executor, hash_password, password)
+
+
+async def verify_and_update_async(plain_password: str, hashed_password: str):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_executor, verify_and_update, plain_password, hashed_password)
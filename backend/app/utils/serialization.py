@@ -0,0 +1,59 @@
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Sequence, Tuple
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from app.utils.pagination import set_next_cursor
+
+__all__ = ["ORJSONResponse", "RowEncoder", "adapter", "dump_json", "row_encoder", "row_response"]
+
+
+@lru_cache(maxsize=256)
+def adapter(type_: Any) -> TypeAdapter:
+    """Compiled validator/serializer for ``type_``, built once per response type."""
+    return TypeAdapter(type_)
+
+
+def dump_json(type_: Any, value, from_attributes: bool = True) -> bytes:
+    """Validate ``value`` (ORM objects allowed) as ``type_`` and encode it straight to JSON bytes."""
+    compiled = adapter(type_)
+    return compiled.dump_json(compiled.validate_python(value, from_attributes=from_attributes))
+
+
+class RowEncoder:
+    """Encode result rows as a JSON array of objects without building dicts.
+
+    The object layout is precompiled into a byte template, so each row costs
+    one orjson call per value and a ``%`` substitution. Rows may carry extra
+    trailing columns (e.g. keyset sort keys); only the first ``len(keys)``
+    values are written. Values are emitted as stored, so this is only for
+    columns whose database types already match the response schema.
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        self.keys = tuple(keys)
+        self._template = b"{" + b",".join(orjson.dumps(key) + b":%b" for key in self.keys) + b"}"
+
+    def _objects(self, rows: Iterable[Sequence]) -> list:
+        dumps, template, width = orjson.dumps, self._template, len(self.keys)
+        return [template % tuple(map(dumps, row[:width])) for row in rows]
+
+    def encode(self, rows: Iterable[Sequence]) -> bytes:
+        """JSON array of objects."""
+        return b"[" + b",".join(self._objects(rows)) + b"]"
+
+    def encode_lines(self, rows: Iterable[Sequence]) -> bytes:
+        """Newline-delimited JSON, one object per row."""
+        return b"".join(line + b"\n" for line in self._objects(rows))
+
+
+@lru_cache(maxsize=256)
+def row_encoder(keys: Tuple[str, ...]) -> RowEncoder:
+    return RowEncoder(keys)
+
+
+def row_response(keys: Tuple[str, ...], rows, next_cursor: Optional[str] = None) -> Response:
+    response = Response(row_encoder(keys).encode(rows), media_type="application/json")
+    set_next_cursor(response, next_cursor)
+    return response
@@ -0,0 +1,46 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one.
+
+    The first caller for a key (the leader) runs ``fn``; callers arriving
+    while it runs wait for and share its result or exception. Nothing is
+    remembered afterwards -- caching the result is the caller's job.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if leader:
+            try:
+                call.set_result(fn())
+            except BaseException as exc:
+                call.set_exception(exc)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+        return call.result()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight(), "leaders": self.leaders, "shared": self.shared}
@@ -0,0 +1,90 @@
+"""Requests/sec of GET /tasks/ at high concurrency, sync vs async DB mode.
+
+Runs the app in-process over ASGI. Defaults to a throwaway SQLite database;
+point DB_URL at MySQL (pymysql) to compare pymysql vs aiomysql:
+
+    python benchmarks/bench_async_mode.py --clients 500 --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+_db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ.setdefault("DB_URL", f"sqlite:///{_db_file}")
+# Both modes share the pool limits so neither gets more connections
+os.environ.setdefault("DB_POOL_SIZE", "20")
+os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+from app.database import engine, get_session, get_db, get_async_db, get_async_engine  # noqa: E402
+from models import Base  # noqa: E402
+
+
+async def run_mode(mode, args):
+    app.dependency_overrides[get_session] = get_async_db if mode == "async" else get_db
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        login = await client.post("/users/login", json={"email": "bench@example.com", "password": "password123"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        queue = asyncio.Queue()
+        for _ in range(args.requests):
+            queue.put_nowait(None)
+
+        async def worker():
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                response = await client.get("/tasks/", params={"project_id": 1}, headers=headers)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.clients)))
+        elapsed = time.perf_counter() - start
+    if mode == "async":
+        await get_async_engine().dispose()
+    app.dependency_overrides.clear()
+    return args.requests / elapsed
+
+
+async def seed(args):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/users/", json={
+            "username": "bench", "email": "bench@example.com",
+            "role": "admin", "password": "password123",
+        })
+        login = await client.post("/users/login", json={"email": "bench@example.com", "password": "password123"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        await client.post("/projects/", json={"name": "bench"})
+        for i in range(args.tasks):
+            await client.post("/tasks/", headers=headers, json={
+                "title": f"task {i}", "description": "x" * 200, "status": "todo", "project_id": 1,
+            })
+
+
+async def main(args):
+    Base.metadata.create_all(bind=engine)
+    try:
+        await seed(args)
+        print(f"{args.clients} concurrent clients, {args.requests} requests, {args.tasks} tasks per response")
+        for mode in ("sync", "async"):
+            print(f"{mode:<6}{await run_mode(mode, args):>10.1f} req/s")
+    finally:
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
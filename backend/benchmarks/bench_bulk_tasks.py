@@ -0,0 +1,74 @@
+"""Tasks/sec when seeding a sprint: one POST /tasks/ per task vs POST /tasks/bulk.
+
+Runs the app in-process over ASGI against a throwaway SQLite database (set
+DB_URL to benchmark MySQL instead):
+
+    python benchmarks/bench_bulk_tasks.py --tasks 500 --batch 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+_db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ.setdefault("DB_URL", f"sqlite:///{_db_file}")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+from app.database import engine  # noqa: E402
+from models import Base  # noqa: E402
+
+
+def task(i, project_id):
+    return {"title": f"task {i}", "description": "x" * 200, "status": "todo", "project_id": project_id}
+
+
+async def one_by_one(client, headers, project_id, count):
+    for i in range(count):
+        response = await client.post("/tasks/", headers=headers, json=task(i, project_id))
+        response.raise_for_status()
+
+
+async def bulk(client, headers, project_id, count, batch):
+    for start in range(0, count, batch):
+        items = [task(i, project_id) for i in range(start, min(start + batch, count))]
+        response = await client.post("/tasks/bulk", headers=headers, json=items)
+        response.raise_for_status()
+        assert response.json()["failed"] == 0
+
+
+async def main(args):
+    Base.metadata.create_all(bind=engine)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/users/", json={
+                "username": "bench", "email": "bench@example.com",
+                "role": "admin", "password": "password123",
+            })
+            login = await client.post("/users/login", json={"email": "bench@example.com", "password": "password123"})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+            print(f"{args.tasks} tasks, bulk batch size {args.batch}")
+            for label, run in (
+                ("POST /tasks/", lambda project_id: one_by_one(client, headers, project_id, args.tasks)),
+                ("POST /tasks/bulk", lambda project_id: bulk(client, headers, project_id, args.tasks, args.batch)),
+            ):
+                project = await client.post("/projects/", json={"name": label})
+                start = time.perf_counter()
+                await run(project.json()["id"])
+                elapsed = time.perf_counter() - start
+                print(f"{label:<18}{args.tasks / elapsed:>10.1f} tasks/s  ({elapsed:.2f}s)")
+    finally:
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
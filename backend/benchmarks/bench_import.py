@@ -0,0 +1,70 @@
+"""Throughput and peak Python memory of the task importer as the file grows.
+
+Generates CSV files of increasing size and imports each with TaskImporter
+against a throwaway SQLite database (set DB_URL to benchmark MySQL). Peak
+memory should stay flat as rows grow, since only one batch is held at a time:
+
+    python benchmarks/bench_import.py --rows 10000 100000 --batch 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+_workdir = tempfile.mkdtemp()
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(_workdir, 'bench.db')}")
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app.services import import_service  # noqa: E402
+from models import Base, Project, User, UserRole  # noqa: E402
+
+
+def write_csv(path, rows, project_id):
+    with open(path, "w") as out:
+        out.write("title,description,status,project_id,assignee_email,due_date\n")
+        for i in range(rows):
+            out.write(f"task {i},{'x' * 200},todo,{project_id},bench{i % 5}@example.com,2030-01-{i % 28 + 1:02d}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add_all([
+            User(id=i + 1, username=f"bench{i}", email=f"bench{i}@example.com", password="x", role=UserRole.user)
+            for i in range(5)
+        ])
+        db.add(Project(id=1, name="Bench", owner_id=1))
+        db.commit()
+
+        for rows in args.rows:
+            path = os.path.join(_workdir, f"tasks-{rows}.csv")
+            write_csv(path, rows, 1)
+            tracemalloc.start()
+            start = time.perf_counter()
+            with open(path, "rb") as stream:
+                importer = import_service.TaskImporter(db, 1, args.batch)
+                for _ in importer.run(import_service.read_records(stream, import_service.ImportFormat.csv)):
+                    pass
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{rows:>9} rows  {importer.imported / elapsed:9.0f} rows/s  "
+                f"peak {peak / 2 ** 20:6.1f} MiB  ({os.path.getsize(path) / 2 ** 20:.1f} MiB file)"
+            )
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""p50/p99 latency of GET /tasks/ while a burst of logins is in flight.
+
+Runs the app in-process over ASGI against a throwaway SQLite database:
+
+    python benchmarks/bench_login_storm.py --logins 200 --probes 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+_db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ.setdefault("DB_URL", f"sqlite:///{_db_file}")
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+from app.database import engine  # noqa: E402
+from models import Base  # noqa: E402
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def probe_tasks(client, headers, count, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get("/tasks/", headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies
+
+
+async def login_storm(client, count):
+    credentials = {"email": "bench@example.com", "password": "password123"}
+    await asyncio.gather(*(client.post("/users/login", json=credentials) for _ in range(count)))
+
+
+async def main(args):
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/users/", json={
+            "username": "bench", "email": "bench@example.com",
+            "role": "admin", "password": "password123",
+        })
+        login = await client.post("/users/login", json={"email": "bench@example.com", "password": "password123"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        baseline = await probe_tasks(client, headers, args.probes, args.concurrency)
+
+        storm = asyncio.create_task(login_storm(client, args.logins))
+        await asyncio.sleep(0)
+        during = await probe_tasks(client, headers, args.probes, args.concurrency)
+        storm_start = time.perf_counter()
+        await storm
+        storm_tail = time.perf_counter() - storm_start
+
+    print(f"{'scenario':<22}{'p50 ms':>10}{'p99 ms':>10}")
+    print(f"{'idle':<22}{percentile(baseline, 50):>10.1f}{percentile(baseline, 99):>10.1f}")
+    print(f"{'during login storm':<22}{percentile(during, 50):>10.1f}{percentile(during, 99):>10.1f}")
+    print(f"storm of {args.logins} logins finished {storm_tail:.1f}s after the probes")
+    Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probes", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+"""Latency of GET /search/ queries over a large task table.
+
+Seeds a throwaway SQLite database (set DB_URL to benchmark MySQL) with
+generated tasks and comments, then times search_service.search_tasks for
+common, rare, multi-word and prefix queries:
+
+    python benchmarks/bench_search.py --tasks 1000000 --repeat 20
+
+Seeding goes through the same triggers as the app, so it dominates the run
+time for large --tasks values; the query timings exclude it.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import accumulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+from sqlalchemy import insert, text  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.services import search_service  # noqa: E402
+from app.utils.pagination import PageParams  # noqa: E402
+from models import Base, Project, Task, TaskComment, User, UserRole  # noqa: E402
+
+# Term frequencies follow Zipf's law like real text: a long tail of filler words
+# with the domain words planted at ranks from common (login) to rare (webhook)
+FILLER = [f"w{i}" for i in range(20000)]
+PLANTED = {"login": 20, "report": 50, "invoice": 200, "export": 300, "performance": 1000, "webhook": 5000,
+           "timeout": 8000, "retry": 12000}
+VOCABULARY = list(FILLER)
+for word, rank in PLANTED.items():
+    VOCABULARY[rank] = word
+CUM_WEIGHTS = list(accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+
+QUERIES = ("login", "report", "invoice export", "perf", "webhook timeout retry", "zzzunmatched")
+
+
+def seed(tasks, projects, batch=20000):
+    rng = random.Random(42)
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "username": "bench", "email": "b@example.com", "password": "x",
+                                     "role": UserRole.user}])
+        conn.execute(insert(Project), [{"id": i, "name": f"P{i}", "owner_id": 1} for i in range(1, projects + 1)])
+        for start in range(0, tasks, batch):
+            rows = [
+                {
+                    "id": i, "title": " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=4)),
+                    "description": " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=20)), "status": "todo",
+                    "project_id": i % projects + 1, "created_at": now,
+                }
+                for i in range(start + 1, min(start + batch, tasks) + 1)
+            ]
+            conn.execute(insert(Task), rows)
+            conn.execute(insert(TaskComment), [
+                {"content": " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=8)), "task_id": row["id"], "user_id": 1,
+                 "created_at": now}
+                for row in rows[::4]
+            ])
+
+
+def matches(db, q):
+    expression = " ".join(f'"{term}"' for term in search_service.search_terms(q)) + "*"
+    if engine.dialect.name != "sqlite":
+        return "?"
+    return db.execute(text("SELECT count(*) FROM task_search WHERE task_search MATCH :q"), {"q": expression}).scalar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        seed(args.tasks, args.projects)
+        print(f"seeded {args.tasks} tasks in {time.perf_counter() - start:.1f}s")
+        page = PageParams(limit=20, cursor=None)
+        for q in QUERIES:
+            for project_id in (None, 1):
+                timings = []
+                for _ in range(args.repeat):
+                    began = time.perf_counter()
+                    rows, _ = search_service.search_tasks(db, 1, q, page, project_id)
+                    timings.append(time.perf_counter() - began)
+                scope = "all projects" if project_id is None else f"project {project_id}"
+                print(
+                    f"  {q!r:<24} {scope:<13} p50 {statistics.median(timings) * 1000:7.1f} ms"
+                    f"  max {max(timings) * 1000:7.1f} ms  ({matches(db, q)} matching tasks)"
+                )
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
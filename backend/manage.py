@@ -0,0 +1,123 @@
+"""Maintenance commands.
+
+Usage:
+    python manage.py rebuild-counters [--project-id ID]
+    python manage.py import-tasks FILE --owner-id ID [--format csv|ndjson] [--batch-size N] [--rejects PATH]
+    python manage.py compact-changes
+    python manage.py purge-projects [--chunk-size N]
+    python manage.py run-worker [--workers N]
+"""
+import argparse
+import sys
+import time
+
+import orjson
+
+from app.database import SessionLocal
+from app.config import IMPORT_BATCH_SIZE, JOB_WORKERS, PURGE_CHUNK_SIZE
+from app.services import counter_service, import_service, job_service, project_service, sync_service
+from app.utils.response_cache import PROJECTS, response_cache
+
+
+def rebuild_counters(args):
+    db = SessionLocal()
+    try:
+        rows = counter_service.rebuild_counters(db, project_id=args.project_id)
+    finally:
+        db.close()
+    # Project listings embed task_count/progress (reaches other workers with a shared backend)
+    response_cache.invalidate(PROJECTS)
+    print(f"Rebuilt {rows} project task counter rows.")
+
+
+def import_tasks(args):
+    fmt = import_service.ImportFormat(args.format) if args.format else import_service.guess_format(args.file)
+    rejects = open(args.rejects, "wb") if args.rejects else None
+    db = SessionLocal()
+    try:
+        with open(args.file, "rb") as stream:
+            importer = import_service.TaskImporter(db, args.owner_id, args.batch_size)
+            for event in importer.run(import_service.read_records(stream, fmt)):
+                if event["event"] == "reject":
+                    if rejects:
+                        rejects.write(orjson.dumps(event) + b"\n")
+                else:
+                    print("{processed} read, {imported} imported, {rejected} rejected".format(**event), file=sys.stderr)
+    finally:
+        db.close()
+        if rejects:
+            rejects.close()
+    response_cache.invalidate(PROJECTS)
+    print(f"Imported {importer.imported} of {importer.processed} rows.")
+
+
+def compact_changes(args):
+    db = SessionLocal()
+    try:
+        rows = sync_service.compact_changes(db)
+    finally:
+        db.close()
+    print(f"Removed {rows} superseded change log rows.")
+
+
+def purge_projects(args):
+    # Finishes purges cut short by a restart as well as any never started
+    db = SessionLocal()
+    try:
+        for project_id in project_service.deleted_project_ids(db):
+            def report(counts):
+                print(f"project {project_id}: " + ", ".join(f"{n} {name}" for name, n in counts.items()), file=sys.stderr)
+            counts = project_service.purge_project(db, project_id, args.chunk_size, progress=report)
+            print(f"Purged project {project_id}: {counts}")
+    finally:
+        db.close()
+
+
+def run_worker(args):
+    pool = job_service.WorkerPool(size=args.workers)
+    pool.start()
+    print(f"Running {args.workers} job workers; Ctrl+C to stop.", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Jobs still running past the wait are picked up again once their lease expires
+        pool.stop(timeout=30)
+    print(f"Stopped: {pool.stats()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-counters", help="recompute project_task_counters from tasks")
+    rebuild.add_argument("--project-id", type=int, default=None, help="only rebuild this project")
+    rebuild.set_defaults(func=rebuild_counters)
+
+    importer = commands.add_parser("import-tasks", help="import tasks from a CSV or NDJSON file")
+    importer.add_argument("file", help="*.csv, or NDJSON with one task object per line")
+    importer.add_argument("--owner-id", type=int, required=True, help="tasks may only target this user's projects")
+    importer.add_argument("--format", choices=[fmt.value for fmt in import_service.ImportFormat], default=None)
+    importer.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="rows per savepoint/commit")
+    importer.add_argument("--rejects", default=None, help="write rejected lines here as NDJSON")
+    importer.set_defaults(func=import_tasks)
+
+    compact = commands.add_parser("compact-changes", help="drop change log rows superseded by a later change")
+    compact.set_defaults(func=compact_changes)
+
+    purge = commands.add_parser("purge-projects", help="delete the rows of every soft-deleted project")
+    purge.add_argument("--chunk-size", type=int, default=PURGE_CHUNK_SIZE, help="rows per DELETE/commit")
+    purge.set_defaults(func=purge_projects)
+
+    worker = commands.add_parser("run-worker", help="run background jobs until interrupted")
+    worker.add_argument("--workers", type=int, default=max(JOB_WORKERS, 1), help="worker threads")
+    worker.set_defaults(func=run_worker)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
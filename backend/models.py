@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy import DDL, JSON, BigInteger, Boolean, Column, Integer, MetaData, String, DateTime, ForeignKey, Enum, Table, Text, Index, event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session, declarative_base, relationship, with_loader_criteria
 import enum
 
 import sqlalchemy.sql.functions as func
 Base = declarative_base()
 from datetime import datetime, timezone
+# Microsecond precision on MySQL too, so back-to-back writes move max(updated_at) (ETags)
+PreciseDateTime = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
 class UserRole(enum.Enum):
     admin = 'admin'
     manager = 'manager'
@@ -14,6 +18,9 @@ class TaskStatus(enum.Enum):
     TODO = 'To Do'
     IN_PROGRESS = 'In Progress'
     DONE = 'Done'
+
+# Task statuses that count as finished: never overdue, counted towards progress
+DONE_STATUSES = ("done", "completed")
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True)
@@ -21,6 +28,8 @@ class User(Base):
     password = Column(String(128), nullable=False)
     email = Column(String(128), unique=True, nullable=False)
     role = Column(Enum(UserRole), nullable=False)
+    # Moves the ETag of project details that embed the user as a member
+    updated_at = Column(PreciseDateTime, onupdate=datetime.now)
     
     # Only one "projects" relationship pointing to Project.owner
     projects = relationship("Project", back_populates="owner")
@@ -33,15 +42,38 @@ class Project(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(100), unique=True, nullable=False)
     description = Column(Text)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Python-side timestamps keep the stored format identical to bound parameters,
+    # which keyset pagination relies on when comparing (created_at, id) on SQLite
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(PreciseDateTime, onupdate=datetime.now)
+    # Set by DELETE /projects/{id}; the row and its tasks stay until the background purge
+    deleted_at = Column(DateTime, nullable=True)
     
     # Points to User.projects
     owner = relationship("User", back_populates="projects")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
     # If you have project_members
     members = relationship("ProjectMember", back_populates="project")
+    task_counters = relationship(
+        "ProjectTaskCounter", back_populates="project", cascade="all, delete-orphan", lazy="selectin"
+    )
+
+    # GET /projects/ keyset order; deep pages seek into it instead of sorting every row
+    __table_args__ = (Index("ix_projects_created", "created_at", "id"),)
+
+    @property
+    def task_count(self) -> int:
+        return sum(counter.count for counter in self.task_counters)
+
+    @property
+    def progress(self) -> float:
+        """Percentage of finished tasks, read from the maintained counters."""
+        total = self.task_count
+        if not total:
+            return 0.0
+        done = sum(counter.count for counter in self.task_counters if counter.status in DONE_STATUSES)
+        return round(done * 100 / total, 1)
 
 class ProjectMember(Base):
     __tablename__ = "project_members"
@@ -54,6 +86,10 @@ class ProjectMember(Base):
     # Points to Project.members
     project = relationship("Project", back_populates="members")
 
+    __table_args__ = (
+        Index("ux_project_members_project_user", "project_id", "user_id", unique=True),
+    )
+
 class Task(Base):
     __tablename__ = "tasks"
     id = Column(Integer, primary_key=True)
@@ -63,13 +99,38 @@ class Task(Base):
     project_id = Column(Integer, ForeignKey("projects.id"))
     assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     due_date = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(PreciseDateTime, default=datetime.now, onupdate=datetime.now)
     
     # Relationships
     project = relationship("Project", back_populates="tasks")
     assignee = relationship("User", back_populates="tasks")
     comments = relationship("TaskComment", back_populates="task")  # ← ADD THIS LINE
 
+    # Filter/sort paths of GET /tasks/; the trailing id keeps keyset pages index-ordered
+    __table_args__ = (
+        Index("ix_tasks_project_status", "project_id", "status"),
+        Index("ix_tasks_project_created", "project_id", "created_at", "id"),
+        Index("ix_tasks_project_due", "project_id", "due_date", "id"),
+        Index("ix_tasks_assignee_due", "assignee_id", "due_date"),
+        # GET /search/ on MySQL; SQLite uses the task_search FTS5 table below
+        Index("ft_tasks_title_description", "title", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+
+class ProjectTaskCounter(Base):
+    """Per-project task counts by status, kept in step with task writes.
+
+    Overdue counts are not stored: a task becomes overdue without being
+    written, so ``/tasks/stats`` counts them from ``tasks`` when read.
+    """
+    __tablename__ = "project_task_counters"
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(24), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    project = relationship("Project", back_populates="task_counters")
+
 
 class TaskComment(Base):
     __tablename__ = 'task_comments'
@@ -77,9 +138,143 @@ class TaskComment(Base):
     content = Column(Text, nullable=False)
     task_id = Column(Integer, ForeignKey("tasks.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=datetime.now)
     
     # Relationships
     task = relationship("Task", back_populates="comments")  # ← MUST point to Task.comments
-    user = relationship("User") 
+    user = relationship("User")
+
+    # Comment threads are listed per task in (created_at, id) keyset order
+    __table_args__ = (
+        Index("ix_task_comments_task_created", "task_id", "created_at", "id"),
+        Index("ft_task_comments_content", "content", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+
+
+class ChangeLog(Base):
+    """One row per task, project or comment write, read by GET /sync/.
+
+    ``seq`` only ever grows (AUTOINCREMENT on SQLite, so ids of deleted rows
+    are not reused), which makes it usable as a sync cursor. Deletes are kept
+    as tombstones. ``project_id`` has no foreign key so that tombstones
+    outlive their project.
+    """
+    __tablename__ = "change_log"
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity = Column(String(16), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(PreciseDateTime, nullable=False, default=datetime.now)
+
+    # GET /sync/ reads one range of seq per project the caller can see
+    __table_args__ = (
+        Index("ix_change_log_project_seq", "project_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+class Job(Base):
+    """Background job, claimed and run by the workers in app/services/job_service.py.
+
+    ``locked_by``/``lease_until`` form the lease of the worker running it;
+    ``run_at`` is when a queued job (or its next retry) becomes due.
+    """
+    __tablename__ = "jobs"
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(16), nullable=False, default="queued")
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(PreciseDateTime, nullable=False, default=datetime.now)
+    locked_by = Column(String(64))
+    lease_until = Column(PreciseDateTime)
+    progress = Column(JSON)
+    result = Column(JSON)
+    error = Column(Text)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(PreciseDateTime, nullable=False, default=datetime.now)
+    started_at = Column(PreciseDateTime)
+    finished_at = Column(PreciseDateTime)
+
+    # Expired leases are found by (status, lease_until)
+    __table_args__ = (Index("ix_jobs_status_lease", "status", "lease_until"),)
+
+
+# Claim order: highest priority first, then oldest due; the index yields it without a sort
+Index("ix_jobs_claim", Job.status, Job.priority.desc(), Job.run_at)
+
+
+class AICache(Base):
+    """Model replies reused by app/services/ai_service.py, keyed by a hash of prompt, model and params."""
+    __tablename__ = "ai_cache"
+    key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    response = Column(JSON, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(PreciseDateTime, nullable=False, default=datetime.now)
+    expires_at = Column(PreciseDateTime, nullable=False)
+    last_used_at = Column(PreciseDateTime, nullable=False, default=datetime.now)
+
+    # Eviction drops expired entries, then the least recently used
+    __table_args__ = (
+        Index("ix_ai_cache_expires", "expires_at"),
+        Index("ix_ai_cache_last_used", "last_used_at"),
+    )
+
+# SQLite full-text index for GET /search/: one FTS5 row per task (rowid = task id)
+# holding its title, description and the text of all its comments. Triggers keep
+# it in step with every write path, including bulk inserts, imports and raw SQL.
+task_search = Table(
+    "task_search", MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("title", Text),
+    Column("description", Text),
+    Column("comments", Text),
+)
+
+_COMMENT_TEXT = "(SELECT coalesce(group_concat(content, ' '), '') FROM task_comments WHERE task_id = task_search.rowid)"
+
+TASK_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE task_search USING fts5(title, description, comments, tokenize = 'porter unicode61')",
+    "CREATE TRIGGER task_search_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO task_search (rowid, title, description, comments) "
+    "VALUES (new.id, new.title, coalesce(new.description, ''), ''); END",
+    "CREATE TRIGGER task_search_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "UPDATE task_search SET title = new.title, description = coalesce(new.description, '') "
+    "WHERE rowid = new.id; END",
+    "CREATE TRIGGER task_search_ad AFTER DELETE ON tasks BEGIN "
+    "DELETE FROM task_search WHERE rowid = old.id; END",
+)
+
+COMMENT_SEARCH_DDL = (
+    "CREATE TRIGGER task_comment_search_ai AFTER INSERT ON task_comments BEGIN "
+    "UPDATE task_search SET comments = ltrim(comments || ' ' || new.content) WHERE rowid = new.task_id; END",
+    "CREATE TRIGGER task_comment_search_au AFTER UPDATE ON task_comments BEGIN "
+    f"UPDATE task_search SET comments = {_COMMENT_TEXT} WHERE rowid IN (old.task_id, new.task_id); END",
+    "CREATE TRIGGER task_comment_search_ad AFTER DELETE ON task_comments BEGIN "
+    f"UPDATE task_search SET comments = {_COMMENT_TEXT} WHERE rowid = old.task_id; END",
+)
+
+for _statement in TASK_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in COMMENT_SEARCH_DDL:
+    event.listen(TaskComment.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+# The triggers go with their tables; the FTS table has to be dropped explicitly
+event.listen(Task.__table__, "after_drop", DDL("DROP TABLE IF EXISTS task_search").execute_if(dialect="sqlite"))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted_projects(execute_state):
+    """Leave soft-deleted projects out of every ORM SELECT, joins and relationship loads included.
 
+    Statements run with ``execution_options(include_deleted=True)`` (the purge)
+    see them; Core statements on a bare connection are not filtered.
+    """
+    if execute_state.is_select and not execute_state.execution_options.get("include_deleted", False):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(Project, Project.deleted_at.is_(None), include_aliases=True)
+        )
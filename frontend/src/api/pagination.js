@@ -0,0 +1,17 @@
+// List endpoints return one page at a time and put the next page's cursor in
+// the X-Next-Cursor header (absent on the last page).
+export const PAGE_SIZE_MAX = 500;
+
+// Calls request(params) page after page, following the cursor, and resolves
+// to the last response with data holding the rows of every page.
+export async function fetchAllPages(request, params = {}) {
+  const rows = [];
+  let cursor = null;
+  let response;
+  do {
+    response = await request({ limit: PAGE_SIZE_MAX, ...params, ...(cursor ? { cursor } : {}) });
+    rows.push(...response.data);
+    cursor = response.headers["x-next-cursor"];
+  } while (cursor);
+  return { ...response, data: rows };
+}
@@ -1,8 +1,20 @@
 import axios from "axios";
+import { fetchAllPages } from "./pagination";
 const API_URL = "http://localhost:8000";
 
+// Every project, following the pagination cursor
 export async function getProjects(token) {
-  return axios.get(`${API_URL}/projects/`, { headers: { Authorization: `Bearer ${token}` } });
+  return fetchAllPages(params => axios.get(`${API_URL}/projects/`, {
+    headers: { Authorization: `Bearer ${token}` },
+    params,
+  }));
+}
+// include: comma-separated relationships to embed, e.g. "tasks,members"
+export async function getProject(id, token, include) {
+  return axios.get(`${API_URL}/projects/${id}`, {
+    headers: { Authorization: `Bearer ${token}` },
+    params: include ? { include } : {},
+  });
 }
 export async function createProject(data, token) {
   return axios.post(`${API_URL}/projects/`, data, {
@@ -16,3 +28,52 @@ export async function updateProject(id, data, token) {
 export async function deleteProject(id, token) {
   return axios.delete(`${API_URL}/projects/${id}`, { headers: { Authorization: `Bearer ${token}` } });
 }
+
+// Suggested user stories for a project; repeats of the same prompt come back
+// from the server's cache (data.cached). prompt is an optional focus, count 1-20.
+export async function generateStories(projectId, token, { prompt, count } = {}) {
+  return axios.post(`${API_URL}/ai/stories`, { project_id: projectId, prompt, count }, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+}
+
+// Streams generation as it happens. onEvent(name, data) gets "token" ({ text }),
+// "story" ({ index, title, description }), then "done" ({ stories, cached }) or
+// "error" ({ detail }). Rejects with the HTTP status if the request is refused
+// (429 busy, 503 model unavailable: retry after the Retry-After header).
+export async function streamStories(projectId, token, onEvent, { prompt, count, signal } = {}) {
+  const response = await fetch(`${API_URL}/ai/stories/stream`, {
+    method: "POST",
+    headers: { Authorization: `Bearer ${token}`, "Content-Type": "application/json" },
+    body: JSON.stringify({ project_id: projectId, prompt, count }),
+    signal,
+  });
+  if (!response.ok) {
+    const error = new Error(`Story stream refused: ${response.status}`);
+    error.status = response.status;
+    error.retryAfter = Number(response.headers.get("Retry-After")) || null;
+    throw error;
+  }
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += value;
+    let end;
+    while ((end = buffer.indexOf("\n\n")) >= 0) {
+      const frame = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      const name = frame.match(/^event: (.*)$/m);
+      const data = frame.match(/^data: (.*)$/m);
+      if (name && data) onEvent(name[1], JSON.parse(data[1]));
+    }
+  }
+}
+
+// Adds the chosen stories to the project as tasks, all or none; returns their ids
+export async function createTasksFromStories(projectId, stories, token, { status, assignee_id } = {}) {
+  return axios.post(`${API_URL}/ai/stories/tasks`, { project_id: projectId, stories, status, assignee_id }, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+}
@@ -1,9 +1,44 @@
 import axios from "axios";
+import { fetchAllPages } from "./pagination";
 const API_URL = "http://localhost:8000";
 
-export async function fetchTasks(token) {
-  return axios.get(`${API_URL}/tasks/`, {
+// params: project_id, status (array), assignee_id, due_from, due_to,
+// created_from, created_to, sort, limit, cursor -- all applied server-side.
+// Without limit or cursor every matching task is fetched, page after page;
+// with them only that page is (its successor's cursor is in X-Next-Cursor).
+export async function fetchTasks(token, params = {}) {
+  const request = pageParams => axios.get(`${API_URL}/tasks/`, {
     headers: { Authorization: `Bearer ${token}` },
+    params: pageParams,
+    paramsSerializer: { indexes: null },
+  });
+  return params.limit || params.cursor ? request(params) : fetchAllPages(request, params);
+}
+
+// Counts by status, assignee and overdue flag; pass project_id for one project
+export async function fetchTaskStats(token, params = {}) {
+  return axios.get(`${API_URL}/tasks/stats`, {
+    headers: { Authorization: `Bearer ${token}` },
+    params,
+  });
+}
+
+// Full-text search over titles, descriptions and comments, most relevant first.
+// params: project_id, limit, cursor
+export async function searchTasks(q, token, params = {}) {
+  return axios.get(`${API_URL}/search/`, {
+    headers: { Authorization: `Bearer ${token}` },
+    params: { q, ...params },
+  });
+}
+
+// Tasks, projects and comments changed since a cursor (0 for everything), plus
+// deleted ids and the next cursor. Call again with data.cursor while data.has_more.
+// params: project_id, limit
+export async function fetchChanges(since, token, params = {}) {
+  return axios.get(`${API_URL}/sync/`, {
+    headers: { Authorization: `Bearer ${token}` },
+    params: { since, ...params },
   });
 }
 
@@ -13,6 +48,20 @@ export async function createTask(data, token) {
   });
 }
 
+// items: array of task payloads; the response reports every item's outcome
+export async function bulkCreateTasks(items, token) {
+  return axios.post(`${API_URL}/tasks/bulk`, items, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+}
+
+// items: [{ id, ...fieldsToChange }]
+export async function bulkUpdateTasks(items, token) {
+  return axios.patch(`${API_URL}/tasks/bulk`, items, {
+    headers: { Authorization: `Bearer ${token}` },
+  });
+}
+
 export async function updateTask(id, data, token) {
   return axios.put(`${API_URL}/tasks/${id}`, data, {
     headers: { Authorization: `Bearer ${token}` },
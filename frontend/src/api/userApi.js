@@ -1,4 +1,5 @@
 import axios from "axios";
+import { fetchAllPages } from "./pagination";
 
 const API_URL = "http://localhost:8000";
 
@@ -9,8 +10,19 @@ export async function loginUser({ email, password }) {
   return axios.post("http://localhost:8000/users/login", { email, password });
 }
 
+// Every user, following the pagination cursor
 export async function fetchUsers(token) {
-  return axios.get(`${API_URL}/users/`, {
+  return fetchAllPages(params => axios.get(`${API_URL}/users/`, {
     headers: { Authorization: `Bearer ${token}` },
+    params,
+  }));
+}
+
+// Typeahead: users whose username or email starts with q.
+// params: limit, project_id (only that project's owner and members)
+export async function searchUsers(q, token, params = {}) {
+  return axios.get(`${API_URL}/users/search`, {
+    headers: { Authorization: `Bearer ${token}` },
+    params: { q, ...params },
   });
 }
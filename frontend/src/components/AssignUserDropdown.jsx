@@ -1,37 +1,52 @@
 import React, { useEffect, useState } from "react";
-import { MenuItem, Select } from "@mui/material";
+import axios from "axios";
+import { Autocomplete, TextField } from "@mui/material";
+import { useAuth } from "../context/AuthProvider";
+import { searchUsers } from "../api/userApi";
 
-export default function AssignUserDropdown({ taskId, onUpdated }) {
-  const [users, setUsers] = useState([]);
-  const [assigned, setAssigned] = useState("");
+// Looks users up as you type instead of loading the whole /users/ list;
+// pass projectId to offer only that project's members.
+export default function AssignUserDropdown({ taskId, projectId, onUpdated }) {
+  const { user } = useAuth();
+  const [input, setInput] = useState("");
+  const [options, setOptions] = useState([]);
+  const [assigned, setAssigned] = useState(null);
 
   useEffect(() => {
-    fetch("/users/").then(res => res.json()).then(setUsers);
-    // Optionally, fetch current assignment
-  }, []);
+    if (!input.trim()) {
+      setOptions([]);
+      return;
+    }
+    const timer = setTimeout(() => {
+      const params = { limit: 10, ...(projectId ? { project_id: projectId } : {}) };
+      searchUsers(input.trim(), user.token, params)
+        .then(res => setOptions(res.data))
+        .catch(() => setOptions([]));
+    }, 200);
+    return () => clearTimeout(timer);
+  }, [input, projectId, user]);
 
-  const assignUser = userId => {
-    fetch(`/tasks/${taskId}/assign`, {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ user_id: userId })
-    }).then(() => { setAssigned(userId); onUpdated(); });
+  const assignUser = selected => {
+    setAssigned(selected);
+    if (!selected) return;
+    axios.post(`http://localhost:8000/tasks/${taskId}/assign`, { assignee_id: selected.id }, {
+      headers: { Authorization: `Bearer ${user.token}` }
+    }).then(() => onUpdated && onUpdated());
   };
 
   return (
-    <Select
-      value={assigned}
-      displayEmpty
+    <Autocomplete
       size="small"
-      onChange={e => assignUser(e.target.value)}
-      sx={{ mr: 1 }}
-    >
-      <MenuItem value="">
-        <em>Assign</em>
-      </MenuItem>
-      {users.map(u => (
-        <MenuItem key={u.id} value={u.id}>{u.username}</MenuItem>
-      ))}
-    </Select>
+      sx={{ mr: 1, minWidth: 200 }}
+      options={options}
+      value={assigned}
+      filterOptions={x => x}
+      getOptionLabel={u => u.username}
+      isOptionEqualToValue={(a, b) => a.id === b.id}
+      onChange={(_, selected) => assignUser(selected)}
+      onInputChange={(_, value) => setInput(value)}
+      noOptionsText={input ? "No matching users" : "Type a name or email"}
+      renderInput={params => <TextField {...params} placeholder="Assign" />}
+    />
   );
 }
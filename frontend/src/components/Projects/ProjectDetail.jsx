@@ -1,14 +1,16 @@
 import React, { useEffect } from "react";
-import { Box, Typography, Tabs, Tab } from "@mui/material";
+import { Box, Typography, Tabs, Tab, List, ListItem, ListItemText, Chip } from "@mui/material";
 import { useParams } from "react-router-dom";
-import TaskList from "./TaskList";
 import { useProjects } from "../../hooks/useProjects";
+import { useProjectEvents } from "../../hooks/useProjectEvents";
 
 export default function ProjectDetail() {
   const { id } = useParams();
-  const { project, fetchProject } = useProjects();
+  const { project, fetchProject, applyEvent } = useProjects();
 
   useEffect(() => { fetchProject(id); }, [id]);
+  // Live updates instead of refetching the project
+  useProjectEvents(id, event => (event.type === "resync" ? fetchProject(id) : applyEvent(event)));
 
   return (
     <Box sx={{ mt: 4 }}>
@@ -17,7 +19,15 @@ export default function ProjectDetail() {
       <Tabs value={0}>
         <Tab label="Tasks" />
       </Tabs>
-      <TaskList projectId={id} />
+      {/* Tasks arrive embedded in the project response (?include=tasks) */}
+      <List>
+        {(project?.tasks || []).map(task => (
+          <ListItem key={task.id} divider>
+            <ListItemText primary={task.title} secondary={task.due_date && new Date(task.due_date).toLocaleDateString()} />
+            <Chip label={task.status} size="small" />
+          </ListItem>
+        ))}
+      </List>
     </Box>
   );
 }
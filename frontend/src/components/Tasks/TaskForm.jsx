@@ -3,7 +3,8 @@ import {
   Dialog, DialogTitle, DialogContent, TextField, DialogActions, Button, MenuItem 
 } from "@mui/material";
 import { createTask } from "../../api/taskApi";
-import axios from "axios";
+import { getProjects } from "../../api/projectApi";
+import { fetchUsers } from "../../api/userApi";
 
 export default function TaskForm({ open, handleClose, projectId = null }) {
   const [form, setForm] = useState({
@@ -22,16 +23,12 @@ export default function TaskForm({ open, handleClose, projectId = null }) {
   useEffect(() => {
     if (open) {
       // Fetch projects
-      axios.get("http://localhost:8000/projects/", {
-        headers: { Authorization: `Bearer ${token}` }
-      })
+      getProjects(token)
         .then(res => setProjects(res.data))
         .catch(err => console.error("Failed to fetch projects:", err));
 
       // Fetch users for assignment dropdown
-      axios.get("http://localhost:8000/users/", {
-        headers: { Authorization: `Bearer ${token}` }
-      })
+      fetchUsers(token)
         .then(res => setUsers(res.data))
         .catch(err => console.error("Failed to fetch users:", err));
     }
@@ -1,6 +1,7 @@
 // FILE: src/components/TaskList.jsx
 import React, { useState, useEffect } from "react";
 import { fetchTasks, createTask, updateTask, deleteTask } from "../../api/taskApi";
+import { fetchUsers } from "../../api/userApi";
 import axios from "axios";
 import {
   Box, Typography, Button, Paper, Grid, Chip, MenuItem, Select, Dialog, DialogTitle,
@@ -17,9 +18,7 @@ export default function TaskList() {
 
   useEffect(() => {
     fetchTasks(token).then(res => setTasks(res.data));
-    axios.get("http://localhost:8000/users/", {
-      headers: { Authorization: `Bearer ${token}` },
-    }).then(res => setUsers(res.data));
+    fetchUsers(token).then(res => setUsers(res.data));
   }, [token]);
 
   const handleAssign = (taskId, userId) => {
@@ -0,0 +1,22 @@
+import { useEffect } from "react";
+
+const API_URL = "http://localhost:8000";
+
+// Subscribes to GET /events/ for the given project ids and calls onEvent with
+// each change ({ type, project_id, data }). A { type: "resync" } event means
+// changes were dropped and the caller should refetch.
+export function useProjectEvents(projectIds, onEvent) {
+  const key = [].concat(projectIds).filter(Boolean).join(",");
+
+  useEffect(() => {
+    const token = localStorage.getItem("token");
+    if (!key || !token) return;
+    const params = new URLSearchParams({ access_token: token });
+    key.split(",").forEach(id => params.append("project_id", id));
+    // EventSource reconnects by itself after network errors
+    const source = new EventSource(`${API_URL}/events/?${params}`);
+    source.onmessage = message => onEvent(JSON.parse(message.data));
+    return () => source.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [key]);
+}
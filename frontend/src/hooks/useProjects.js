@@ -1,5 +1,5 @@
 import { useState } from "react";
-import { getProjects, createProject } from "../api/projectApi";
+import { getProjects, getProject, createProject } from "../api/projectApi";
 
 export function useProjects() {
   const [projects, setProjects] = useState([]);
@@ -19,13 +19,24 @@ export function useProjects() {
   const fetchProject = async (id) => {
     try {
       const token = localStorage.getItem("token");
-      const res = await getProjects(token);
-      const proj = res.data.find(p => p.id === parseInt(id));
-      setProject(proj);
+      const res = await getProject(id, token, "tasks,members");
+      setProject(res.data);
     } catch (error) {
       console.error("Failed to fetch project", error);
     }
   };
 
-  return { projects, project, fetchProjects, fetchProject, openForm, setOpenForm };
+  // Apply a change event from useProjectEvents to the loaded project
+  const applyEvent = (event) => {
+    const [kind, action] = event.type.split(".");
+    setProject(current => {
+      if (!current || current.id !== event.project_id) return current;
+      if (kind === "project") return action === "deleted" ? null : { ...current, ...event.data };
+      if (kind !== "task" || !current.tasks) return current;
+      const others = current.tasks.filter(task => task.id !== event.data.id);
+      return { ...current, tasks: action === "deleted" ? others : [...others, event.data] };
+    });
+  };
+
+  return { projects, project, fetchProjects, fetchProject, applyEvent, openForm, setOpenForm };
 }
@@ -8,12 +8,8 @@ export function useTasks() {
   const getTasks = async (projectId = null) => {
     try {
       const token = localStorage.getItem("token");
-      const res = await fetchTasks(token);
-      if (projectId) {
-        setTasks(res.data.filter(t => t.project_id === projectId));
-      } else {
-        setTasks(res.data);
-      }
+      const res = await fetchTasks(token, projectId ? { project_id: projectId } : {});
+      setTasks(res.data);
     } catch (error) {
       console.error("Failed to fetch tasks", error);
     }
@@ -7,8 +7,8 @@ import {
   Dashboard as DashboardIcon, Assignment, CheckCircle, Warning,
   TrendingUp, AddCircle, Settings, Refresh
 } from "@mui/icons-material";
-import { fetchTasks } from "../api/taskApi";
-import axios from "axios";
+import { fetchTasks, fetchTaskStats } from "../api/taskApi";
+import { getProjects } from "../api/projectApi";
 
 export default function Dashboard() {
   const [stats, setStats] = useState({
@@ -17,6 +17,7 @@ export default function Dashboard() {
     completedTasks: 0,
     inProgressTasks: 0,
     pendingTasks: 0,
+    overdueTasks: 0,
   });
   const [recentTasks, setRecentTasks] = useState([]);
   const [projects, setProjects] = useState([]);
@@ -35,30 +36,28 @@ export default function Dashboard() {
       const userInfo = JSON.parse(localStorage.getItem("user") || "{}");
       setUser(userInfo);
 
-      // Fetch tasks
-      const tasksRes = await fetchTasks(token);
-      const tasks = tasksRes.data || [];
+      // Aggregated counts and the five newest tasks, instead of every task
+      const [statsRes, tasksRes] = await Promise.all([
+        fetchTaskStats(token),
+        fetchTasks(token, { sort: "-created_at", limit: 5 }),
+      ]);
+      const taskStats = statsRes.data;
+      const byStatus = taskStats.by_status || {};
 
-      // Fetch projects
-      const projectsRes = await axios.get("http://localhost:8000/projects/", {
-        headers: { Authorization: `Bearer ${token}` }
-      });
+      // Every project, across all pages, so the total is not cut at one page
+      const projectsRes = await getProjects(token);
       const projects = projectsRes.data || [];
 
-      // Calculate stats
-      const completedTasks = tasks.filter(t => t.status === "completed").length;
-      const inProgressTasks = tasks.filter(t => t.status === "in-progress").length;
-      const pendingTasks = tasks.filter(t => t.status === "pending").length;
-
       setStats({
         totalProjects: projects.length,
-        totalTasks: tasks.length,
-        completedTasks,
-        inProgressTasks,
-        pendingTasks,
+        totalTasks: taskStats.total,
+        completedTasks: byStatus.completed || 0,
+        inProgressTasks: byStatus["in-progress"] || 0,
+        pendingTasks: byStatus.pending || 0,
+        overdueTasks: taskStats.overdue,
       });
 
-      setRecentTasks(tasks.slice(0, 5));
+      setRecentTasks(tasksRes.data || []);
       setProjects(projects);
     } catch (err) {
       console.error("Failed to load dashboard:", err);
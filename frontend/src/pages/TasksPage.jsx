@@ -1,13 +1,14 @@
 // FILE: src/pages/TasksPage.jsx
 import React, { useState, useEffect } from "react";
 import { useAuth } from "../context/AuthProvider";
-import { fetchTasks, createTask, deleteTask } from "../api/taskApi";
+import { fetchTasks, createTask, deleteTask, searchTasks } from "../api/taskApi";
+import { getProjects } from "../api/projectApi";
+import { fetchUsers } from "../api/userApi";
 import {
   Box, Button, Typography, TextField, Dialog, DialogTitle, DialogContent,
   DialogActions, Select, MenuItem, Alert, Chip, Paper, Grid, IconButton, Tooltip
 } from "@mui/material";
-import { Edit, Delete, AddCircle, TaskAlt, FilterList, Refresh } from "@mui/icons-material";
-import axios from "axios";
+import { Edit, Delete, AddCircle, TaskAlt, FilterList, Refresh, Search } from "@mui/icons-material";
 
 const STATUS_COLORS = {
   "todo": "default",
@@ -28,6 +29,8 @@ export default function TasksPage() {
   const [statusFilter, setStatusFilter] = useState("");
   const [users, setUsers] = useState([]);
   const [projects, setProjects] = useState([]);
+  const [query, setQuery] = useState("");
+  const [searchResults, setSearchResults] = useState(null);
 
   // Load tasks, users, and projects with demo data
   useEffect(() => {
@@ -100,8 +103,8 @@ export default function TasksPage() {
       try {
         const [taskRes, userRes, projectRes] = await Promise.all([
           fetchTasks(user.token),
-          axios.get("http://localhost:8000/users/", { headers: { Authorization: `Bearer ${user.token}` } }),
-          axios.get("http://localhost:8000/projects/", { headers: { Authorization: `Bearer ${user.token}` } })
+          fetchUsers(user.token),
+          getProjects(user.token)
         ]);
         // Only override if we get real data
         if (taskRes.data.length > 0) setTasks(taskRes.data);
@@ -114,6 +117,20 @@ export default function TasksPage() {
     loadRealData();
   }, [user]);
 
+  // Server-side full-text search, debounced while typing
+  useEffect(() => {
+    if (!user || !query.trim()) {
+      setSearchResults(null);
+      return;
+    }
+    const timer = setTimeout(() => {
+      searchTasks(query, user.token, { limit: 50 })
+        .then(res => setSearchResults(res.data))
+        .catch(() => setSearchResults(null));
+    }, 250);
+    return () => clearTimeout(timer);
+  }, [query, user]);
+
   // Handlers
   async function handleCreate(e) {
     e.preventDefault();
@@ -162,14 +179,17 @@ export default function TasksPage() {
     }
   }
 
-  // Sorting and Filtering
-  const sortedTasks = tasks
-    .filter(t => (statusFilter ? t.status === statusFilter : true))
-    .sort((a, b) => {
-      if (sort === "due") return (a.due_date || "").localeCompare(b.due_date || "");
-      if (sort === "title") return a.title.localeCompare(b.title);
-      return b.id - a.id; // default: latest first
-    });
+  // Sorting and Filtering (search results keep their relevance order)
+  const byStatus = t => (statusFilter ? t.status === statusFilter : true);
+  const sortedTasks = searchResults
+    ? searchResults.filter(byStatus)
+    : tasks
+      .filter(byStatus)
+      .sort((a, b) => {
+        if (sort === "due") return (a.due_date || "").localeCompare(b.due_date || "");
+        if (sort === "title") return a.title.localeCompare(b.title);
+        return b.id - a.id; // default: latest first
+      });
 
   // Get user name helper
   const getUserName = (userId) => {
@@ -207,6 +227,16 @@ export default function TasksPage() {
       {/* Filters */}
       <Paper sx={{ p: 2, mb: 3, background: "linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%)" }}>
         <Grid container spacing={2} alignItems="center">
+          <Grid item xs={12}>
+            <TextField
+              fullWidth
+              placeholder="Search titles, descriptions and comments"
+              value={query}
+              onChange={e => setQuery(e.target.value)}
+              InputProps={{ startAdornment: <Search sx={{ mr: 1, color: "text.secondary" }} /> }}
+              sx={{ bgcolor: "white" }}
+            />
+          </Grid>
           <Grid item xs={12} md={3}>
             <Select
               value={statusFilter}